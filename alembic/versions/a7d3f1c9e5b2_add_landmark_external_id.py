@@ -0,0 +1,27 @@
+"""
+add_landmark_external_id
+
+Revision ID: a7d3f1c9e5b2
+Revises: f2c6a9d1b4e7
+Create Date: 2026-10-17 18:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers
+revision = 'a7d3f1c9e5b2'
+down_revision = 'f2c6a9d1b4e7'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # ### Ключ upsert для массового импорта достопримечательностей ###
+    op.add_column('landmarks', sa.Column('external_id', sa.String(length=100), nullable=True))
+    op.create_unique_constraint('landmarks_external_id_key', 'landmarks', ['external_id'])
+
+
+def downgrade():
+    op.drop_constraint('landmarks_external_id_key', 'landmarks', type_='unique')
+    op.drop_column('landmarks', 'external_id')
@@ -0,0 +1,43 @@
+"""
+add_sync_tombstones
+
+Revision ID: b3e8c5a1f7d4
+Revises: a7d3f1c9e5b2
+Create Date: 2026-10-17 20:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers
+revision = 'b3e8c5a1f7d4'
+down_revision = 'a7d3f1c9e5b2'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # ### Надгробия удаленных записей для дельта-синхронизации ###
+    op.create_table(
+        'deleted_records',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('entity_type', sa.String(length=50), nullable=False),
+        sa.Column('entity_id', sa.Integer(), nullable=False),
+        sa.Column('landmark_id', sa.Integer(), nullable=True),
+        sa.Column('deleted_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_deleted_records_id'), 'deleted_records', ['id'], unique=False)
+    op.create_index('idx_deleted_records_deleted_id', 'deleted_records', ['deleted_at', 'id'])
+
+    # ### Выборка изменений по (coalesce(updated_at, created_at), id) ###
+    op.create_index('idx_landmark_changed_at', 'landmarks', [sa.text('coalesce(updated_at, created_at)'), 'id'])
+    op.create_index('idx_review_changed_at', 'reviews', [sa.text('coalesce(updated_at, created_at)'), 'id'])
+
+
+def downgrade():
+    op.drop_index('idx_review_changed_at', table_name='reviews')
+    op.drop_index('idx_landmark_changed_at', table_name='landmarks')
+    op.drop_index('idx_deleted_records_deleted_id', table_name='deleted_records')
+    op.drop_index(op.f('ix_deleted_records_id'), table_name='deleted_records')
+    op.drop_table('deleted_records')
@@ -0,0 +1,25 @@
+"""
+add_landmark_geo_index
+
+Revision ID: b7d41c9e2f6a
+Revises: cf889b02c7a2
+Create Date: 2026-10-17 12:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers
+revision = 'b7d41c9e2f6a'
+down_revision = 'cf889b02c7a2'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # ### Составной индекс для отбора по ограничивающему прямоугольнику ###
+    op.create_index('idx_landmark_lat_lon', 'landmarks', ['latitude', 'longitude'])
+
+
+def downgrade():
+    op.drop_index('idx_landmark_lat_lon', table_name='landmarks')
@@ -0,0 +1,36 @@
+"""
+add_landmark_search_vector
+
+Revision ID: c5f2a8e4d1b9
+Revises: b3e8c5a1f7d4
+Create Date: 2026-10-17 21:00:00.000000
+
+"""
+from alembic import op
+
+# revision identifiers
+revision = 'c5f2a8e4d1b9'
+down_revision = 'b3e8c5a1f7d4'
+branch_labels = None
+depends_on = None
+
+# Веса: название - A, город - B, описание - C; конфигурации russian и english
+SEARCH_VECTOR = " || ".join(
+    f"setweight(to_tsvector('{config}'::regconfig, coalesce({column}, '')), '{weight}')"
+    for column, weight in (("name", "A"), ("city", "B"), ("description", "C"))
+    for config in ("russian", "english")
+)
+
+
+def upgrade():
+    # ### Полнотекстовый поиск: генерируемый tsvector (PostgreSQL 12+) и GIN-индекс ###
+    op.execute(
+        f"ALTER TABLE landmarks ADD COLUMN search_vector tsvector "
+        f"GENERATED ALWAYS AS ({SEARCH_VECTOR}) STORED"
+    )
+    op.execute("CREATE INDEX idx_landmark_search_vector ON landmarks USING GIN (search_vector)")
+
+
+def downgrade():
+    op.execute("DROP INDEX IF EXISTS idx_landmark_search_vector")
+    op.execute("ALTER TABLE landmarks DROP COLUMN IF EXISTS search_vector")
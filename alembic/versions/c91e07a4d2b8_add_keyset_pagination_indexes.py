@@ -0,0 +1,29 @@
+"""
+add_keyset_pagination_indexes
+
+Revision ID: c91e07a4d2b8
+Revises: b7d41c9e2f6a
+Create Date: 2026-10-17 12:30:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers
+revision = 'c91e07a4d2b8'
+down_revision = 'b7d41c9e2f6a'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # ### Индексы под сортировку keyset-пагинации ###
+    op.create_index('idx_review_landmark_created', 'reviews', ['landmark_id', 'created_at', 'id'])
+    op.create_index('idx_discussion_created_id', 'discussions', ['created_at', 'id'])
+    op.create_index('idx_notifications_user_created', 'notifications', ['user_id', 'created_at', 'id'])
+
+
+def downgrade():
+    op.drop_index('idx_notifications_user_created', table_name='notifications')
+    op.drop_index('idx_discussion_created_id', table_name='discussions')
+    op.drop_index('idx_review_landmark_created', table_name='reviews')
@@ -0,0 +1,56 @@
+"""
+add_landmark_rating_aggregates
+
+Revision ID: d4a7e1f05c3b
+Revises: c91e07a4d2b8
+Create Date: 2026-10-17 14:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers
+revision = 'd4a7e1f05c3b'
+down_revision = 'c91e07a4d2b8'
+branch_labels = None
+depends_on = None
+
+AGGREGATE_COLUMNS = ['review_count', 'rating_1', 'rating_2', 'rating_3', 'rating_4', 'rating_5']
+
+
+def upgrade():
+    # ### Денормализованные агрегаты отзывов в landmarks ###
+    for column in AGGREGATE_COLUMNS:
+        op.add_column('landmarks', sa.Column(column, sa.Integer(), server_default='0', nullable=False))
+    op.add_column('landmarks', sa.Column('rating_sum', sa.Float(), server_default='0', nullable=False))
+
+    # ### Заполняем агрегаты по существующим отзывам ###
+    op.execute("""
+        UPDATE landmarks
+        SET review_count = agg.review_count,
+            rating_sum = agg.rating_sum,
+            rating_1 = agg.rating_1,
+            rating_2 = agg.rating_2,
+            rating_3 = agg.rating_3,
+            rating_4 = agg.rating_4,
+            rating_5 = agg.rating_5
+        FROM (
+            SELECT landmark_id,
+                   COUNT(*) AS review_count,
+                   SUM(rating) AS rating_sum,
+                   SUM(CASE WHEN rating < 2 THEN 1 ELSE 0 END) AS rating_1,
+                   SUM(CASE WHEN rating >= 2 AND rating < 3 THEN 1 ELSE 0 END) AS rating_2,
+                   SUM(CASE WHEN rating >= 3 AND rating < 4 THEN 1 ELSE 0 END) AS rating_3,
+                   SUM(CASE WHEN rating >= 4 AND rating < 5 THEN 1 ELSE 0 END) AS rating_4,
+                   SUM(CASE WHEN rating >= 5 THEN 1 ELSE 0 END) AS rating_5
+            FROM reviews
+            GROUP BY landmark_id
+        ) AS agg
+        WHERE landmarks.id = agg.landmark_id
+    """)
+
+
+def downgrade():
+    op.drop_column('landmarks', 'rating_sum')
+    for column in reversed(AGGREGATE_COLUMNS):
+        op.drop_column('landmarks', column)
@@ -0,0 +1,27 @@
+"""
+add_landmark_trigram_indexes
+
+Revision ID: d8a4b6f2c3e7
+Revises: c5f2a8e4d1b9
+Create Date: 2026-10-17 22:00:00.000000
+
+"""
+from alembic import op
+
+# revision identifiers
+revision = 'd8a4b6f2c3e7'
+down_revision = 'c5f2a8e4d1b9'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # ### Нечеткий поиск по названию и городу (pg_trgm) ###
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    op.execute("CREATE INDEX idx_landmark_name_trgm ON landmarks USING GIN (name gin_trgm_ops)")
+    op.execute("CREATE INDEX idx_landmark_city_trgm ON landmarks USING GIN (city gin_trgm_ops)")
+
+
+def downgrade():
+    op.execute("DROP INDEX IF EXISTS idx_landmark_city_trgm")
+    op.execute("DROP INDEX IF EXISTS idx_landmark_name_trgm")
@@ -0,0 +1,45 @@
+"""
+add_discussion_search_vectors
+
+Revision ID: e1b7c4a9f3d6
+Revises: d8a4b6f2c3e7
+Create Date: 2026-10-17 23:00:00.000000
+
+"""
+from alembic import op
+
+# revision identifiers
+revision = 'e1b7c4a9f3d6'
+down_revision = 'd8a4b6f2c3e7'
+branch_labels = None
+depends_on = None
+
+# (таблица, индекс, столбцы с весами); конфигурации russian и english
+SEARCH_VECTORS = (
+    ("discussions", "idx_discussion_search_vector", (("title", "A"), ("content", "B"))),
+    ("discussion_answers", "idx_discussion_answer_search_vector", (("content", "C"),)),
+)
+
+
+def _search_vector(columns):
+    return " || ".join(
+        f"setweight(to_tsvector('{config}'::regconfig, coalesce({column}, '')), '{weight}')"
+        for column, weight in columns
+        for config in ("russian", "english")
+    )
+
+
+def upgrade():
+    # ### Полнотекстовый поиск по обсуждениям и ответам: генерируемый tsvector и GIN-индекс ###
+    for table, index_name, columns in SEARCH_VECTORS:
+        op.execute(
+            f"ALTER TABLE {table} ADD COLUMN search_vector tsvector "
+            f"GENERATED ALWAYS AS ({_search_vector(columns)}) STORED"
+        )
+        op.execute(f"CREATE INDEX {index_name} ON {table} USING GIN (search_vector)")
+
+
+def downgrade():
+    for table, index_name, _ in reversed(SEARCH_VECTORS):
+        op.execute(f"DROP INDEX IF EXISTS {index_name}")
+        op.execute(f"ALTER TABLE {table} DROP COLUMN IF EXISTS search_vector")
@@ -0,0 +1,37 @@
+"""
+add_city_profile_rating_sum
+
+Revision ID: e83b5c2d9f10
+Revises: d4a7e1f05c3b
+Create Date: 2026-10-17 15:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers
+revision = 'e83b5c2d9f10'
+down_revision = 'd4a7e1f05c3b'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # ### Сумма оценок города для инкрементального среднего рейтинга ###
+    op.add_column('city_profiles', sa.Column('rating_sum', sa.Float(), server_default='0', nullable=False))
+
+    # ### Заполняем по агрегатам достопримечательностей ###
+    op.execute("""
+        UPDATE city_profiles
+        SET rating_sum = agg.rating_sum
+        FROM (
+            SELECT city, SUM(rating_sum) AS rating_sum
+            FROM landmarks
+            GROUP BY city
+        ) AS agg
+        WHERE city_profiles.city_name = agg.city
+    """)
+
+
+def downgrade():
+    op.drop_column('city_profiles', 'rating_sum')
@@ -0,0 +1,37 @@
+"""
+add_discussion_answer_count
+
+Revision ID: f2c6a9d1b4e7
+Revises: e83b5c2d9f10
+Create Date: 2026-10-17 16:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers
+revision = 'f2c6a9d1b4e7'
+down_revision = 'e83b5c2d9f10'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # ### Денормализованный счетчик ответов в discussions ###
+    op.add_column('discussions', sa.Column('answer_count', sa.Integer(), server_default='0', nullable=False))
+
+    # ### Заполняем по существующим ответам ###
+    op.execute("""
+        UPDATE discussions
+        SET answer_count = agg.answer_count
+        FROM (
+            SELECT discussion_id, COUNT(*) AS answer_count
+            FROM discussion_answers
+            GROUP BY discussion_id
+        ) AS agg
+        WHERE discussions.id = agg.discussion_id
+    """)
+
+
+def downgrade():
+    op.drop_column('discussions', 'answer_count')
@@ -0,0 +1,51 @@
+"""
+add_landmark_filter_keys
+
+Revision ID: f4b2d7e9a1c5
+Revises: e1b7c4a9f3d6
+Create Date: 2026-10-18 00:30:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+from app.core.filter_keys import filter_key
+
+# revision identifiers
+revision = 'f4b2d7e9a1c5'
+down_revision = 'e1b7c4a9f3d6'
+branch_labels = None
+depends_on = None
+
+FILTER_KEY_COLUMNS = (("city", "city_key"), ("country", "country_key"), ("category", "category_key"))
+
+
+def upgrade():
+    # ### Нормализованные ключи точных фильтров ###
+    for _, key_column in FILTER_KEY_COLUMNS:
+        op.add_column('landmarks', sa.Column(key_column, sa.String(length=100), server_default='', nullable=False))
+
+    # ### Заполняем по существующим значениям: различных городов и категорий немного,
+    # ключ вычисляется той же функцией, что и в приложении ###
+    connection = op.get_bind()
+    for column, key_column in FILTER_KEY_COLUMNS:
+        values = connection.execute(sa.text(f"SELECT DISTINCT {column} FROM landmarks")).scalars().all()
+        for value in values:
+            if value is None:
+                continue
+            connection.execute(
+                sa.text(f"UPDATE landmarks SET {key_column} = :key WHERE {column} = :value"),
+                {"key": filter_key(value), "value": value}
+            )
+
+    op.create_index('ix_landmarks_country_key', 'landmarks', ['country_key'])
+    op.create_index('ix_landmarks_category_key', 'landmarks', ['category_key'])
+    op.create_index('idx_landmark_city_category_key', 'landmarks', ['city_key', 'category_key'])
+
+
+def downgrade():
+    op.drop_index('idx_landmark_city_category_key', table_name='landmarks')
+    op.drop_index('ix_landmarks_category_key', table_name='landmarks')
+    op.drop_index('ix_landmarks_country_key', table_name='landmarks')
+    for _, key_column in reversed(FILTER_KEY_COLUMNS):
+        op.drop_column('landmarks', key_column)
@@ -1,7 +1,10 @@
+import time
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from app.core.security import verify_token
+from app.core.config import settings
+from app.core.security import decode_token
 from app.core.database import get_db
+from app.core.user_cache import UserSnapshot, user_cache
 from sqlalchemy.orm import Session
 
 security = HTTPBearer()
@@ -9,23 +12,50 @@ security = HTTPBearer()
 def get_current_user(
     credentials: HTTPAuthorizationCredentials = Depends(security),
     db: Session = Depends(get_db)
-):
+) -> UserSnapshot:
     """
-    Зависимость для получения текущего пользователя из JWT токена
+    Зависимость для получения текущего пользователя из JWT токена.
+
+    Возвращает снимок пользователя (id, email, имя, аватар). Если в токене есть
+    данные пользователя, их срок доверия (uexp, TOKEN_USER_CLAIMS_TTL_MINUTES)
+    не истек и в этом процессе они не менялись после выдачи токена, БД не читается;
+    иначе снимок берется из кэша или загружается запросом к users.
     """
     from app.models.user import User
     
-    email = verify_token(credentials.credentials)
+    payload = decode_token(credentials.credentials)
+    email = payload.get("sub") if payload else None
     if email is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Неверные учетные данные",
         )
     
+    user_id = payload.get("uid")
+    claims_valid = (
+        settings.TOKEN_USER_CLAIMS
+        and user_id is not None
+        and payload.get("uexp", 0) > time.time()
+        and not user_cache.changed_since(user_id, payload.get("iat"))
+    )
+    if claims_valid:
+        return UserSnapshot(
+            id=user_id,
+            email=email,
+            full_name=payload.get("name"),
+            avatar_url=payload.get("avatar")
+        )
+    
+    snapshot = user_cache.get(email)
+    if snapshot is not None:
+        return snapshot
+    
     user = db.query(User).filter(User.email == email).first()
     if user is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Пользователь не найден",
         )
-    return user
\ No newline at end of file
+    snapshot = UserSnapshot.from_user(user)
+    user_cache.put(email, snapshot)
+    return snapshot
@@ -1,7 +1,8 @@
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
 from app.core.database import get_db
-from app.core.security import create_access_token, verify_password, get_password_hash
+from app.core.password_hasher import HashingOverloadedError, password_hasher
+from app.core.security import create_access_token, user_token_claims
 from app.schemas.user import UserCreate, UserLogin, Token, UserResponse
 from app.models.user import User as UserModel
 import logging
@@ -9,6 +10,17 @@ import logging
 logger = logging.getLogger(__name__)
 router = APIRouter()
 
+
+def _hashing_overloaded(e: HashingOverloadedError) -> HTTPException:
+    """Ответ 503 при переполненной очереди хэширования паролей"""
+    logger.warning(f"Хэширование пароля отклонено: {e}")
+    return HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail="Сервер перегружен, повторите попытку позже",
+        headers={"Retry-After": "1"}
+    )
+
+
 @router.post("/register", response_model=UserResponse)
 def register(user_data: UserCreate, db: Session = Depends(get_db)):
     """
@@ -28,7 +40,10 @@ def register(user_data: UserCreate, db: Session = Depends(get_db)):
         
         # Создаем нового пользователя
         logger.info(f"Хэшируем пароль для {user_data.email}")
-        hashed_password = get_password_hash(user_data.password)
+        try:
+            hashed_password = password_hasher.hash(user_data.password)
+        except HashingOverloadedError as e:
+            raise _hashing_overloaded(e)
         logger.info(f"Пароль успешно хэширован")
         
         db_user = UserModel(
@@ -70,14 +85,24 @@ def login(user_data: UserLogin, db: Session = Depends(get_db)):
             )
         
         logger.info(f"Проверяем пароль для {user_data.email}")
-        if not verify_password(user_data.password, db_user.hashed_password):
+        try:
+            valid, new_hash = password_hasher.verify_and_update(user_data.password, db_user.hashed_password)
+        except HashingOverloadedError as e:
+            raise _hashing_overloaded(e)
+        if not valid:
             logger.warning(f"Неверный пароль для пользователя {user_data.email}")
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Неверный email или пароль"
             )
         
-        access_token = create_access_token(subject=db_user.email)
+        # Параметры Argon2 изменились - сохраняем пересчитанный хэш
+        if new_hash:
+            db_user.hashed_password = new_hash
+            db.commit()
+            logger.info(f"Хэш пароля пользователя {user_data.email} пересчитан с новыми параметрами")
+        
+        access_token = create_access_token(subject=db_user.email, claims=user_token_claims(db_user))
         logger.info(f"Успешный вход пользователя {user_data.email}")
         return {"access_token": access_token, "token_type": "bearer"}
         
@@ -1,24 +1,29 @@
 from typing import List, Optional, Dict, Any
 from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
-from sqlalchemy import func, select
 
 from app.core.database import get_db
+from app.core.filter_keys import filter_key
+from app.core.pagination import TOTAL_MODE_PATTERN, count_pages, fetch_page
+from app.crud.city_crud import get_city_stats
+from app.crud.landmark_crud import find_cities_fuzzy, get_landmarks_fuzzy, landmark_search
 from app.models.city import CityProfile, CityCategoryStats
 from app.models.landmark import Landmark
-from app.models.review import Review
 from app.models.discussion import Discussion
 from app.schemas.city import (
     CityProfileResponse, 
     CityStatsResponse, 
-    PopularCityResponse
+    PopularCityResponse,
+    CitySuggestion
 )
 
+# Обработчики объявлены синхронными: FastAPI выполняет их в пуле потоков,
+# поэтому синхронные запросы SQLAlchemy не блокируют цикл событий
 router = APIRouter()
 
 
 @router.get("/profile/{city_name}", response_model=CityProfileResponse)
-async def read_city_profile(
+def read_city_profile(
     city_name: str,
     db: Session = Depends(get_db)
 ):
@@ -82,91 +87,19 @@ async def read_city_profile(
 
 
 @router.get("/stats/{city_name}", response_model=CityStatsResponse)
-async def read_city_stats(
+def read_city_stats(
     city_name: str,
     db: Session = Depends(get_db)
 ):
     """Получить детальную статистику по городу"""
-    # Получаем профиль города
-    city_profile = db.query(CityProfile).filter(
-        CityProfile.city_name == city_name
-    ).first()
-    
-    if not city_profile:
+    stats = get_city_stats(db, city_name)
+    if stats is None:
         raise HTTPException(status_code=404, detail="Город не найден")
-    
-    # Получаем статистику по категориям
-    category_stats = db.query(CityCategoryStats).filter(
-        CityCategoryStats.city_name == city_name
-    ).all()
-    
-    # Подсчитываем распределение рейтингов (от 1 до 5)
-    rating_distribution = {}
-    for i in range(1, 6):
-        count = db.query(func.count()).filter(
-            Review.landmark_id.in_(
-                db.query(Landmark.id).filter(Landmark.city == city_name)
-            ),
-            Review.rating == i
-        ).scalar()
-        rating_distribution[str(i)] = count or 0
-    
-    # Получаем количество открытых/закрытых обсуждений
-    open_discussions = db.query(func.count()).filter(
-        Discussion.city == city_name,
-        Discussion.is_closed == False
-    ).scalar() or 0
-    
-    closed_discussions = db.query(func.count()).filter(
-        Discussion.city == city_name,
-        Discussion.is_closed == True
-    ).scalar() or 0
-    
-    # Получаем количество обсуждений с ответами
-    discussions_with_answers = db.query(func.count()).filter(
-        Discussion.city == city_name,
-        Discussion.answers.any()
-    ).scalar() or 0
-    
-    # Получаем количество достопримечательностей с изображениями
-    landmarks_with_images = db.query(func.count()).filter(
-        Landmark.city == city_name,
-        Landmark.image_url != None,
-        Landmark.image_url != ""
-    ).scalar() or 0
-    
-    # Формируем словари для категорий
-    landmarks_by_category = {}
-    for stat in category_stats:
-        landmarks_by_category[stat.category] = stat.count
-    
-    # Формируем ответ
-    return {
-        "city_name": city_name,
-        "landmarks_stats": {
-            "total": city_profile.total_landmarks,
-            "with_images": landmarks_with_images,
-            "by_category": landmarks_by_category,
-            "categories_count": len(category_stats)
-        },
-        "reviews_stats": {
-            "total": city_profile.total_reviews,
-            "average_rating": float(city_profile.average_rating) if city_profile.average_rating else 0.0,
-            "rating_distribution": rating_distribution,
-            "rating_levels": 5  # Максимальный рейтинг
-        },
-        "discussions_stats": {
-            "total": city_profile.total_discussions,
-            "open": open_discussions,
-            "closed": closed_discussions,
-            "with_answers": discussions_with_answers,
-            "without_answers": city_profile.total_discussions - discussions_with_answers
-        }
-    }
+    return stats
 
 
 @router.get("/popular", response_model=List[PopularCityResponse])
-async def read_popular_cities(
+def read_popular_cities(
     limit: int = Query(10, ge=1, le=50),
     db: Session = Depends(get_db)
 ):
@@ -190,13 +123,14 @@ async def read_popular_cities(
 
 
 @router.get("/{city_name}/landmarks/filtered")
-async def read_filtered_city_landmarks(
+def read_filtered_city_landmarks(
     city_name: str,
     skip: int = Query(0, ge=0),
     limit: int = Query(50, ge=1, le=100),
     category: Optional[str] = None,
     min_rating: Optional[float] = Query(None, ge=1, le=5),
     has_images: Optional[bool] = None,
+    total_mode: str = Query("exact", alias="total", pattern=TOTAL_MODE_PATTERN),
     db: Session = Depends(get_db)
 ):
     """Получить отфильтрованные достопримечательности города"""
@@ -205,11 +139,12 @@ async def read_filtered_city_landmarks(
     if not city_exists:
         raise HTTPException(status_code=404, detail="Город не найден")
     
-    query = db.query(Landmark).filter(Landmark.city == city_name)
+    # Ключи города и категории - по составному индексу (city_key, category_key)
+    query = db.query(Landmark).filter(Landmark.city_key == filter_key(city_name))
     
     # Применяем фильтры
     if category:
-        query = query.filter(Landmark.category == category)
+        query = query.filter(Landmark.category_key == filter_key(category))
     
     if has_images is not None:
         if has_images:
@@ -223,23 +158,14 @@ async def read_filtered_city_landmarks(
             )
     
     if min_rating is not None:
-        # Находим достопримечательности с рейтингом выше указанного
-        subquery = db.query(Review.landmark_id).filter(
-            Review.landmark_id == Landmark.id
-        ).group_by(Review.landmark_id).having(
-            func.avg(Review.rating) >= min_rating
-        ).subquery()
-        
-        query = query.filter(Landmark.id.in_(select(subquery.c.landmark_id)))
+        # Достопримечательности со средним рейтингом не ниже указанного (по агрегатам)
+        query = query.filter(Landmark.average_rating >= min_rating)
     
-    # Считаем общее количество
-    total = query.count()
-    
-    # Применяем пагинацию
-    landmarks = query.offset(skip).limit(limit).all()
+    # Применяем пагинацию, общее количество - в том же запросе
+    landmarks, total = fetch_page(query.order_by(Landmark.id), skip, limit, total_mode)
     
     # Рассчитываем количество страниц
-    pages = (total + limit - 1) // limit if limit > 0 else 0
+    pages = count_pages(total, limit)
     page = skip // limit if limit > 0 else 0
     
     return {
@@ -252,7 +178,7 @@ async def read_filtered_city_landmarks(
 
 
 @router.get("/{city_name}/categories", response_model=List[str])
-async def read_city_categories(
+def read_city_categories(
     city_name: str,
     db: Session = Depends(get_db)
 ):
@@ -270,7 +196,7 @@ async def read_city_categories(
 
 
 @router.get("/{city_name}/discussions")
-async def read_city_discussions(
+def read_city_discussions(
     city_name: str,
     skip: int = Query(0, ge=0),
     limit: int = Query(50, ge=1, le=100),
@@ -305,30 +231,60 @@ async def read_city_discussions(
     }
 
 
+@router.get("/search", response_model=List[CitySuggestion])
+def search_cities(
+    q: str = Query(..., min_length=1, description="Название города, возможно с опечатками"),
+    limit: int = Query(10, ge=1, le=50),
+    db: Session = Depends(get_db)
+):
+    """Города, похожие на запрос, по убыванию сходства"""
+    return [
+        CitySuggestion(city=city, similarity=similarity)
+        for city, similarity in find_cities_fuzzy(db, q, limit=limit)
+    ]
+
+
 @router.post("/{city_name}/landmarks/search")
-async def search_city_landmarks(
+def search_city_landmarks(
     city_name: str,
     search: str = Query(..., min_length=1),
     skip: int = Query(0, ge=0),
     limit: int = Query(50, ge=1, le=100),
+    fuzzy: bool = Query(False, description="Нечеткий поиск: опечатки в названии города и в запросе"),
     db: Session = Depends(get_db)
 ):
     """Поиск достопримечательностей в городе"""
     # Проверяем, существует ли город
     city_exists = db.query(Landmark).filter(Landmark.city == city_name).first()
+    if not city_exists and fuzzy:
+        # Город с опечаткой - берем самый похожий
+        suggestions = find_cities_fuzzy(db, city_name, limit=1)
+        if suggestions:
+            city_name = suggestions[0][0]
+            city_exists = True
     if not city_exists:
         raise HTTPException(status_code=404, detail="Город не найден")
+
+    if fuzzy:
+        # limit самых похожих с оценкой сходства, без пагинации
+        landmarks = get_landmarks_fuzzy(db, search, limit=limit, city=city_name)
+        return {
+            "city": city_name,
+            "items": landmarks,
+            "total": len(landmarks),
+            "page": 0,
+            "size": len(landmarks),
+            "pages": 1
+        }
     
-    query = db.query(Landmark).filter(
-        Landmark.city == city_name,
-        (
-            Landmark.name.ilike(f"%{search}%") |
-            Landmark.description.ilike(f"%{search}%")
-        )
-    )
+    # Полнотекстовый поиск с ранжированием (ILIKE вне PostgreSQL)
+    condition, rank = landmark_search(db, search)
+    query = db.query(Landmark).filter(Landmark.city == city_name, condition)
     
     # Считаем общее количество
     total = query.count()
+    if rank is not None:
+        query = query.order_by(rank.desc(), Landmark.id)
     
     # Применяем пагинацию
     landmarks = query.offset(skip).limit(limit).all()
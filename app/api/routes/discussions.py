@@ -3,8 +3,9 @@ from sqlalchemy.orm import Session
 from typing import Optional, List
 
 from app.core.database import get_db
+from app.core.pagination import TOTAL_MODE_PATTERN, InvalidCursorError, count_pages
 from app.api.dependencies import get_current_user
-from app.models.user import User
+from app.core.user_cache import UserSnapshot
 from app.models.landmark import Landmark
 from app.schemas.discussion import (
     DiscussionCreate, 
@@ -12,6 +13,8 @@ from app.schemas.discussion import (
     DiscussionResponse,
     DiscussionWithAnswersResponse,
     DiscussionListResponse,
+    DiscussionSearchHit,
+    DiscussionSearchResponse,
     DiscussionAnswerCreate,
     DiscussionAnswerUpdate,
     DiscussionAnswerResponse,
@@ -21,6 +24,8 @@ from app.schemas.discussion import (
 from app.crud.discussion_crud import (
     get_discussion,
     get_discussions,
+    get_discussions_by_cursor,
+    search_discussions,
     create_discussion,
     update_discussion,
     delete_discussion,
@@ -42,23 +47,32 @@ def read_discussions(
     landmark_id: Optional[int] = Query(None, description="Фильтр по достопримечательности"),
     city: Optional[str] = Query(None, description="Фильтр по городу"),
     user_id: Optional[int] = Query(None, description="Фильтр по пользователю"),
-    search: Optional[str] = Query(None, description="Поиск по заголовку и содержанию"),
+    search: Optional[str] = Query(None, description="Поиск по заголовку, содержанию и ответам"),
     only_open: bool = Query(False, description="Только открытые обсуждения"),
+    cursor: Optional[str] = Query(None, description="Курсор следующей страницы (пустая строка - первая страница)"),
+    total_mode: str = Query("exact", alias="total", pattern=TOTAL_MODE_PATTERN, description="Подсчет общего количества: exact, estimate или none"),
     db: Session = Depends(get_db)
 ):
     """
-    Получить список обсуждений с фильтрами
+    Получить список обсуждений с фильтрами.
+    Если передан cursor, используется keyset-пагинация и skip игнорируется.
     """
-    discussions, total = get_discussions(
-        db,
-        skip=skip,
-        limit=limit,
+    filters = dict(
         landmark_id=landmark_id,
         city=city,
         user_id=user_id,
         search=search,
-        only_open=only_open
+        only_open=only_open,
+        total_mode=total_mode
     )
+    if cursor is not None:
+        try:
+            result = get_discussions_by_cursor(db, cursor=cursor, limit=limit, **filters)
+        except InvalidCursorError as e:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    else:
+        result = get_discussions(db, skip=skip, limit=limit, **filters)
+    discussions, total = result["items"], result["total"]
     
     # Преобразуем в ответ
     items = []
@@ -75,19 +89,72 @@ def read_discussions(
             created_at=discussion.created_at,
             updated_at=discussion.updated_at,
             is_closed=discussion.is_closed,
-            answer_count=len(discussion.answers)
+            answer_count=discussion.answer_count
         ))
     
     # Рассчитываем пагинацию
-    pages = (total + limit - 1) // limit if limit > 0 else 1
-    current_page = (skip // limit) + 1 if limit > 0 else 1
+    pages = count_pages(total, limit)
+    current_page = (skip // limit) + 1 if limit > 0 and cursor is None else None
     
     return DiscussionListResponse(
         items=items,
         total=total,
         page=current_page,
         size=limit,
-        pages=pages
+        pages=pages,
+        next_cursor=result.get("next_cursor")
+    )
+
+@router.get("/discussions/search", response_model=DiscussionSearchResponse)
+def search_discussions_endpoint(
+    q: str = Query(..., min_length=1, max_length=200, description="Поисковый запрос"),
+    skip: int = Query(0, ge=0, description="Смещение для пагинации"),
+    limit: int = Query(20, ge=1, le=100, description="Лимит записей"),
+    landmark_id: Optional[int] = Query(None, description="Фильтр по достопримечательности"),
+    city: Optional[str] = Query(None, description="Фильтр по городу"),
+    only_open: bool = Query(False, description="Только открытые обсуждения"),
+    total_mode: str = Query("exact", alias="total", pattern=TOTAL_MODE_PATTERN, description="Подсчет общего количества: exact, estimate или none"),
+    db: Session = Depends(get_db)
+):
+    """
+    Полнотекстовый поиск по обсуждениям и ответам на них.
+    Обсуждения идут по убыванию релевантности; совпадения в ответах учитываются
+    в релевантности обсуждения, во фрагментах совпадения выделены <b>...</b>.
+    """
+    result = search_discussions(
+        db, q, skip=skip, limit=limit, landmark_id=landmark_id, city=city,
+        only_open=only_open, total_mode=total_mode
+    )
+    
+    items = []
+    for hit in result["items"]:
+        discussion = hit["discussion"]
+        items.append(DiscussionSearchHit(
+            id=discussion.id,
+            title=discussion.title,
+            content=discussion.content,
+            user_id=discussion.user_id,
+            user_name=discussion.user.full_name,
+            user_avatar=discussion.user.avatar_url,
+            landmark_id=discussion.landmark_id,
+            city=discussion.city,
+            created_at=discussion.created_at,
+            updated_at=discussion.updated_at,
+            is_closed=discussion.is_closed,
+            answer_count=discussion.answer_count,
+            answer_hits=hit["answer_hits"],
+            rank=hit["rank"],
+            title_highlight=hit["title_highlight"],
+            snippet=hit["snippet"],
+            answer_snippet=hit["answer_snippet"]
+        ))
+    
+    return DiscussionSearchResponse(
+        items=items,
+        total=result["total"],
+        page=(skip // limit) + 1,
+        size=limit,
+        pages=result["pages"]
     )
 
 @router.get("/discussions/{discussion_id}", response_model=DiscussionWithAnswersResponse)
@@ -136,7 +203,7 @@ def read_discussion(
         created_at=discussion.created_at,
         updated_at=discussion.updated_at,
         is_closed=discussion.is_closed,
-        answer_count=len(discussion.answers),
+        answer_count=discussion.answer_count,
         answers=answer_items
     )
 
@@ -144,7 +211,7 @@ def read_discussion(
 def create_new_discussion(
     discussion: DiscussionCreate,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: UserSnapshot = Depends(get_current_user)
 ):
     """
     Создать новое обсуждение
@@ -180,13 +247,13 @@ def update_existing_discussion(
     discussion_id: int,
     discussion: DiscussionUpdate,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: UserSnapshot = Depends(get_current_user)
 ):
     """
     Обновить обсуждение
     """
     db_discussion = update_discussion(
-        db, discussion_id=discussion_id, discussion=discussion, user_id=current_user.id
+        db, discussion_id=discussion_id, discussion_update=discussion, user_id=current_user.id
     )
     
     if db_discussion is None:
@@ -207,14 +274,14 @@ def update_existing_discussion(
         created_at=db_discussion.created_at,
         updated_at=db_discussion.updated_at,
         is_closed=db_discussion.is_closed,
-        answer_count=len(db_discussion.answers)
+        answer_count=db_discussion.answer_count
     )
 
 @router.delete("/discussions/{discussion_id}")
 def delete_existing_discussion(
     discussion_id: int,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: UserSnapshot = Depends(get_current_user)
 ):
     """
     Удалить обсуждение
@@ -277,7 +344,7 @@ def create_new_answer(
     discussion_id: int,
     answer: DiscussionAnswerCreate,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: UserSnapshot = Depends(get_current_user)
 ):
     """
     Создать ответ на обсуждение
@@ -319,12 +386,12 @@ def update_existing_answer(
     answer_id: int,
     answer: DiscussionAnswerUpdate,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: UserSnapshot = Depends(get_current_user)
 ):
     """
     Обновить ответ
     """
-    db_answer = update_answer(db, answer_id=answer_id, answer=answer, user_id=current_user.id)
+    db_answer = update_answer(db, answer_id=answer_id, answer_update=answer, user_id=current_user.id)
     
     if db_answer is None:
         raise HTTPException(
@@ -349,7 +416,7 @@ def update_existing_answer(
 def delete_existing_answer(
     answer_id: int,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: UserSnapshot = Depends(get_current_user)
 ):
     """
     Удалить ответ
@@ -369,7 +436,7 @@ def vote_for_answer(
     answer_id: int,
     vote: HelpfulVote,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: UserSnapshot = Depends(get_current_user)
 ):
     """
     Голосовать за полезность ответа
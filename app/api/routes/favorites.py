@@ -3,8 +3,9 @@ from sqlalchemy.orm import Session
 from typing import List
 
 from app.core.database import get_db
+from app.core.pagination import TOTAL_MODE_PATTERN
 from app.api.dependencies import get_current_user
-from app.models.user import User
+from app.core.user_cache import UserSnapshot
 from app.models.landmark import Landmark
 from app.schemas.favorite import (
     FavoriteCreate, 
@@ -26,14 +27,15 @@ router = APIRouter()
 def read_user_favorites(
     skip: int = Query(0, ge=0, description="Смещение для пагинации"),
     limit: int = Query(50, ge=1, le=100, description="Лимит записей"),
+    total_mode: str = Query("exact", alias="total", pattern=TOTAL_MODE_PATTERN, description="Подсчет общего количества: exact, estimate или none"),
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: UserSnapshot = Depends(get_current_user)
 ):
     """
     Получить список избранных достопримечательностей пользователя.
     """
     favorites, total = get_user_favorites(
-        db, user_id=current_user.id, skip=skip, limit=limit
+        db, user_id=current_user.id, skip=skip, limit=limit, total_mode=total_mode
     )
     
     # Преобразуем в ответ с информацией о достопримечательностях
@@ -57,7 +59,7 @@ def read_user_favorites(
 def add_to_favorites(
     favorite: FavoriteCreate,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: UserSnapshot = Depends(get_current_user)
 ):
     """
     Добавить достопримечательность в избранное.
@@ -83,7 +85,7 @@ def add_to_favorites(
 def remove_from_favorites(
     landmark_id: int,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: UserSnapshot = Depends(get_current_user)
 ):
     """
     Удалить достопримечательность из избранного.
@@ -102,7 +104,7 @@ def remove_from_favorites(
 def check_favorite_status(
     landmark_id: int,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: UserSnapshot = Depends(get_current_user)
 ):
     """
     Проверить, находится ли достопримечательность в избранном.
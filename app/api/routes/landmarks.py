@@ -1,30 +1,48 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+import io
+from datetime import datetime
+
+from fastapi import APIRouter, Depends, File, HTTPException, status, Query, UploadFile
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 from typing import Optional, List
 
-from app.core.database import get_db
+from app.core.database import SessionLocal, get_db
+from app.core.filter_keys import FILTER_MATCH_PATTERN
+from app.core.pagination import TOTAL_MODE_PATTERN, InvalidCursorError, count_pages
+from app.core.streaming import STREAM_MEDIA_TYPES
 
 from app.api.dependencies import get_current_user
-from app.models.user import User
+from app.core.user_cache import UserSnapshot
 from app.schemas.landmark import (
     LandmarkResponse,
     LandmarkCreate,
     LandmarkUpdate,
     LandmarkListResponse,
     FiltersResponse,
-    LandmarkWithDistance
+    LandmarkWithDistance,
+    LandmarkImportResult,
+    NearbyBatchRequest,
+    AutocompleteSuggestion
 )
 from app.crud.landmark_crud import (
     get_landmark,
     get_landmarks,
+    get_landmarks_by_cursor,
+    get_landmarks_fuzzy,
     create_landmark,
     update_landmark,
     delete_landmark,
     get_cities,
     get_categories,
-    get_landmarks_near_location
+    get_landmarks_near_location,
+    get_landmarks_near_locations,
+    get_nearest_landmarks,
+    autocomplete
 )
 
+from app.services.data_export import export_headers, stream_export
+from app.services.landmark_import import DEFAULT_BATCH_SIZE, detect_format, import_landmarks
+
 router = APIRouter()
 
 
@@ -36,11 +54,56 @@ def read_landmarks(
     country: Optional[str] = Query(None, description="Фильтр по стране"),
     category: Optional[str] = Query(None, description="Фильтр по категории"),
     search: Optional[str] = Query(None, description="Поиск по названию и описанию"),
+    cursor: Optional[str] = Query(None, description="Курсор следующей страницы (пустая строка - первая страница)"),
+    total_mode: str = Query("exact", alias="total", pattern=TOTAL_MODE_PATTERN, description="Подсчет общего количества: exact, estimate или none"),
+    fuzzy: bool = Query(False, description="Нечеткий поиск с опечатками: limit самых похожих по названию или городу"),
+    match: str = Query("exact", pattern=FILTER_MATCH_PATTERN, description="Фильтры city, country и category: exact (точное значение без учета регистра и диакритики) или contains (подстрока)"),
     db: Session = Depends(get_db)
 ):
     """
     Получить список достопримечательностей с пагинацией и фильтрацией.
+    Фильтры по городу, стране и категории по умолчанию точные и идут по индексам;
+    match=contains ищет подстроку.
+    Если передан cursor, используется keyset-пагинация и skip игнорируется.
+    При fuzzy=true и непустом search возвращаются limit самых похожих записей
+    с оценкой сходства similarity, без пагинации.
     """
+    if fuzzy and search:
+        landmarks = get_landmarks_fuzzy(
+            db,
+            search=search,
+            limit=limit,
+            city=city,
+            country=country,
+            category=category,
+            match=match
+        )
+        return LandmarkListResponse(items=landmarks, total=len(landmarks), page=1, size=limit, pages=1)
+
+    if cursor is not None:
+        try:
+            landmarks, total, next_cursor = get_landmarks_by_cursor(
+                db,
+                cursor=cursor,
+                limit=limit,
+                city=city,
+                country=country,
+                category=category,
+                search=search,
+                total_mode=total_mode,
+                match=match
+            )
+        except InvalidCursorError as e:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+        return LandmarkListResponse(
+            items=landmarks,
+            total=total,
+            size=limit,
+            pages=count_pages(total, limit),
+            next_cursor=next_cursor
+        )
+
     landmarks, total = get_landmarks(
         db,
         skip=skip,
@@ -48,11 +111,13 @@ def read_landmarks(
         city=city,
         country=country,
         category=category,
-        search=search
+        search=search,
+        total_mode=total_mode,
+        match=match
     )
 
     # Рассчитываем пагинацию
-    pages = (total + limit - 1) // limit if limit > 0 else 1
+    pages = count_pages(total, limit)
     current_page = (skip // limit) + 1 if limit > 0 else 1
 
     return LandmarkListResponse(
@@ -85,6 +150,77 @@ def get_nearby_landmarks(
     return landmarks
 
 
+@router.post("/landmarks/nearby/batch", response_model=List[List[LandmarkWithDistance]])
+def get_nearby_landmarks_batch(
+    request: NearbyBatchRequest,
+    db: Session = Depends(get_db)
+):
+    """
+    Найти достопримечательности поблизости сразу для нескольких точек
+    (например, для точек маршрута). Результаты идут в порядке точек запроса.
+    """
+    return get_landmarks_near_locations(
+        db=db,
+        points=[(point.latitude, point.longitude) for point in request.points],
+        radius_km=request.radius,
+        limit=request.limit
+    )
+
+
+@router.get("/landmarks/nearest", response_model=List[LandmarkWithDistance])
+def read_nearest_landmarks(
+    latitude: float = Query(..., ge=-90, le=90, description="Широта текущего местоположения"),
+    longitude: float = Query(..., ge=-180, le=180, description="Долгота текущего местоположения"),
+    k: int = Query(10, ge=1, le=100, description="Количество ближайших достопримечательностей"),
+    max_radius: Optional[float] = Query(None, gt=0, description="Максимальный радиус поиска в км"),
+    db: Session = Depends(get_db)
+):
+    """
+    Найти k ближайших достопримечательностей к указанным координатам.
+    """
+    return get_nearest_landmarks(
+        db=db,
+        latitude=latitude,
+        longitude=longitude,
+        k=k,
+        max_radius_km=max_radius
+    )
+
+
+@router.get("/landmarks/autocomplete", response_model=List[AutocompleteSuggestion])
+def autocomplete_landmarks(
+    q: str = Query(..., min_length=1, max_length=100, description="Начало названия, города или категории"),
+    limit: int = Query(10, ge=1, le=50, description="Максимальное количество подсказок"),
+    db: Session = Depends(get_db)
+):
+    """
+    Подсказки по мере набора: достопримечательности, города и категории,
+    у которых какое-либо слово начинается с q, по убыванию популярности.
+    Отвечает из префиксного индекса в памяти, без запросов к БД.
+    """
+    return [suggestion._asdict() for suggestion in autocomplete(db, q, limit)]
+
+
+@router.get("/landmarks/export", response_class=StreamingResponse)
+def export_landmarks(
+    export_format: str = Query("ndjson", alias="format", pattern="^(ndjson|csv)$", description="Формат выгрузки"),
+    city: Optional[str] = Query(None, description="Фильтр по городу"),
+    category: Optional[str] = Query(None, description="Фильтр по категории"),
+    updated_since: Optional[datetime] = Query(None, description="Только созданные или измененные начиная с этого момента"),
+    gzip: bool = Query(False, description="Сжимать ответ gzip на лету"),
+    current_user: UserSnapshot = Depends(get_current_user)
+):
+    """
+    Полная выгрузка достопримечательностей с рейтингами одним потоком (требуется аутентификация).
+    Строки читаются серверным курсором пачками, поэтому память не зависит от размера таблицы.
+    """
+    return StreamingResponse(
+        stream_export(SessionLocal, "landmarks", export_format, city, category, updated_since, compress=gzip),
+        media_type=STREAM_MEDIA_TYPES[export_format],
+        headers=export_headers("landmarks", export_format, compress=gzip)
+    )
+
+
 @router.get("/landmarks/{landmark_id}", response_model=LandmarkResponse)
 def read_landmark(
     landmark_id: int,
@@ -106,7 +242,7 @@ def read_landmark(
 def create_new_landmark(
     landmark: LandmarkCreate,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: UserSnapshot = Depends(get_current_user)
 ):
     """
     Создать новую достопримечательность (требуется аутентификация).
@@ -114,12 +250,44 @@ def create_new_landmark(
     return create_landmark(db=db, landmark=landmark)
 
 
+@router.post("/landmarks/import", response_model=LandmarkImportResult)
+def import_landmarks_file(
+    file: UploadFile = File(..., description="Файл CSV или JSONL (одна достопримечательность на строку)"),
+    file_format: Optional[str] = Query(None, alias="format", pattern="^(csv|jsonl)$", description="Формат файла; по умолчанию по расширению"),
+    batch_size: int = Query(DEFAULT_BATCH_SIZE, ge=1, le=5000, description="Размер пачки записи"),
+    db: Session = Depends(get_db),
+    current_user: UserSnapshot = Depends(get_current_user)
+):
+    """
+    Массовый импорт достопримечательностей (требуется аутентификация).
+    Файл разбирается потоком, строки проверяются схемой LandmarkCreate и записываются
+    пачками; строки с тем же external_id обновляются. Ошибочные строки попадают
+    в отчет и не прерывают импорт.
+    """
+    file_format = file_format or detect_format(file.filename)
+    if file_format is None:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Не удалось определить формат файла: укажите format=csv или format=jsonl"
+        )
+    stream = io.TextIOWrapper(file.file, encoding="utf-8-sig", newline="")
+    try:
+        return import_landmarks(db, stream, file_format, batch_size=batch_size)
+    except UnicodeDecodeError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Файл должен быть в кодировке UTF-8"
+        )
+    finally:
+        stream.detach()
+
+
 @router.put("/landmarks/{landmark_id}", response_model=LandmarkResponse)
 def update_existing_landmark(
     landmark_id: int,
     landmark: LandmarkUpdate,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: UserSnapshot = Depends(get_current_user)
 ):
     """
     Обновить информацию о достопримечательности (требуется аутентификация).
@@ -141,7 +309,7 @@ def update_existing_landmark(
 def delete_existing_landmark(
     landmark_id: int,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: UserSnapshot = Depends(get_current_user)
 ):
     """
     Удалить достопримечательность (требуется аутентификация).
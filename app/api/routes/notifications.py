@@ -1,11 +1,11 @@
-<<<<<<< Updated upstream
 from fastapi import APIRouter, Depends, HTTPException, status, Query
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional
 
 from app.core.database import get_db
+from app.core.pagination import TOTAL_MODE_PATTERN, InvalidCursorError
 from app.api.dependencies import get_current_user
-from app.models.user import User
+from app.core.user_cache import UserSnapshot
 from app.schemas.notification import (
     NotificationResponse,
     NotificationListResponse,
@@ -15,36 +15,17 @@ from app.schemas.notification import (
 )
 from app.crud.notification_crud import (
     get_user_notifications,
+    get_user_notifications_by_cursor,
     create_system_notification,
     mark_as_read,
     mark_as_archived,
     delete_notification,
     delete_all_read_notifications,
     get_notification_stats
-=======
-from typing import List
-from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy.orm import Session
-from app.core.database import get_db
-from app.core.security import get_current_user
-from app.crud.notification_crud import (
-    get_user_notifications,
-    get_unread_count,
-    mark_as_read,
-    mark_all_as_read,
-    delete_notification,
-    get_notification
-)
-from app.schemas.notification import (
-    NotificationResponse,
-    NotificationListResponse,
-    UnreadCountResponse
->>>>>>> Stashed changes
 )
 
 router = APIRouter()
 
-<<<<<<< Updated upstream
 # --- Получение уведомлений ---
 
 @router.get("/notifications", response_model=NotificationListResponse)
@@ -53,20 +34,39 @@ def read_user_notifications(
     limit: int = Query(50, ge=1, le=100, description="Лимит записей"),
     only_unread: bool = Query(False, description="Только непрочитанные"),
     include_archived: bool = Query(False, description="Включая архивированные"),
+    cursor: Optional[str] = Query(None, description="Курсор следующей страницы (пустая строка - первая страница)"),
+    total_mode: str = Query("exact", alias="total", pattern=TOTAL_MODE_PATTERN, description="Подсчет общего количества: exact, estimate или none"),
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: UserSnapshot = Depends(get_current_user)
 ):
     """
-    Получить уведомления пользователя
-    """
-    notifications, total, unread_count = get_user_notifications(
-        db,
-        user_id=current_user.id,
-        skip=skip,
-        limit=limit,
-        only_unread=only_unread,
-        include_archived=include_archived
-    )
+    Получить уведомления пользователя.
+    Если передан cursor, используется keyset-пагинация и skip игнорируется.
+    """
+    next_cursor = None
+    if cursor is not None:
+        try:
+            notifications, total, unread_count, next_cursor = get_user_notifications_by_cursor(
+                db,
+                user_id=current_user.id,
+                cursor=cursor,
+                limit=limit,
+                only_unread=only_unread,
+                include_archived=include_archived,
+                total_mode=total_mode
+            )
+        except InvalidCursorError as e:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    else:
+        notifications, total, unread_count = get_user_notifications(
+            db,
+            user_id=current_user.id,
+            skip=skip,
+            limit=limit,
+            only_unread=only_unread,
+            include_archived=include_archived,
+            total_mode=total_mode
+        )
     
     items = []
     for notification in notifications:
@@ -86,13 +86,14 @@ def read_user_notifications(
     return NotificationListResponse(
         items=items,
         total=total,
-        unread_count=unread_count
+        unread_count=unread_count,
+        next_cursor=next_cursor
     )
 
 @router.get("/notifications/stats", response_model=NotificationStatsResponse)
 def get_notifications_stats(
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: UserSnapshot = Depends(get_current_user)
 ):
     """
     Получить статистику по уведомлениям
@@ -106,7 +107,7 @@ def get_notifications_stats(
 def mark_notifications_as_read(
     request: MarkAsReadRequest,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: UserSnapshot = Depends(get_current_user)
 ):
     """
     Отметить уведомления как прочитанные
@@ -127,7 +128,7 @@ def mark_notifications_as_read(
 def mark_single_as_read(
     notification_id: int,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: UserSnapshot = Depends(get_current_user)
 ):
     """
     Отметить одно уведомление как прочитанное
@@ -146,7 +147,7 @@ def mark_single_as_read(
 def archive_notifications(
     notification_ids: List[int],
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: UserSnapshot = Depends(get_current_user)
 ):
     """
     Архивировать уведомления
@@ -159,7 +160,7 @@ def archive_notifications(
 def delete_user_notification(
     notification_id: int,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: UserSnapshot = Depends(get_current_user)
 ):
     """
     Удалить уведомление
@@ -177,7 +178,7 @@ def delete_user_notification(
 @router.delete("/notifications/cleanup/read")
 def cleanup_read_notifications(
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: UserSnapshot = Depends(get_current_user)
 ):
     """
     Удалить все прочитанные уведомления
@@ -191,7 +192,7 @@ def cleanup_read_notifications(
 @router.post("/notifications/test")
 def send_test_notification(
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: UserSnapshot = Depends(get_current_user)
 ):
     """
     Отправить тестовое уведомление (для разработки)
@@ -209,78 +210,3 @@ def send_test_notification(
         "message": "Тестовое уведомление отправлено",
         "notification_id": notification.id
     }
-=======
-
-@router.get("/", response_model=NotificationListResponse)
-async def read_notifications(
-    skip: int = Query(0, ge=0),
-    limit: int = Query(50, ge=1, le=100),
-    unread_only: bool = Query(False),
-    db: Session = Depends(get_db),
-    current_user = Depends(get_current_user)
-):
-    """Получить уведомления текущего пользователя"""
-    notifications, total = get_user_notifications(
-        db, 
-        user_id=current_user.id,
-        skip=skip,
-        limit=limit,
-        unread_only=unread_only
-    )
-    
-    unread_count = get_unread_count(db, current_user.id)
-    
-    return {
-        "items": notifications,
-        "total": total,
-        "unread_count": unread_count
-    }
-
-
-@router.get("/unread-count", response_model=UnreadCountResponse)
-async def get_unread_notifications_count(
-    db: Session = Depends(get_db),
-    current_user = Depends(get_current_user)
-):
-    """Получить количество непрочитанных уведомлений"""
-    count = get_unread_count(db, current_user.id)
-    return {"count": count}
-
-
-@router.put("/{notification_id}/read", response_model=NotificationResponse)
-async def mark_notification_as_read(
-    notification_id: int,
-    db: Session = Depends(get_db),
-    current_user = Depends(get_current_user)
-):
-    """Отметить уведомление как прочитанное"""
-    notification = mark_as_read(db, notification_id, current_user.id)
-    if not notification:
-        raise HTTPException(status_code=404, detail="Уведомление не найдено")
-    return notification
-
-
-@router.put("/read-all", response_model=dict)
-async def mark_all_notifications_as_read(
-    db: Session = Depends(get_db),
-    current_user = Depends(get_current_user)
-):
-    """Отметить все уведомления как прочитанные"""
-    success = mark_all_as_read(db, current_user.id)
-    if success:
-        return {"message": "Все уведомления отмечены как прочитанные"}
-    return {"message": "Не удалось обновить уведомления"}
-
-
-@router.delete("/{notification_id}", response_model=dict)
-async def delete_notification_by_id(
-    notification_id: int,
-    db: Session = Depends(get_db),
-    current_user = Depends(get_current_user)
-):
-    """Удалить уведомление"""
-    success = delete_notification(db, notification_id, current_user.id)
-    if not success:
-        raise HTTPException(status_code=404, detail="Уведомление не найдено")
-    return {"message": "Уведомление удалено"}
->>>>>>> Stashed changes
@@ -2,7 +2,7 @@ from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
 from app.core.database import get_db
 from app.api.dependencies import get_current_user
-from app.models.user import User
+from app.core.user_cache import UserSnapshot
 from app.schemas.profile import UserProfileResponse, UserProfileUpdate, UserStatsResponse
 from app.crud.user_crud import get_user_profile, update_user_profile, get_user_stats
 
@@ -11,7 +11,7 @@ router = APIRouter()
 @router.get("/profile", response_model=UserProfileResponse)
 def read_user_profile(
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: UserSnapshot = Depends(get_current_user)
 ):
     """
     Получить профиль текущего пользователя
@@ -28,7 +28,7 @@ def read_user_profile(
 def update_profile(
     profile_update: UserProfileUpdate,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: UserSnapshot = Depends(get_current_user)
 ):
     """
     Обновить профиль пользователя
@@ -48,7 +48,7 @@ def update_profile(
 @router.get("/profile/stats", response_model=UserStatsResponse)
 def get_profile_stats(
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: UserSnapshot = Depends(get_current_user)
 ):
     """
     Получить статистику пользователя
@@ -1,10 +1,15 @@
+from datetime import datetime
+
 from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional
 
-from app.core.database import get_db
+from app.core.database import SessionLocal, get_db
+from app.core.pagination import TOTAL_MODE_PATTERN, InvalidCursorError
+from app.core.streaming import STREAM_MEDIA_TYPES
 from app.api.dependencies import get_current_user
-from app.models.user import User
+from app.core.user_cache import UserSnapshot
 from app.models.landmark import Landmark
 from app.schemas.review import (
     ReviewCreate,
@@ -19,9 +24,11 @@ from app.crud.review_crud import (
     update_review,
     delete_review,
     get_reviews_by_landmark,
+    get_reviews_by_landmark_cursor,
     get_reviews_by_user,
     get_landmark_rating_summary
 )
+from app.services.data_export import export_headers, stream_export
 
 router = APIRouter()
 
@@ -31,14 +38,26 @@ def read_landmark_reviews(
     landmark_id: int,
     skip: int = Query(0, ge=0, description="Смещение для пагинации"),
     limit: int = Query(50, ge=1, le=100, description="Лимит записей"),
+    cursor: Optional[str] = Query(None, description="Курсор следующей страницы (пустая строка - первая страница)"),
+    total_mode: str = Query("exact", alias="total", pattern=TOTAL_MODE_PATTERN, description="Подсчет общего количества: exact, estimate или none"),
     db: Session = Depends(get_db)
 ):
     """
     Получить все отзывы для достопримечательности.
+    Если передан cursor, используется keyset-пагинация и skip игнорируется.
     """
-    reviews, total = get_reviews_by_landmark(
-        db, landmark_id=landmark_id, skip=skip, limit=limit
-    )
+    next_cursor = None
+    if cursor is not None:
+        try:
+            reviews, total, next_cursor = get_reviews_by_landmark_cursor(
+                db, landmark_id=landmark_id, cursor=cursor, limit=limit, total_mode=total_mode
+            )
+        except InvalidCursorError as e:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    else:
+        reviews, total = get_reviews_by_landmark(
+            db, landmark_id=landmark_id, skip=skip, limit=limit, total_mode=total_mode
+        )
     
     # Преобразуем в ответ с информацией о пользователях
     items = []
@@ -54,7 +73,7 @@ def read_landmark_reviews(
             updated_at=review.updated_at
         ))
     
-    return ReviewListResponse(items=items, total=total)
+    return ReviewListResponse(items=items, total=total, next_cursor=next_cursor)
 
 
 @router.get("/reviews/user", response_model=ReviewListResponse)
@@ -62,7 +81,7 @@ def read_user_reviews(
     skip: int = Query(0, ge=0, description="Смещение для пагинации"),
     limit: int = Query(50, ge=1, le=100, description="Лимит записей"),
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: UserSnapshot = Depends(get_current_user)
 ):
     """
     Получить все отзывы текущего пользователя.
@@ -94,7 +113,7 @@ def read_user_reviews(
 def create_new_review(
     review: ReviewCreate,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: UserSnapshot = Depends(get_current_user)
 ):
     """
     Создать новый отзыв.
@@ -126,7 +145,7 @@ def update_existing_review(
     landmark_id: int,
     review: ReviewUpdate,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: UserSnapshot = Depends(get_current_user)
 ):
     """
     Обновить отзыв для достопримечательности.
@@ -157,7 +176,7 @@ def update_existing_review(
 def delete_existing_review(
     landmark_id: int,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: UserSnapshot = Depends(get_current_user)
 ):
     """
     Удалить отзыв для достопримечательности.
@@ -189,4 +208,23 @@ def get_review_summary(
         average_rating=average_rating,
         total_reviews=total_reviews,
         rating_distribution=rating_distribution
-    )
\ No newline at end of file
+    )
+
+
+@router.get("/reviews/export", response_class=StreamingResponse)
+def export_reviews(
+    export_format: str = Query("ndjson", alias="format", pattern="^(ndjson|csv)$", description="Формат выгрузки"),
+    city: Optional[str] = Query(None, description="Фильтр по городу достопримечательности"),
+    category: Optional[str] = Query(None, description="Фильтр по категории достопримечательности"),
+    updated_since: Optional[datetime] = Query(None, description="Только созданные или измененные начиная с этого момента"),
+    gzip: bool = Query(False, description="Сжимать ответ gzip на лету"),
+    current_user: UserSnapshot = Depends(get_current_user)
+):
+    """
+    Полная выгрузка отзывов одним потоком (требуется аутентификация).
+    """
+    return StreamingResponse(
+        stream_export(SessionLocal, "reviews", export_format, city, category, updated_since, compress=gzip),
+        media_type=STREAM_MEDIA_TYPES[export_format],
+        headers=export_headers("reviews", export_format, compress=gzip)
+    )
@@ -0,0 +1,50 @@
+from fastapi import APIRouter, Depends, HTTPException, status, Query
+from sqlalchemy.orm import Session
+from typing import Optional
+
+from app.core.database import get_db
+from app.core.pagination import InvalidCursorError
+from app.crud.sync_crud import SyncTokenExpiredError, get_changes
+from app.schemas.sync import SyncChangesResponse, SyncLandmark, SyncReview
+
+router = APIRouter()
+
+
+@router.get("/sync/changes", response_model=SyncChangesResponse)
+def read_changes(
+    since: Optional[str] = Query(None, description="Токен next_token предыдущего ответа; без токена - полный снимок"),
+    limit: int = Query(500, ge=1, le=5000, description="Максимум записей каждого типа в ответе"),
+    db: Session = Depends(get_db)
+):
+    """
+    Изменения достопримечательностей (с агрегатами рейтинга) и отзывов после токена,
+    плюс надгробия удаленных записей. Клиент сохраняет next_token и повторяет запрос,
+    пока has_more. На устаревший токен возвращается 410 - нужна полная синхронизация.
+    """
+    try:
+        changes = get_changes(db, since=since, limit=limit)
+    except SyncTokenExpiredError as e:
+        raise HTTPException(status_code=status.HTTP_410_GONE, detail=str(e))
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+    return SyncChangesResponse(
+        landmarks=[SyncLandmark.model_validate(landmark) for landmark in changes["landmarks"]],
+        reviews=[
+            SyncReview(
+                id=review.id,
+                landmark_id=review.landmark_id,
+                user_id=review.user_id,
+                user_name=review.user.full_name,
+                rating=review.rating,
+                comment=review.comment,
+                created_at=review.created_at,
+                updated_at=review.updated_at
+            )
+            for review in changes["reviews"]
+        ],
+        deleted=changes["deleted"],
+        next_token=changes["next_token"],
+        has_more=changes["has_more"],
+        server_time=changes["server_time"]
+    )
@@ -0,0 +1,200 @@
+import heapq
+import threading
+from bisect import bisect_left, insort
+from typing import Dict, Hashable, Iterable, List, NamedTuple, Optional, Tuple
+
+from app.core.ngram_index import split_words
+
+# Верхняя граница диапазона ключей с данным префиксом
+_PREFIX_END = "\uffff"
+
+
+def normalize_key(text: str) -> str:
+    """Ключ поиска: слова в нижнем регистре через пробел, ё -> е"""
+    return " ".join(split_words(text.replace("ё", "е").replace("Ё", "Е")))
+
+
+class Suggestion(NamedTuple):
+    kind: str  # landmark, city, category
+    text: str
+    weight: int
+    landmark_id: Optional[int] = None
+    city: Optional[str] = None
+
+
+class AutocompleteIndex:
+    """
+    Префиксный индекс подсказок в памяти процесса: отсортированный массив ключей
+    (ключ, идентификатор подсказки). Поиск по префиксу - два бинарных поиска
+    и выбор самых популярных подсказок из диапазона, без обращения к БД.
+
+    Достопримечательность находится по началу любого слова названия
+    ("эрм" -> "Государственный Эрмитаж"). Вес достопримечательности - число отзывов
+    и добавлений в избранное, города и категории - число достопримечательностей.
+    Ответы кэшируются до следующего изменения индекса.
+    """
+
+    def __init__(self, cache_size: int = 10000):
+        self._keys: List[Tuple[str, Hashable]] = []
+        self._suggestions: Dict[Hashable, Suggestion] = {}
+        # Для инкрементальных обновлений: что было записано по достопримечательности
+        self._landmarks: Dict[int, Tuple[str, str, str, int, int]] = {}
+        self._counts: Dict[Hashable, int] = {}
+        self._cache: Dict[Tuple[str, int], List[Suggestion]] = {}
+        self._cache_size = cache_size
+        self._lock = threading.RLock()
+        self.is_built = False
+
+    def __len__(self) -> int:
+        return len(self._suggestions)
+
+    @staticmethod
+    def _word_keys(text: str) -> List[str]:
+        """Ключи текста: с начала каждого слова до конца"""
+        words = normalize_key(text).split(" ")
+        return [" ".join(words[i:]) for i in range(len(words)) if words[i]]
+
+    def _add(self, ident: Hashable, suggestion: Suggestion) -> None:
+        self._suggestions[ident] = suggestion
+        for key in self._word_keys(suggestion.text):
+            insort(self._keys, (key, ident))
+
+    def _discard(self, ident: Hashable) -> None:
+        suggestion = self._suggestions.pop(ident, None)
+        if suggestion is None:
+            return
+        for key in self._word_keys(suggestion.text):
+            position = bisect_left(self._keys, (key, ident))
+            if position < len(self._keys) and self._keys[position] == (key, ident):
+                del self._keys[position]
+
+    def _adjust_count(self, kind: str, text: str, delta: int) -> None:
+        """Изменить число достопримечательностей города или категории"""
+        ident = (kind, text)
+        count = self._counts.get(ident, 0) + delta
+        if count <= 0:
+            self._counts.pop(ident, None)
+            self._discard(ident)
+        elif ident in self._counts:
+            # Ключи не меняются - достаточно заменить вес
+            self._counts[ident] = count
+            self._suggestions[ident] = Suggestion(kind, text, count)
+        else:
+            self._counts[ident] = count
+            self._add(ident, Suggestion(kind, text, count))
+
+    def build(self, landmarks: Iterable[Tuple[int, str, str, str, int, int]]) -> None:
+        """
+        Полностью перестроить индекс по набору
+        (id, название, город, категория, число отзывов, число добавлений в избранное)
+        """
+        suggestions: Dict[Hashable, Suggestion] = {}
+        records: Dict[int, Tuple[str, str, str, int, int]] = {}
+        counts: Dict[Hashable, int] = {}
+        for landmark_id, name, city, category, review_count, favorites in landmarks:
+            records[landmark_id] = (name, city, category, review_count or 0, favorites or 0)
+            suggestions[("landmark", landmark_id)] = Suggestion(
+                "landmark", name, (review_count or 0) + (favorites or 0), landmark_id, city
+            )
+            for ident in (("city", city), ("category", category)):
+                counts[ident] = counts.get(ident, 0) + 1
+        for (kind, text), count in counts.items():
+            suggestions[(kind, text)] = Suggestion(kind, text, count)
+
+        keys = sorted(
+            (key, ident) for ident, suggestion in suggestions.items() for key in self._word_keys(suggestion.text)
+        )
+        with self._lock:
+            self._keys = keys
+            self._suggestions = suggestions
+            self._landmarks = records
+            self._counts = counts
+            self._cache = {}
+            self.is_built = True
+
+    def invalidate(self) -> None:
+        """Пометить индекс устаревшим: он перестроится при следующем запросе подсказок"""
+        with self._lock:
+            self.is_built = False
+            self._cache = {}
+
+    def upsert_landmark(
+        self,
+        landmark_id: int,
+        name: str,
+        city: str,
+        category: str,
+        review_count: int = 0,
+        favorites: Optional[int] = None
+    ) -> None:
+        """
+        Добавить или обновить достопримечательность. favorites=None - сохранить
+        прежнее число добавлений в избранное.
+        """
+        with self._lock:
+            previous = self._landmarks.get(landmark_id)
+            if favorites is None:
+                favorites = previous[4] if previous else 0
+            self._remove_landmark(landmark_id)
+            self._landmarks[landmark_id] = (name, city, category, review_count or 0, favorites)
+            self._add(
+                ("landmark", landmark_id),
+                Suggestion("landmark", name, (review_count or 0) + favorites, landmark_id, city)
+            )
+            self._adjust_count("city", city, 1)
+            self._adjust_count("category", category, 1)
+            self._cache = {}
+
+    def adjust_popularity(self, landmark_id: int, reviews: int = 0, favorites: int = 0) -> None:
+        """Изменить число отзывов и добавлений в избранное достопримечательности"""
+        with self._lock:
+            previous = self._landmarks.get(landmark_id)
+            if previous is None:
+                return
+            name, city, category, review_count, favorite_count = previous
+            review_count = max(0, review_count + reviews)
+            favorite_count = max(0, favorite_count + favorites)
+            self._landmarks[landmark_id] = (name, city, category, review_count, favorite_count)
+            self._suggestions[("landmark", landmark_id)] = Suggestion(
+                "landmark", name, review_count + favorite_count, landmark_id, city
+            )
+            self._cache = {}
+
+    def remove_landmark(self, landmark_id: int) -> None:
+        with self._lock:
+            self._remove_landmark(landmark_id)
+            self._cache = {}
+
+    def _remove_landmark(self, landmark_id: int) -> None:
+        previous = self._landmarks.pop(landmark_id, None)
+        if previous is None:
+            return
+        self._discard(("landmark", landmark_id))
+        self._adjust_count("city", previous[1], -1)
+        self._adjust_count("category", previous[2], -1)
+
+    def suggest(self, prefix: str, limit: int = 10) -> List[Suggestion]:
+        """
+        Самые популярные подсказки, у которых какое-либо слово начинается с prefix
+        (многословный префикс - с последовательных слов)
+        """
+        key = normalize_key(prefix)
+        if not key:
+            return []
+        with self._lock:
+            cached = self._cache.get((key, limit))
+            if cached is not None:
+                return cached
+            start = bisect_left(self._keys, (key,))
+            end = bisect_left(self._keys, (key + _PREFIX_END,))
+            idents = {ident for _, ident in self._keys[start:end]}
+            suggestions = [self._suggestions[ident] for ident in idents]
+            result = heapq.nsmallest(limit, suggestions, key=lambda s: (-s.weight, len(s.text), s.text, s.kind))
+            if len(self._cache) >= self._cache_size:
+                self._cache = {}
+            self._cache[(key, limit)] = result
+            return result
+
+
+# Глобальный индекс подсказок (строится при старте приложения или по первому запросу)
+autocomplete_index = AutocompleteIndex()
@@ -15,19 +15,83 @@ class Settings(BaseSettings):
     POSTGRES_PASSWORD: str = os.getenv("POSTGRES_PASSWORD", "password")
     POSTGRES_DB: str = os.getenv("POSTGRES_DB", "tourist_guide")
     POSTGRES_PORT: str = os.getenv("POSTGRES_PORT", "5432")
-    
+
+    # Полный URL базы данных (например, sqlite:///./benchmark.db для бенчмарков);
+    # если не задан, URL собирается из POSTGRES_*
+    DATABASE_URL_OVERRIDE: str = os.getenv("DATABASE_URL", "")
+
+    # Пул соединений SQLAlchemy
+    DB_POOL_SIZE: int = int(os.getenv("DB_POOL_SIZE", "5"))
+    DB_MAX_OVERFLOW: int = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+    DB_POOL_TIMEOUT: float = float(os.getenv("DB_POOL_TIMEOUT", "30"))  # ожидание свободного соединения, с
+    DB_POOL_RECYCLE: int = int(os.getenv("DB_POOL_RECYCLE", "1800"))  # пересоздание соединений, с (-1 - никогда)
+    DB_POOL_PRE_PING: bool = os.getenv("DB_POOL_PRE_PING", "True").lower() == "true"
+    # Подключение через PgBouncer в режиме transaction: пул на стороне PgBouncer
+    DB_PGBOUNCER_MODE: bool = os.getenv("DB_PGBOUNCER_MODE", "False").lower() == "true"
+    # Драйвер PostgreSQL: psycopg2 или psycopg (psycopg 3)
+    DB_DRIVER: str = os.getenv("DB_DRIVER", "psycopg2")
+
     # JWT настройки
     SECRET_KEY: str = os.getenv("SECRET_KEY", "")
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 60 * 24 * 7  # 7 дней
+    # Класть id и имя пользователя в токен, чтобы не читать пользователя из БД на каждый запрос
+    TOKEN_USER_CLAIMS: bool = os.getenv("TOKEN_USER_CLAIMS", "False").lower() == "true"
+    # Сколько минут доверять данным пользователя из токена (отдельно от срока токена):
+    # изменение или удаление пользователя на другом воркере видно не позже этого срока
+    TOKEN_USER_CLAIMS_TTL_MINUTES: int = int(os.getenv("TOKEN_USER_CLAIMS_TTL_MINUTES", "5"))
+    
+    # Параметры Argon2 (при изменении хэши пересчитываются при следующем входе)
+    ARGON2_TIME_COST: int = int(os.getenv("ARGON2_TIME_COST", "3"))
+    ARGON2_MEMORY_COST: int = int(os.getenv("ARGON2_MEMORY_COST", "65536"))  # КиБ
+    ARGON2_PARALLELISM: int = int(os.getenv("ARGON2_PARALLELISM", "4"))
+    
+    # Пул хэширования паролей: число потоков (0 - по числу ядер), длина очереди, ожидание результата
+    PASSWORD_HASH_WORKERS: int = int(os.getenv("PASSWORD_HASH_WORKERS", "0"))
+    PASSWORD_HASH_QUEUE_LIMIT: int = int(os.getenv("PASSWORD_HASH_QUEUE_LIMIT", "32"))
+    PASSWORD_HASH_TIMEOUT_SECONDS: float = float(os.getenv("PASSWORD_HASH_TIMEOUT_SECONDS", "10"))
     
+    # Кэш текущих пользователей в get_current_user
+    USER_CACHE_ENABLED: bool = os.getenv("USER_CACHE_ENABLED", "True").lower() == "true"
+    USER_CACHE_SIZE: int = int(os.getenv("USER_CACHE_SIZE", "10000"))
+    USER_CACHE_TTL_SECONDS: float = float(os.getenv("USER_CACHE_TTL_SECONDS", "60"))
+    
+    # Пространственный индекс для поиска поблизости
+    SPATIAL_INDEX_ENABLED: bool = os.getenv("SPATIAL_INDEX_ENABLED", "True").lower() == "true"
+    SPATIAL_INDEX_CELL_DEG: float = float(os.getenv("SPATIAL_INDEX_CELL_DEG", "0.05"))
+    # Режим поиска поблизости: index, vector, sql или scan
+    NEARBY_SEARCH_MODE: str = os.getenv("NEARBY_SEARCH_MODE", "index")
+    # Начиная с этого радиуса (км) кандидаты обрабатываются векторизованно через numpy
+    GEO_VECTOR_MIN_RADIUS_KM: float = float(os.getenv("GEO_VECTOR_MIN_RADIUS_KM", "20"))
+    
+    # Полнотекстовый поиск (tsvector + GIN, только PostgreSQL); выключенный - ILIKE по подстроке
+    FULL_TEXT_SEARCH_ENABLED: bool = os.getenv("FULL_TEXT_SEARCH_ENABLED", "True").lower() == "true"
+
+    # Нечеткий поиск: trgm (pg_trgm в PostgreSQL), index (n-граммный индекс в памяти)
+    # или auto (trgm в PostgreSQL, иначе index); минимальное сходство результата
+    FUZZY_SEARCH_MODE: str = os.getenv("FUZZY_SEARCH_MODE", "auto")
+    FUZZY_SIMILARITY_THRESHOLD: float = float(os.getenv("FUZZY_SIMILARITY_THRESHOLD", "0.4"))
+
+    # Дельта-синхронизация: отставание водяного знака от текущего времени (с) - запас
+    # на транзакции, которые закоммитятся позже момента запроса, и срок хранения надгробий
+    SYNC_SAFETY_LAG_SECONDS: float = float(os.getenv("SYNC_SAFETY_LAG_SECONDS", "5"))
+    SYNC_TOMBSTONE_RETENTION_DAYS: int = int(os.getenv("SYNC_TOMBSTONE_RETENTION_DAYS", "90"))
+
     # Debug
     DEBUG: bool = os.getenv("DEBUG", "True").lower() == "true"
     
+    # Инспектор SQL-запросов: заголовки X-DB-* в ответах (по умолчанию в режиме DEBUG),
+    # бюджет запросов на HTTP-запрос и порог повторов одного запроса (признак N+1)
+    QUERY_DEBUG_HEADERS: bool = os.getenv("QUERY_DEBUG_HEADERS", os.getenv("DEBUG", "True")).lower() == "true"
+    QUERY_BUDGET: int = int(os.getenv("QUERY_BUDGET", "20"))
+    QUERY_REPEAT_THRESHOLD: int = int(os.getenv("QUERY_REPEAT_THRESHOLD", "5"))
+    
     # Формируем URL для базы данных
     @property
     def DATABASE_URL(self) -> str:
-        return f"postgresql+psycopg2://{self.POSTGRES_USER}:{self.POSTGRES_PASSWORD}@{self.POSTGRES_SERVER}:{self.POSTGRES_PORT}/{self.POSTGRES_DB}"
+        if self.DATABASE_URL_OVERRIDE:
+            return self.DATABASE_URL_OVERRIDE
+        return f"postgresql+{self.DB_DRIVER}://{self.POSTGRES_USER}:{self.POSTGRES_PASSWORD}@{self.POSTGRES_SERVER}:{self.POSTGRES_PORT}/{self.POSTGRES_DB}"
 
     class Config:
         case_sensitive = True
@@ -1,13 +1,149 @@
-from sqlalchemy import create_engine
+import threading
+import time
+from typing import Any, Dict, List
+
+from sqlalchemy import create_engine, event, exc
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import NullPool, QueuePool
 from app.core.config import settings
+from app.core.metrics import Histogram, MetricFamily
+from app.core.query_inspector import install_query_listeners
+
+# Границы корзин времени ожидания соединения из пула (секунды)
+POOL_WAIT_BUCKETS = (0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 10.0, 30.0)
+
+
+class PoolMetrics:
+    """Счетчики и гистограмма ожидания соединений пула"""
+
+    def __init__(self):
+        self.wait_seconds = Histogram(POOL_WAIT_BUCKETS)
+        self._lock = threading.Lock()
+        self.counters = {"checkouts": 0, "timeouts": 0, "connects": 0, "invalidations": 0}
+
+    def increment(self, name: str) -> None:
+        with self._lock:
+            self.counters[name] += 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            counters = dict(self.counters)
+        return {**counters, "wait_seconds": self.wait_seconds.snapshot()}
+
+
+pool_metrics = PoolMetrics()
+
+
+class InstrumentedQueuePool(QueuePool):
+    """QueuePool, замеряющий время ожидания свободного соединения и таймауты"""
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        except exc.TimeoutError:
+            pool_metrics.increment("timeouts")
+            raise
+        finally:
+            pool_metrics.wait_seconds.observe(time.perf_counter() - start)
+
+
+def _engine_options(database_url: str) -> Dict[str, Any]:
+    """
+    Параметры движка из настроек.
+
+    В режиме PgBouncer (transaction pooling) пулом занимается PgBouncer, поэтому
+    используется NullPool, а серверные подготовленные выражения отключаются для
+    драйверов, которые их создают (psycopg 3). psycopg2 подставляет параметры
+    на стороне клиента и подготовленных выражений не использует.
+    """
+    if "sqlite" in database_url:
+        return {"connect_args": {"check_same_thread": False}}
+
+    if settings.DB_PGBOUNCER_MODE:
+        connect_args: Dict[str, Any] = {}
+        if database_url.startswith("postgresql+psycopg:"):
+            connect_args["prepare_threshold"] = None
+        return {"poolclass": NullPool, "pool_pre_ping": False, "connect_args": connect_args}
+
+    return {
+        "poolclass": InstrumentedQueuePool,
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+    }
+
 
 # Создание движка базы данных
-engine = create_engine(
-    settings.DATABASE_URL,
-    connect_args={"check_same_thread": False} if "sqlite" in settings.DATABASE_URL else {}
-)
+engine = create_engine(settings.DATABASE_URL, **_engine_options(settings.DATABASE_URL))
+
+
+@event.listens_for(engine, "checkout")
+def _on_checkout(dbapi_connection, connection_record, connection_proxy):
+    pool_metrics.increment("checkouts")
+
+
+@event.listens_for(engine, "connect")
+def _on_connect(dbapi_connection, connection_record):
+    pool_metrics.increment("connects")
+
+
+@event.listens_for(engine, "invalidate")
+def _on_invalidate(dbapi_connection, connection_record, exception):
+    pool_metrics.increment("invalidations")
+
+
+# Учет SQL-запросов для метрик и инспектора запросов
+install_query_listeners(engine)
+
+
+def get_pool_stats() -> Dict[str, Any]:
+    """
+    Текущее состояние пула соединений и накопленные метрики
+    """
+    pool = engine.pool
+    stats: Dict[str, Any] = {"pool_class": type(pool).__name__}
+    if isinstance(pool, QueuePool):
+        stats.update({
+            "size": pool.size(),
+            "checked_in": pool.checkedin(),
+            "checked_out": pool.checkedout(),
+            "overflow": max(0, pool.overflow()),  # QueuePool считает от -pool_size
+            "max_overflow": settings.DB_MAX_OVERFLOW,
+            "timeout": settings.DB_POOL_TIMEOUT,
+        })
+    stats.update(pool_metrics.snapshot())
+    return stats
+
+
+def collect_pool_metrics() -> List[MetricFamily]:
+    """
+    Метрики пула соединений для экспорта в Prometheus
+    """
+    stats = get_pool_stats()
+    families = [
+        MetricFamily(f"db_pool_{name}_total", "counter", description, [({}, stats[name])])
+        for name, description in (
+            ("checkouts", "Выдачи соединений из пула"),
+            ("timeouts", "Таймауты ожидания соединения"),
+            ("connects", "Новые соединения с БД"),
+            ("invalidations", "Сброшенные соединения"),
+        )
+    ]
+    families.append(MetricFamily(
+        "db_pool_wait_seconds", "histogram", "Ожидание свободного соединения", [({}, stats["wait_seconds"])]
+    ))
+    for name, description in (
+        ("size", "Размер пула"),
+        ("checked_out", "Занятые соединения"),
+        ("overflow", "Соединения сверх размера пула"),
+    ):
+        if name in stats:
+            families.append(MetricFamily(f"db_pool_{name}", "gauge", description, [({}, stats[name])]))
+    return families
 
 # Создание фабрики сессий
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
@@ -21,4 +157,4 @@ def get_db():
     try:
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
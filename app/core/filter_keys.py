@@ -0,0 +1,23 @@
+import unicodedata
+
+# Режимы фильтров по городу, стране и категории: exact - равенство ключей (индексы),
+# contains - подстрока без учета регистра (ILIKE, полный просмотр)
+FILTER_MATCH_MODES = ("exact", "contains")
+FILTER_MATCH_PATTERN = "^(exact|contains)$"
+
+_BREVE = "\u0306"  # краткая (й = и + U+0306)
+
+
+def filter_key(value: str) -> str:
+    """
+    Ключ точного фильтра: без регистра, диакритики и лишних пробелов
+    ("  São  Paulo" -> "sao paulo", "Ёлки" -> "елки"). Краткая у "й" сохраняется -
+    это отдельная буква, а не ударение.
+    """
+    decomposed = unicodedata.normalize("NFKD", value.casefold())
+    chars = []
+    for char in decomposed:
+        if unicodedata.combining(char) and not (char == _BREVE and chars and chars[-1] == "и"):
+            continue
+        chars.append(char)
+    return " ".join(unicodedata.normalize("NFC", "".join(chars)).split())
@@ -0,0 +1,142 @@
+import html
+import re
+from typing import List, Optional, Sequence, Tuple
+
+from sqlalchemy import func, literal_column
+from sqlalchemy.dialects.postgresql import TSVECTOR
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+
+# Конфигурации PostgreSQL: русская стеммирует кириллицу (латиницу - как английская),
+# английская дает словарные формы английских слов и точные формы остальных
+FULL_TEXT_CONFIGS = ("russian", "english")
+# Больше слов в поисковой строке не учитывается
+MAX_QUERY_WORDS = 8
+# Выделение совпадений во фрагментах (ts_headline и его замена без PostgreSQL).
+# Фрагменты отдаются как HTML: текст экранируется, разметка - только <b>...</b>
+HEADLINE_START = "<b>"
+HEADLINE_STOP = "</b>"
+HEADLINE_MAX_WORDS = 35
+# ts_headline не экранирует текст, поэтому в SQL совпадения отмечаются символами
+# из области частного использования Unicode и заменяются на теги после экранирования
+_HEADLINE_START_MARK = "\ue000"
+_HEADLINE_STOP_MARK = "\ue001"
+HEADLINE_OPTIONS = (
+    f"StartSel={_HEADLINE_START_MARK}, StopSel={_HEADLINE_STOP_MARK}, "
+    f"MaxWords={HEADLINE_MAX_WORDS}, MinWords=15"
+)
+
+_WORD_RE = re.compile(r"[^\W_]+")
+
+
+def search_vector_sql(weighted_columns: Sequence[Tuple[str, str]]) -> str:
+    """
+    SQL-выражение tsvector для генерируемого столбца: каждый столбец во всех
+    конфигурациях со своим весом (A - самый значимый ... D)
+    """
+    parts = [
+        f"setweight(to_tsvector('{config}'::regconfig, coalesce({column}, '')), '{weight}')"
+        for column, weight in weighted_columns
+        for config in FULL_TEXT_CONFIGS
+    ]
+    return " || ".join(parts)
+
+
+def search_vector_ddl(table: str, weighted_columns: Sequence[Tuple[str, str]], index_name: str) -> List[str]:
+    """
+    DDL генерируемого столбца search_vector и GIN-индекса по нему (PostgreSQL 12+).
+    Столбец пересчитывается самой СУБД при любой записи, включая COPY и upsert.
+    """
+    return [
+        f"ALTER TABLE {table} ADD COLUMN IF NOT EXISTS search_vector tsvector "
+        f"GENERATED ALWAYS AS ({search_vector_sql(weighted_columns)}) STORED",
+        f"CREATE INDEX IF NOT EXISTS {index_name} ON {table} USING GIN (search_vector)",
+    ]
+
+
+def prefix_tsquery(text: str) -> Optional[str]:
+    """
+    Текст запроса to_tsquery из пользовательской строки: слова через И,
+    каждое как префикс (поиск по мере набора).
+    Спецсимволы синтаксиса tsquery отбрасываются. None - слов нет.
+    """
+    words = _WORD_RE.findall(text.lower())[:MAX_QUERY_WORDS]
+    if not words:
+        return None
+    return " & ".join(f"{word}:*" for word in words)
+
+
+def full_text_enabled(db: Session) -> bool:
+    """Полнотекстовый поиск доступен только в PostgreSQL"""
+    return settings.FULL_TEXT_SEARCH_ENABLED and db.get_bind().dialect.name == "postgresql"
+
+
+def search_vector(table: str):
+    """Столбец search_vector таблицы (в моделях не отображается, чтобы не читать его в SELECT)"""
+    return literal_column(f"{table}.search_vector", type_=TSVECTOR)
+
+
+def _regconfig(config: str):
+    # Конфигурация - литерал regconfig: строковый параметр не приводится к нему неявно
+    return literal_column(f"'{config}'::regconfig")
+
+
+def full_text_query(tsquery_text: str):
+    """Запрос tsquery во всех конфигурациях, объединенных через ИЛИ"""
+    queries = [func.to_tsquery(_regconfig(config), tsquery_text) for config in FULL_TEXT_CONFIGS]
+    tsquery = queries[0]
+    for query in queries[1:]:
+        tsquery = tsquery.op("||")(query)
+    return tsquery
+
+
+def full_text_match(vector, tsquery_text: str):
+    """
+    Условие совпадения (использует GIN-индекс) и выражение релевантности ts_rank
+    для запроса во всех конфигурациях
+    """
+    tsquery = full_text_query(tsquery_text)
+    return vector.op("@@")(tsquery), func.ts_rank(vector, tsquery)
+
+
+def headline(text, tsquery_text: str, options: str = HEADLINE_OPTIONS):
+    """
+    Фрагмент текста с отмеченными совпадениями (ts_headline). Дорогая функция -
+    вычисляется только для записей текущей страницы. Результат перед отдачей
+    клиенту проходит через headline_html.
+    """
+    return func.ts_headline(_regconfig(FULL_TEXT_CONFIGS[0]), text, full_text_query(tsquery_text), options)
+
+
+def headline_html(fragment: Optional[str]) -> Optional[str]:
+    """Фрагмент ts_headline в безопасный HTML: текст экранируется, отметки - в <b>...</b>"""
+    if fragment is None:
+        return None
+    return (
+        html.escape(fragment)
+        .replace(_HEADLINE_START_MARK, HEADLINE_START)
+        .replace(_HEADLINE_STOP_MARK, HEADLINE_STOP)
+    )
+
+
+def plain_headline(text: str, search: str, max_words: int = HEADLINE_MAX_WORDS) -> str:
+    """
+    Замена ts_headline без PostgreSQL: окно из max_words слов вокруг первого
+    совпадения, слова текста, содержащие слова запроса, выделяются.
+    Возвращает безопасный HTML (как headline_html).
+    """
+    query_words = _WORD_RE.findall(search.lower())[:MAX_QUERY_WORDS]
+    tokens = text.split()
+
+    def matches(token: str) -> bool:
+        lowered = token.lower()
+        return any(word in lowered for word in query_words)
+
+    first = next((i for i, token in enumerate(tokens) if matches(token)), 0)
+    start = max(0, min(first - max_words // 3, len(tokens) - max_words))
+    fragment = [
+        f"{HEADLINE_START}{html.escape(token)}{HEADLINE_STOP}" if matches(token) else html.escape(token)
+        for token in tokens[start:start + max_words]
+    ]
+    return " ".join(fragment)
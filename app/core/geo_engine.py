@@ -0,0 +1,233 @@
+import threading
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+from app.core.spatial_index import EARTH_RADIUS_KM, bounding_box
+
+try:
+    import numpy as np
+    HAS_NUMPY = True
+except ImportError:
+    np = None
+    HAS_NUMPY = False
+
+# Максимальное число элементов матрицы расстояний в одном пакете batch-запроса
+BATCH_MATRIX_LIMIT = 4_000_000
+
+
+def haversine_km_vectorized(latitude, longitude, lat_rad, lon_rad, cos_lat):
+    """
+    Векторизованный гаверсинус: расстояния (км) от точки/точек до массивов координат.
+    Координаты массивов передаются в радианах вместе с предвычисленным cos(широты).
+    Для пакета точек latitude/longitude - столбцы формы (M, 1).
+    """
+    origin_lat = np.radians(latitude)
+    origin_lon = np.radians(longitude)
+    sin_d_lat = np.sin((lat_rad - origin_lat) * 0.5)
+    sin_d_lon = np.sin((lon_rad - origin_lon) * 0.5)
+    a = sin_d_lat * sin_d_lat + np.cos(origin_lat) * cos_lat * sin_d_lon * sin_d_lon
+    np.clip(a, 0.0, 1.0, out=a)
+    return 2.0 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(a))
+
+
+def _top_k(ids, distances, limit: Optional[int]) -> List[Tuple[int, float]]:
+    """
+    Отобрать limit ближайших через argpartition и отсортировать только их
+    """
+    if limit is not None and len(distances) > limit:
+        part = np.argpartition(distances, limit - 1)[:limit]
+        ids = ids[part]
+        distances = distances[part]
+    order = np.argsort(distances, kind="stable")
+    return list(zip(ids[order].tolist(), distances[order].tolist()))
+
+
+class CoordinateStore:
+    """
+    Колоночное хранилище координат: непрерывные массивы float64 (id, широта, долгота)
+    для векторизованного расчета расстояний. Удаление - перестановкой последнего
+    элемента на место удаленного, поэтому массивы всегда плотные.
+    """
+
+    def __init__(self, initial_capacity: int = 1024):
+        if not HAS_NUMPY:
+            raise RuntimeError("Для CoordinateStore требуется numpy")
+        self._lock = threading.RLock()
+        self._positions: Dict[int, int] = {}
+        self._size = 0
+        self._allocate(max(1, initial_capacity))
+        self.is_built = False
+
+    def _allocate(self, capacity: int) -> None:
+        self._ids = np.empty(capacity, dtype=np.int64)
+        self._lat = np.empty(capacity, dtype=np.float64)
+        self._lon = np.empty(capacity, dtype=np.float64)
+        self._lat_rad = np.empty(capacity, dtype=np.float64)
+        self._lon_rad = np.empty(capacity, dtype=np.float64)
+        self._cos_lat = np.empty(capacity, dtype=np.float64)
+
+    def _grow(self) -> None:
+        size = self._size
+        old = (self._ids, self._lat, self._lon, self._lat_rad, self._lon_rad, self._cos_lat)
+        self._allocate(len(self._ids) * 2)
+        new = (self._ids, self._lat, self._lon, self._lat_rad, self._lon_rad, self._cos_lat)
+        for old_array, new_array in zip(old, new):
+            new_array[:size] = old_array[:size]
+
+    def __len__(self) -> int:
+        return self._size
+
+    def build(self, points: Iterable[Tuple[int, float, float]]) -> None:
+        """
+        Полностью перестроить хранилище по набору (id, широта, долгота)
+        """
+        rows = list(points)
+        with self._lock:
+            self._allocate(max(1024, len(rows)))
+            self._positions = {}
+            self._size = 0
+            if rows:
+                data = np.asarray(rows, dtype=np.float64)
+                # Дубликаты id: оставляем последнюю запись
+                ids = data[:, 0].astype(np.int64)
+                _, last = np.unique(ids[::-1], return_index=True)
+                keep = np.sort(len(ids) - 1 - last)
+                data, ids = data[keep], ids[keep]
+
+                size = len(ids)
+                self._ids[:size] = ids
+                self._lat[:size] = data[:, 1]
+                self._lon[:size] = data[:, 2]
+                self._size = size
+                self._refresh_derived(0, size)
+                self._positions = {point_id: pos for pos, point_id in enumerate(ids.tolist())}
+            self.is_built = True
+
+    def _refresh_derived(self, start: int, stop: int) -> None:
+        np.radians(self._lat[start:stop], out=self._lat_rad[start:stop])
+        np.radians(self._lon[start:stop], out=self._lon_rad[start:stop])
+        np.cos(self._lat_rad[start:stop], out=self._cos_lat[start:stop])
+
+    def upsert(self, point_id: int, latitude: float, longitude: float) -> None:
+        """
+        Добавить точку или обновить ее координаты
+        """
+        with self._lock:
+            pos = self._positions.get(point_id)
+            if pos is None:
+                if self._size == len(self._ids):
+                    self._grow()
+                pos = self._size
+                self._size += 1
+                self._positions[point_id] = pos
+                self._ids[pos] = point_id
+            self._lat[pos] = latitude
+            self._lon[pos] = longitude
+            self._refresh_derived(pos, pos + 1)
+
+    def remove(self, point_id: int) -> bool:
+        """
+        Удалить точку
+        """
+        with self._lock:
+            pos = self._positions.pop(point_id, None)
+            if pos is None:
+                return False
+            last = self._size - 1
+            if pos != last:
+                for array in (self._ids, self._lat, self._lon, self._lat_rad, self._lon_rad, self._cos_lat):
+                    array[pos] = array[last]
+                self._positions[int(self._ids[pos])] = pos
+            self._size = last
+            return True
+
+    def _columns(self):
+        """
+        Представления заполненной части массивов (без копирования).
+        Использовать только под блокировкой.
+        """
+        size = self._size
+        return (
+            self._ids[:size],
+            self._lat[:size],
+            self._lon[:size],
+            self._lat_rad[:size],
+            self._lon_rad[:size],
+            self._cos_lat[:size],
+        )
+
+    def query_radius(
+        self,
+        latitude: float,
+        longitude: float,
+        radius_km: float,
+        limit: Optional[int] = None
+    ) -> List[Tuple[int, float]]:
+        """
+        Точки в радиусе radius_km, отсортированные по расстоянию: список (id, км)
+        """
+        min_lat, max_lat, min_lon, max_lon = bounding_box(latitude, longitude, radius_km)
+        with self._lock:
+            ids, lat, lon, lat_rad, lon_rad, cos_lat = self._columns()
+            if len(ids) == 0:
+                return []
+
+            # Дешевый отбор по ограничивающему прямоугольнику перед тригонометрией
+            mask = (lat >= min_lat) & (lat <= max_lat)
+            if min_lon is not None and max_lon is not None:
+                if min_lon <= max_lon:
+                    mask &= (lon >= min_lon) & (lon <= max_lon)
+                else:
+                    mask &= (lon >= min_lon) | (lon <= max_lon)
+            candidates = np.flatnonzero(mask)
+
+            distances = haversine_km_vectorized(
+                latitude, longitude, lat_rad[candidates], lon_rad[candidates], cos_lat[candidates]
+            )
+            inside = distances <= radius_km
+            return _top_k(ids[candidates][inside], distances[inside], limit)
+
+    def query_nearest(self, latitude: float, longitude: float, k: int) -> List[Tuple[int, float]]:
+        """
+        k ближайших точек: список (id, км)
+        """
+        if k <= 0:
+            return []
+        with self._lock:
+            ids, _, _, lat_rad, lon_rad, cos_lat = self._columns()
+            if len(ids) == 0:
+                return []
+            distances = haversine_km_vectorized(latitude, longitude, lat_rad, lon_rad, cos_lat)
+            return _top_k(ids, distances, k)
+
+    def query_radius_batch(
+        self,
+        origins: Sequence[Tuple[float, float]],
+        radius_km: float,
+        limit: Optional[int] = None
+    ) -> List[List[Tuple[int, float]]]:
+        """
+        Пакетный поиск в радиусе для многих исходных точек за один вызов.
+        Матрица расстояний считается блоками, чтобы ограничить расход памяти.
+        """
+        if not origins:
+            return []
+        points = np.asarray(origins, dtype=np.float64).reshape(-1, 2)
+        results: List[List[Tuple[int, float]]] = []
+        with self._lock:
+            ids, _, _, lat_rad, lon_rad, cos_lat = self._columns()
+            if len(ids) == 0:
+                return [[] for _ in origins]
+
+            chunk = max(1, BATCH_MATRIX_LIMIT // len(ids))
+            for start in range(0, len(points), chunk):
+                block = points[start:start + chunk]
+                matrix = haversine_km_vectorized(
+                    block[:, 0:1], block[:, 1:2], lat_rad, lon_rad, cos_lat
+                )
+                for row in matrix:
+                    inside = np.flatnonzero(row <= radius_km)
+                    results.append(_top_k(ids[inside], row[inside], limit))
+        return results
+
+
+# Глобальное хранилище координат достопримечательностей (None, если numpy не установлен)
+landmark_coordinates = CoordinateStore() if HAS_NUMPY else None
@@ -0,0 +1,310 @@
+import bisect
+import threading
+import time
+from collections import defaultdict
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterable, List, NamedTuple, Optional, Sequence, Tuple
+
+# Границы корзин по умолчанию (секунды): от 1 мс до 10 с
+DEFAULT_LATENCY_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+# Размеры тел запросов и ответов (байты)
+SIZE_BUCKETS = (100, 1000, 10000, 100000, 1000000, 10000000)
+# Количество SQL-запросов на один HTTP-запрос
+QUERY_COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+class Histogram:
+    """
+    Гистограмма с фиксированными границами корзин
+    (в стиле Prometheus: корзина le=x считает наблюдения <= x).
+
+    thread_safe=False отключает блокировку - для метрик, которые обновляются
+    только из потока event loop (ASGI middleware).
+    """
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_LATENCY_BUCKETS, thread_safe: bool = True):
+        self.buckets = tuple(sorted(buckets))
+        self._counts = [0] * (len(self.buckets) + 1)  # последняя корзина - +Inf
+        self._sum = 0.0
+        self._count = 0
+        self._lock = threading.Lock() if thread_safe else None
+
+    def observe(self, value: float) -> None:
+        index = bisect.bisect_left(self.buckets, value)
+        if self._lock is None:
+            self._counts[index] += 1
+            self._sum += value
+            self._count += 1
+            return
+        with self._lock:
+            self._counts[index] += 1
+            self._sum += value
+            self._count += 1
+
+    def snapshot(self) -> Dict:
+        """
+        Накопительные значения корзин, сумма и количество наблюдений
+        """
+        if self._lock is None:
+            counts, total_sum, count = list(self._counts), self._sum, self._count
+        else:
+            with self._lock:
+                counts, total_sum, count = list(self._counts), self._sum, self._count
+        cumulative: List[int] = []
+        running = 0
+        for value in counts:
+            running += value
+            cumulative.append(running)
+        bounds = [str(bound) for bound in self.buckets] + ["+Inf"]
+        return {
+            "buckets": dict(zip(bounds, cumulative)),
+            "sum": total_sum,
+            "count": count
+        }
+
+    def reset(self) -> None:
+        self._counts = [0] * (len(self.buckets) + 1)
+        self._sum = 0.0
+        self._count = 0
+
+
+class MetricFamily(NamedTuple):
+    """
+    Набор значений одной метрики для экспорта.
+    samples - пары (метки, значение); для гистограмм значение - snapshot()
+    """
+    name: str
+    kind: str  # counter, gauge или histogram
+    help: str
+    samples: List[Tuple[Dict[str, str], Any]]
+
+
+@dataclass
+class RequestDbStats:
+    """
+    SQL-запросы, выполненные в рамках одного HTTP-запроса.
+    При track_statements=True запоминается и число выполнений каждого текста запроса
+    """
+    queries: int = 0
+    seconds: float = 0.0
+    track_statements: bool = False
+    statements: Dict[str, int] = field(default_factory=dict)
+
+
+# Статистика текущего запроса. Объект изменяемый: контекст копируется в потоки
+# threadpool, поэтому синхронные обработчики пишут в тот же объект.
+current_db_stats: ContextVar[Optional[RequestDbStats]] = ContextVar("current_db_stats", default=None)
+
+
+def record_query(seconds: float, statement: Optional[str] = None) -> None:
+    """Учесть выполненный SQL-запрос в статистике текущего HTTP-запроса"""
+    stats = current_db_stats.get()
+    if stats is None:
+        return
+    stats.queries += 1
+    stats.seconds += seconds
+    if stats.track_statements and statement is not None:
+        stats.statements[statement] = stats.statements.get(statement, 0) + 1
+
+
+class MetricsRegistry:
+    """
+    Метрики HTTP-запросов.
+
+    Обновляется только из ASGI middleware, то есть из потока event loop,
+    поэтому счетчики и гистограммы обходятся без блокировок. Метрики других
+    подсистем (пул соединений, кэши) подключаются через register_collector
+    и читаются только при экспорте.
+    """
+
+    def __init__(self):
+        self.started_at = time.time()
+        self.in_flight = 0
+        self.responses: Dict[Tuple[str, str, str], int] = defaultdict(int)
+        self._route_metrics: Dict[Tuple[str, str], Tuple[Histogram, ...]] = {}
+        self._collectors: List[Callable[[], Iterable[MetricFamily]]] = []
+
+    def _histograms(self, key: Tuple[str, str]) -> Tuple[Histogram, ...]:
+        histograms = self._route_metrics.get(key)
+        if histograms is None:
+            histograms = (
+                Histogram(DEFAULT_LATENCY_BUCKETS, thread_safe=False),  # длительность
+                Histogram(SIZE_BUCKETS, thread_safe=False),  # размер запроса
+                Histogram(SIZE_BUCKETS, thread_safe=False),  # размер ответа
+                Histogram(QUERY_COUNT_BUCKETS, thread_safe=False),  # SQL-запросы
+                Histogram(DEFAULT_LATENCY_BUCKETS, thread_safe=False),  # время в БД
+            )
+            self._route_metrics[key] = histograms
+        return histograms
+
+    def observe_request(
+        self,
+        method: str,
+        route: str,
+        status: int,
+        seconds: float,
+        request_bytes: int,
+        response_bytes: int,
+        db_stats: Optional[RequestDbStats] = None
+    ) -> None:
+        latency, request_size, response_size, db_queries, db_seconds = self._histograms((method, route))
+        latency.observe(seconds)
+        request_size.observe(request_bytes)
+        response_size.observe(response_bytes)
+        if db_stats is not None:
+            db_queries.observe(db_stats.queries)
+            db_seconds.observe(db_stats.seconds)
+        self.responses[(method, route, str(status))] += 1
+
+    def register_collector(self, collector: Callable[[], Iterable[MetricFamily]]) -> None:
+        self._collectors.append(collector)
+
+    def collect(self) -> List[MetricFamily]:
+        route_items = list(self._route_metrics.items())
+        families = [
+            MetricFamily("process_uptime_seconds", "gauge", "Время работы процесса",
+                         [({}, time.time() - self.started_at)]),
+            MetricFamily("http_requests_in_flight", "gauge", "Запросы в обработке",
+                         [({}, self.in_flight)]),
+            MetricFamily("http_responses_total", "counter", "Ответы по маршрутам и статусам", [
+                ({"method": method, "route": route, "status": status}, value)
+                for (method, route, status), value in list(self.responses.items())
+            ]),
+        ]
+        histogram_names = (
+            ("http_request_duration_seconds", "Длительность обработки запроса"),
+            ("http_request_size_bytes", "Размер тела запроса"),
+            ("http_response_size_bytes", "Размер тела ответа"),
+            ("http_request_db_queries", "SQL-запросов на HTTP-запрос"),
+            ("http_request_db_seconds", "Время выполнения SQL на HTTP-запрос"),
+        )
+        for index, (name, help_text) in enumerate(histogram_names):
+            families.append(MetricFamily(name, "histogram", help_text, [
+                ({"method": method, "route": route}, histograms[index].snapshot())
+                for (method, route), histograms in route_items
+            ]))
+        for collector in self._collectors:
+            families.extend(collector())
+        return families
+
+    def render(self) -> str:
+        return render_prometheus(self.collect())
+
+    def reset(self) -> None:
+        self.responses.clear()
+        self._route_metrics.clear()
+
+
+def _escape_label(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(labels: Dict[str, str]) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{key}="{_escape_label(value)}"' for key, value in labels.items()) + "}"
+
+
+def render_prometheus(families: Iterable[MetricFamily]) -> str:
+    """
+    Текстовый формат экспозиции Prometheus (version 0.0.4)
+    """
+    lines: List[str] = []
+    for family in families:
+        lines.append(f"# HELP {family.name} {family.help}")
+        lines.append(f"# TYPE {family.name} {family.kind}")
+        for labels, value in family.samples:
+            if family.kind == "histogram":
+                for bound, count in value["buckets"].items():
+                    lines.append(f"{family.name}_bucket{_format_labels({**labels, 'le': bound})} {count}")
+                lines.append(f"{family.name}_sum{_format_labels(labels)} {value['sum']}")
+                lines.append(f"{family.name}_count{_format_labels(labels)} {value['count']}")
+            else:
+                lines.append(f"{family.name}{_format_labels(labels)} {value}")
+    return "\n".join(lines) + "\n"
+
+
+def cache_collector(name: str, cache) -> Callable[[], List[MetricFamily]]:
+    """
+    Экспорт попаданий и промахов кэша с атрибутами hits и misses
+    """
+    def collect() -> List[MetricFamily]:
+        hits, misses = cache.hits, cache.misses
+        total = hits + misses
+        labels = {"cache": name}
+        return [
+            MetricFamily("cache_hits_total", "counter", "Попадания в кэш", [(labels, hits)]),
+            MetricFamily("cache_misses_total", "counter", "Промахи кэша", [(labels, misses)]),
+            MetricFamily("cache_hit_ratio", "gauge", "Доля попаданий в кэш",
+                         [(labels, hits / total if total else 0.0)]),
+        ]
+    return collect
+
+
+def _route_label(scope: Dict) -> str:
+    # Шаблон пути маршрута (/api/landmarks/{landmark_id}), а не сам путь:
+    # иначе число рядов метрик растет с каждым id
+    route = scope.get("route")
+    return getattr(route, "path", None) or "unmatched"
+
+
+def _content_length(scope: Dict) -> int:
+    for key, value in scope.get("headers", ()):
+        if key == b"content-length":
+            try:
+                return int(value)
+            except ValueError:
+                return 0
+    return 0
+
+
+class MetricsMiddleware:
+    """
+    ASGI middleware: длительность, размеры, статусы, запросы в обработке
+    и SQL-запросы для каждого маршрута
+    """
+
+    def __init__(self, app, registry: Optional[MetricsRegistry] = None):
+        self.app = app
+        self.registry = registry or metrics_registry
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        registry = self.registry
+        status = 500
+        response_bytes = 0
+
+        async def send_wrapper(message):
+            nonlocal status, response_bytes
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            elif message["type"] == "http.response.body":
+                response_bytes += len(message.get("body", b""))
+            await send(message)
+
+        # Middleware подключается последним (внешним), поэтому статистику запроса заводит он,
+        # а вложенный инспектор запросов дописывает в нее же
+        db_stats = RequestDbStats()
+        token = current_db_stats.set(db_stats)
+        registry.in_flight += 1
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - start
+            registry.in_flight -= 1
+            current_db_stats.reset(token)
+            registry.observe_request(
+                scope["method"], _route_label(scope), status, elapsed,
+                _content_length(scope), response_bytes, db_stats
+            )
+
+
+# Глобальный реестр метрик (на процесс)
+metrics_registry = MetricsRegistry()
@@ -0,0 +1,146 @@
+import re
+import threading
+from collections import Counter
+from typing import Dict, Hashable, Iterable, List, Sequence, Set, Tuple
+
+_WORD_RE = re.compile(r"[^\W_]+")
+
+
+def split_words(text: str) -> List[str]:
+    """Слова строки в нижнем регистре (как их выделяет pg_trgm)"""
+    return _WORD_RE.findall(text.lower())
+
+
+def word_trigrams(word: str) -> Set[str]:
+    """Триграммы слова с дополнением двумя пробелами в начале и одним в конце"""
+    padded = f"  {word} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def trigrams(text: str) -> Set[str]:
+    grams: Set[str] = set()
+    for word in split_words(text):
+        grams |= word_trigrams(word)
+    return grams
+
+
+def similarity(a: str, b: str) -> float:
+    """Сходство строк: доля общих триграмм (аналог similarity из pg_trgm)"""
+    grams_a, grams_b = trigrams(a), trigrams(b)
+    if not grams_a or not grams_b:
+        return 0.0
+    common = len(grams_a & grams_b)
+    return common / (len(grams_a) + len(grams_b) - common)
+
+
+def word_similarity(query: str, text: str) -> float:
+    """
+    Сходство запроса с лучшим фрагментом текста из стольких же слов:
+    доля триграмм запроса, найденных во фрагменте (приближение word_similarity
+    из pg_trgm - запрос "Эрмитаж" похож на "Государственный Эрмитаж")
+    """
+    query_grams = trigrams(query)
+    text_words = split_words(text)
+    if not query_grams or not text_words:
+        return 0.0
+    span = max(1, min(len(split_words(query)), len(text_words)))
+    best = 0
+    for start in range(len(text_words) - span + 1):
+        grams: Set[str] = set()
+        for word in text_words[start:start + span]:
+            grams |= word_trigrams(word)
+        best = max(best, len(query_grams & grams))
+    return best / len(query_grams)
+
+
+class TrigramIndex:
+    """
+    Инвертированный индекс триграмм в памяти процесса: триграмма -> ключи записей.
+    Используется для нечеткого поиска, когда pg_trgm недоступен (SQLite).
+    У записи может быть несколько текстов (например, название и город) -
+    сходство считается по лучшему из них.
+    """
+
+    def __init__(self):
+        self._postings: Dict[str, Set[Hashable]] = {}
+        self._texts: Dict[Hashable, Tuple[str, ...]] = {}
+        self._lock = threading.RLock()
+        self.is_built = False
+
+    def __len__(self) -> int:
+        return len(self._texts)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._texts
+
+    def build(self, entries: Iterable[Tuple[Hashable, Sequence[str]]]) -> None:
+        """
+        Полностью перестроить индекс по набору (ключ, тексты)
+        """
+        postings: Dict[str, Set[Hashable]] = {}
+        texts: Dict[Hashable, Tuple[str, ...]] = {}
+        for key, entry_texts in entries:
+            texts[key] = tuple(text for text in entry_texts if text)
+            for gram in set().union(*(trigrams(text) for text in texts[key])):
+                postings.setdefault(gram, set()).add(key)
+
+        with self._lock:
+            self._postings = postings
+            self._texts = texts
+            self.is_built = True
+
+    def upsert(self, key: Hashable, entry_texts: Sequence[str]) -> None:
+        """
+        Добавить запись или заменить ее тексты
+        """
+        with self._lock:
+            self._discard(key)
+            self._texts[key] = tuple(text for text in entry_texts if text)
+            for gram in set().union(*(trigrams(text) for text in self._texts[key])):
+                self._postings.setdefault(gram, set()).add(key)
+
+    def remove(self, key: Hashable) -> bool:
+        with self._lock:
+            return self._discard(key)
+
+    def _discard(self, key: Hashable) -> bool:
+        entry_texts = self._texts.pop(key, None)
+        if entry_texts is None:
+            return False
+        for gram in set().union(*(trigrams(text) for text in entry_texts)):
+            keys = self._postings.get(gram)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._postings[gram]
+        return True
+
+    def search(self, query: str, limit: int, threshold: float) -> List[Tuple[Hashable, float]]:
+        """
+        Записи, похожие на запрос не меньше threshold, по убыванию сходства.
+        Возвращает список (ключ, сходство).
+        """
+        query_grams = trigrams(query)
+        if not query_grams:
+            return []
+
+        counts: Counter = Counter()
+        with self._lock:
+            for gram in query_grams:
+                counts.update(self._postings.get(gram, ()))
+            # Сходство не больше доли общих триграмм - остальные кандидаты отбрасываются сразу
+            min_common = threshold * len(query_grams)
+            candidates = [(key, self._texts[key]) for key, common in counts.items() if common >= min_common]
+
+        scored = []
+        for key, entry_texts in candidates:
+            score = max(word_similarity(query, text) for text in entry_texts)
+            if score >= threshold:
+                scored.append((key, score))
+        scored.sort(key=lambda item: (-item[1], item[0]))
+        return scored[:limit]
+
+
+# Глобальные индексы для нечеткого поиска без pg_trgm (строятся при старте или по первому запросу)
+landmark_name_index = TrigramIndex()
+city_name_index = TrigramIndex()
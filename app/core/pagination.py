@@ -0,0 +1,175 @@
+import base64
+import json
+from datetime import date, datetime
+from typing import Any, List, Optional, Sequence, Tuple
+
+from sqlalchemy import and_, func, or_, text
+from sqlalchemy.orm import Query
+
+# Режимы подсчета общего количества записей для списков
+TOTAL_MODES = ("exact", "estimate", "none")
+TOTAL_MODE_PATTERN = "^(exact|estimate|none)$"
+
+
+class InvalidCursorError(ValueError):
+    """Курсор не удалось разобрать или он не подходит к сортировке"""
+
+
+def _encode_value(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return {"dt": value.isoformat()}
+    if isinstance(value, date):
+        return {"d": value.isoformat()}
+    return value
+
+
+def _decode_value(value: Any) -> Any:
+    if isinstance(value, dict):
+        if "dt" in value:
+            return datetime.fromisoformat(value["dt"])
+        if "d" in value:
+            return date.fromisoformat(value["d"])
+    return value
+
+
+def encode_cursor(values: Sequence[Any]) -> str:
+    """
+    Закодировать значения ключей сортировки последней записи в непрозрачный курсор
+    """
+    payload = json.dumps([_encode_value(v) for v in values], separators=(",", ":"), ensure_ascii=False)
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str, size: int) -> List[Any]:
+    """
+    Раскодировать курсор обратно в значения ключей сортировки
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")).decode("utf-8"))
+    except (ValueError, UnicodeError) as e:
+        raise InvalidCursorError("Некорректный курсор") from e
+    if not isinstance(values, list) or len(values) != size:
+        raise InvalidCursorError("Курсор не соответствует сортировке")
+    return [_decode_value(v) for v in values]
+
+
+def _after_cursor(sort_keys: Sequence[Tuple[Any, bool]], values: Sequence[Any]):
+    """
+    Условие "строго после курсора" для составного ключа сортировки:
+    (a > x) OR (a = x AND b > y) OR ... с учетом направления каждого столбца
+    """
+    clauses = []
+    for i, (column, descending) in enumerate(sort_keys):
+        equal_prefix = [sort_keys[j][0] == values[j] for j in range(i)]
+        step = column < values[i] if descending else column > values[i]
+        clauses.append(and_(*equal_prefix, step))
+    return or_(*clauses)
+
+
+def paginate_keyset(
+    query: Query,
+    sort_keys: Sequence[Tuple[Any, bool]],
+    cursor: Optional[str],
+    limit: int
+) -> Tuple[List[Any], Optional[str]]:
+    """
+    Keyset-пагинация: вместо OFFSET фильтр по значениям ключей последней записи.
+
+    sort_keys - список (столбец, по убыванию). Последний столбец должен быть
+    уникальным (обычно id), чтобы порядок был стабильным.
+    Пустой курсор означает первую страницу. Возвращает (записи, следующий курсор);
+    следующий курсор равен None, если записей больше нет.
+    """
+    if cursor:
+        values = decode_cursor(cursor, len(sort_keys))
+        query = query.filter(_after_cursor(sort_keys, values))
+
+    query = query.order_by(*[column.desc() if descending else column.asc() for column, descending in sort_keys])
+    rows = query.limit(limit + 1).all()
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        next_cursor = encode_cursor([getattr(last, column.key) for column, _ in sort_keys])
+    return rows, next_cursor
+
+
+def estimate_count(query: Query) -> int:
+    """
+    Приблизительное количество строк по статистике планировщика PostgreSQL.
+
+    Для запроса без фильтров берется pg_class.reltuples, иначе оценка
+    строк из EXPLAIN. На других СУБД выполняется точный COUNT.
+    """
+    session = query.session
+    bind = session.get_bind()
+    if bind.dialect.name != "postgresql":
+        return query.order_by(None).count()
+
+    if query.whereclause is None:
+        table = query.column_descriptions[0]["entity"].__table__.name
+        reltuples = session.execute(
+            text("SELECT reltuples::bigint FROM pg_class WHERE relname = :table"),
+            {"table": table}
+        ).scalar()
+        # -1 означает, что таблица еще не анализировалась
+        if reltuples is not None and reltuples >= 0:
+            return int(reltuples)
+
+    compiled = query.order_by(None).statement.compile(
+        dialect=bind.dialect, compile_kwargs={"render_postcompile": True}
+    )
+    plan = session.connection().exec_driver_sql(
+        "EXPLAIN (FORMAT JSON) " + str(compiled), compiled.params
+    ).scalar()
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]["Plan"]["Plan Rows"])
+
+
+def count_total(query: Query, total_mode: str = "exact") -> Optional[int]:
+    """
+    Общее количество записей в выбранном режиме: exact, estimate или none
+    """
+    if total_mode == "none":
+        return None
+    if total_mode == "estimate":
+        return estimate_count(query)
+    return query.order_by(None).count()
+
+
+def fetch_page(
+    query: Query,
+    skip: int,
+    limit: int,
+    total_mode: str = "exact"
+) -> Tuple[List[Any], Optional[int]]:
+    """
+    Получить страницу OFFSET/LIMIT и общее количество записей.
+
+    exact - точное количество вычисляется оконной функцией count(*) OVER ()
+    в том же запросе, без отдельного COUNT; estimate - оценка планировщика;
+    none - количество не считается (total = None).
+    """
+    if total_mode != "exact":
+        total = count_total(query, total_mode)
+        return query.offset(skip).limit(limit).all(), total
+
+    rows = query.add_columns(func.count().over().label("total_count")).offset(skip).limit(limit).all()
+    if rows:
+        return [row[0] for row in rows], rows[0].total_count
+
+    # Пустая страница: за пределами выборки нужен отдельный COUNT
+    total = query.order_by(None).count() if skip > 0 else 0
+    return [], total
+
+
+def count_pages(total: Optional[int], limit: int) -> Optional[int]:
+    """
+    Количество страниц (None, если общее количество не считалось)
+    """
+    if total is None:
+        return None
+    return (total + limit - 1) // limit if limit > 0 else 0
@@ -0,0 +1,96 @@
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from typing import Any, Callable, Optional, Tuple
+from app.core.config import settings
+from app.core.security import pwd_context
+
+
+class HashingOverloadedError(RuntimeError):
+    """Очередь хэширования паролей переполнена или результат не дождались"""
+
+
+class PasswordHashingService:
+    """
+    Ограниченный пул для Argon2.
+
+    Argon2 (argon2-cffi) отпускает GIL во время вычисления, поэтому пул потоков
+    загружает ядра параллельно. Число одновременно вычисляемых хэшей ограничено
+    размером пула, а число ожидающих - queue_limit. Если очередь заполнена,
+    задача сразу отклоняется (HashingOverloadedError), и остальные запросы
+    не голодают из-за занятых CPU-потоков.
+    """
+
+    def __init__(self, workers: int = 0, queue_limit: int = 32, timeout_seconds: float = 10.0):
+        self.workers = workers or os.cpu_count() or 1
+        self.queue_limit = queue_limit
+        self.timeout_seconds = timeout_seconds
+        self._slots = threading.BoundedSemaphore(self.workers + queue_limit)
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+        self._pending = 0
+        self.rejected = 0
+
+    @property
+    def pending(self) -> int:
+        """Задачи в работе и в очереди"""
+        return self._pending
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="argon2")
+            return self._executor
+
+    def _release(self, _future=None) -> None:
+        with self._lock:
+            self._pending -= 1
+        self._slots.release()
+
+    def _run(self, fn: Callable, *args) -> Any:
+        if not self._slots.acquire(blocking=False):
+            with self._lock:
+                self.rejected += 1
+            raise HashingOverloadedError("Сервис хэширования паролей перегружен")
+        with self._lock:
+            self._pending += 1
+        try:
+            future = self._get_executor().submit(fn, *args)
+        except Exception:
+            self._release()
+            raise
+        # Слот освобождается по завершении задачи, даже если ожидающий ушел по таймауту
+        future.add_done_callback(self._release)
+        try:
+            return future.result(timeout=self.timeout_seconds)
+        except FutureTimeoutError as e:
+            raise HashingOverloadedError("Превышено время ожидания хэширования пароля") from e
+
+    def hash(self, password: str) -> str:
+        """Хэшировать пароль в пуле"""
+        return self._run(pwd_context.hash, password)
+
+    def verify(self, password: str, hashed_password: str) -> bool:
+        """Проверить пароль в пуле"""
+        return self._run(pwd_context.verify, password, hashed_password)
+
+    def verify_and_update(self, password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+        """
+        Проверить пароль и, если хэш создан со старыми параметрами Argon2,
+        вернуть новый хэш (иначе None)
+        """
+        return self._run(pwd_context.verify_and_update, password, hashed_password)
+
+    def shutdown(self) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True)
+
+
+# Глобальный сервис хэширования паролей
+password_hasher = PasswordHashingService(
+    workers=settings.PASSWORD_HASH_WORKERS,
+    queue_limit=settings.PASSWORD_HASH_QUEUE_LIMIT,
+    timeout_seconds=settings.PASSWORD_HASH_TIMEOUT_SECONDS
+)
@@ -0,0 +1,154 @@
+import logging
+import re
+import time
+from collections import Counter
+from typing import Dict, List, Tuple
+
+from sqlalchemy import event
+from app.core.metrics import RequestDbStats, current_db_stats, record_query
+
+logger = logging.getLogger(__name__)
+
+# Строковые и числовые литералы, параметры драйверов (?, :name, %(name)s, %s, $1)
+_LITERAL_RE = re.compile(r"'(?:[^']|'')*'|\b\d+(?:\.\d+)?\b")
+_PARAM_RE = re.compile(r"%\(\w+\)s|%s|:\w+|\$\d+|\?")
+# Список параметров после раскрытия IN (...) - разная длина не меняет форму запроса
+_PARAM_LIST_RE = re.compile(r"\(\s*\?(?:\s*,\s*\?)*\s*\)")
+_SPACE_RE = re.compile(r"\s+")
+
+
+def statement_shape(statement: str) -> str:
+    """
+    Форма SQL-запроса: литералы и параметры заменены на ?, списки IN свернуты,
+    пробелы нормализованы. Одинаковая форма, выполненная много раз за один
+    HTTP-запрос, обычно означает N+1 (ленивую загрузку в цикле).
+    """
+    shape = _LITERAL_RE.sub("?", statement)
+    shape = _PARAM_RE.sub("?", shape)
+    shape = _PARAM_LIST_RE.sub("(?)", shape)
+    return _SPACE_RE.sub(" ", shape).strip()
+
+
+def repeated_shapes(statements: Dict[str, int], threshold: int) -> List[Tuple[str, int]]:
+    """
+    Формы запросов, выполненные не меньше threshold раз, по убыванию числа повторов
+    """
+    shapes: Counter = Counter()
+    for statement, count in statements.items():
+        shapes[statement_shape(statement)] += count
+    return [(shape, count) for shape, count in shapes.most_common() if count >= threshold]
+
+
+def install_query_listeners(engine) -> None:
+    """
+    Подключить к движку учет SQL-запросов текущего HTTP-запроса
+    (количество, время и тексты для поиска повторов)
+    """
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_start_time", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        record_query(time.perf_counter() - conn.info["query_start_time"].pop(), statement)
+
+    @event.listens_for(engine, "handle_error")
+    def _on_handle_error(exception_context):
+        # Упавший запрос не доходит до after_cursor_execute - снимаем его отметку времени
+        conn = exception_context.connection
+        if conn is not None and conn.info.get("query_start_time"):
+            conn.info["query_start_time"].pop()
+
+
+class QueryCounter:
+    """
+    Счетчик всех запросов движка, независимо от потока и HTTP-запроса.
+    Используется в тестах и бенчмарках:
+
+        with QueryCounter(engine) as counter:
+            client.get("/api/discussions")
+        assert counter.count <= 3
+    """
+
+    def __init__(self, engine):
+        self.engine = engine
+        self.statements: List[str] = []
+
+    @property
+    def count(self) -> int:
+        return len(self.statements)
+
+    def _record(self, conn, cursor, statement, parameters, context, executemany):
+        self.statements.append(statement)
+
+    def __enter__(self) -> "QueryCounter":
+        self.statements = []
+        event.listen(self.engine, "after_cursor_execute", self._record)
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        event.remove(self.engine, "after_cursor_execute", self._record)
+
+    def repeated(self, threshold: int = 2) -> List[Tuple[str, int]]:
+        return repeated_shapes(Counter(self.statements), threshold)
+
+    def report(self) -> str:
+        lines = [f"{self.count} SQL-запросов"]
+        for shape, count in self.repeated():
+            lines.append(f"  x{count}: {shape}")
+        return "\n".join(lines)
+
+
+class QueryInspectorMiddleware:
+    """
+    ASGI middleware: считает SQL-запросы каждого HTTP-запроса, добавляет
+    заголовки X-DB-Queries / X-DB-Time-Ms / X-DB-Repeated (если включены),
+    пишет в лог запросы сверх бюджета и повторяющиеся формы запросов
+    """
+
+    def __init__(self, app, budget: int = 20, repeat_threshold: int = 5, debug_headers: bool = False):
+        self.app = app
+        self.budget = budget
+        self.repeat_threshold = repeat_threshold
+        self.debug_headers = debug_headers
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = current_db_stats.get()
+        token = None
+        if stats is None:
+            stats = RequestDbStats()
+            token = current_db_stats.set(stats)
+        stats.track_statements = True
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start" and self.debug_headers:
+                # Для обычных ответов обработчик к этому моменту уже завершил работу с БД
+                repeated = repeated_shapes(stats.statements, self.repeat_threshold)
+                headers = list(message.get("headers", []))
+                headers.append((b"x-db-queries", str(stats.queries).encode()))
+                headers.append((b"x-db-time-ms", f"{stats.seconds * 1000:.2f}".encode()))
+                headers.append((b"x-db-repeated", str(len(repeated)).encode()))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            if token is not None:
+                current_db_stats.reset(token)
+            self._report(scope, stats)
+
+    def _report(self, scope, stats: RequestDbStats) -> None:
+        path = f"{scope['method']} {scope['path']}"
+        if stats.queries > self.budget:
+            logger.warning(
+                f"{path}: {stats.queries} SQL-запросов за {stats.seconds * 1000:.1f} мс "
+                f"(бюджет {self.budget})"
+            )
+        for shape, count in repeated_shapes(stats.statements, self.repeat_threshold):
+            logger.warning(f"{path}: возможный N+1, запрос выполнен {count} раз: {shape}")
+
@@ -1,15 +1,26 @@
-from datetime import datetime, timedelta
-from typing import Any, Union
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Optional, Union
 from jose import jwt
 from passlib.context import CryptContext
 from app.core.config import settings
 
-# Используем Argon2 вместо bcrypt
-pwd_context = CryptContext(schemes=["argon2"], deprecated="auto")
+# Используем Argon2 вместо bcrypt; хэши со старыми параметрами считаются устаревшими
+pwd_context = CryptContext(
+    schemes=["argon2"],
+    deprecated="auto",
+    argon2__rounds=settings.ARGON2_TIME_COST,
+    argon2__memory_cost=settings.ARGON2_MEMORY_COST,
+    argon2__parallelism=settings.ARGON2_PARALLELISM
+)
 
-def create_access_token(subject: Union[str, Any], expires_delta: timedelta = None) -> str:
+def create_access_token(
+    subject: Union[str, Any],
+    expires_delta: timedelta = None,
+    claims: Optional[Dict[str, Any]] = None
+) -> str:
     """
-    Создание JWT токена для пользователя
+    Создание JWT токена для пользователя.
+    claims - дополнительные данные (например, id и имя пользователя)
     """
     if expires_delta:
         expire = datetime.utcnow() + expires_delta
@@ -17,7 +28,8 @@ def create_access_token(subject: Union[str, Any], expires_delta: timedelta = Non
         expire = datetime.utcnow() + timedelta(
             minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES
         )
-    to_encode = {"exp": expire, "sub": str(subject)}
+    to_encode = dict(claims or {})
+    to_encode.update({"exp": expire, "iat": datetime.utcnow(), "sub": str(subject)})
     encoded_jwt = jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
     return encoded_jwt
 
@@ -33,12 +45,34 @@ def get_password_hash(password: str) -> str:
     """
     return pwd_context.hash(password)
 
-def verify_token(token: str) -> Union[str, None]:
+def decode_token(token: str) -> Union[Dict[str, Any], None]:
     """
-    Верификация JWT токена и извлечение email пользователя
+    Верификация JWT токена и получение всех его данных
     """
     try:
-        payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
-        return payload.get("sub")
+        return jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
     except jwt.JWTError:
-        return None
\ No newline at end of file
+        return None
+
+def verify_token(token: str) -> Union[str, None]:
+    """
+    Верификация JWT токена и извлечение email пользователя
+    """
+    payload = decode_token(token)
+    return payload.get("sub") if payload else None
+
+def user_token_claims(user) -> Dict[str, Any]:
+    """
+    Данные пользователя для вложения в токен (если включено TOKEN_USER_CLAIMS).
+    uexp - момент, до которого данным можно доверять без обращения к БД:
+    он короче срока токена, после него пользователь снова читается из кэша или БД.
+    """
+    if not settings.TOKEN_USER_CLAIMS:
+        return {}
+    claims_expire = datetime.utcnow() + timedelta(minutes=settings.TOKEN_USER_CLAIMS_TTL_MINUTES)
+    return {
+        "uid": user.id,
+        "name": user.full_name,
+        "avatar": user.avatar_url,
+        "uexp": int(claims_expire.replace(tzinfo=timezone.utc).timestamp())
+    }
\ No newline at end of file
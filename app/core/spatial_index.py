@@ -0,0 +1,229 @@
+import math
+import threading
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+from app.core.config import settings
+
+EARTH_RADIUS_KM = 6371.0088
+KM_PER_DEGREE = math.pi * EARTH_RADIUS_KM / 180.0
+
+
+def haversine_km(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    """
+    Расстояние по большому кругу между двумя точками в километрах
+    """
+    phi1 = math.radians(lat1)
+    phi2 = math.radians(lat2)
+    d_phi = phi2 - phi1
+    d_lambda = math.radians(lon2 - lon1)
+    a = math.sin(d_phi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(d_lambda / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(a)))
+
+
+def bounding_box(
+    latitude: float,
+    longitude: float,
+    radius_km: float
+) -> Tuple[float, float, Optional[float], Optional[float]]:
+    """
+    Ограничивающий прямоугольник круга радиуса radius_km на сфере.
+
+    Возвращает (min_lat, max_lat, min_lon, max_lon). Если круг накрывает полюс,
+    долготы равны None (подходят любые). Если min_lon > max_lon, прямоугольник
+    пересекает линию смены дат.
+    """
+    angular = radius_km / EARTH_RADIUS_KM
+    lat_rad = math.radians(latitude)
+    min_lat = math.degrees(lat_rad - angular)
+    max_lat = math.degrees(lat_rad + angular)
+
+    if min_lat <= -90.0 or max_lat >= 90.0 or angular >= math.pi / 2:
+        return max(min_lat, -90.0), min(max_lat, 90.0), None, None
+
+    d_lon = math.degrees(math.asin(math.sin(angular) / math.cos(lat_rad)))
+    min_lon = longitude - d_lon
+    max_lon = longitude + d_lon
+    if min_lon < -180.0:
+        min_lon += 360.0
+    if max_lon > 180.0:
+        max_lon -= 360.0
+    return min_lat, max_lat, min_lon, max_lon
+
+
+class SpatialIndex:
+    """
+    Сеточный пространственный индекс по широте/долготе.
+
+    Точки раскладываются по ячейкам фиксированного размера (в градусах),
+    поиск в радиусе и k ближайших просматривает только соседние ячейки.
+    Индекс хранит только id и координаты - сами объекты подгружаются из БД.
+    """
+
+    def __init__(self, cell_size_deg: float = 0.05):
+        self.cell_size_deg = cell_size_deg
+        self._cells: Dict[Tuple[int, int], Dict[int, Tuple[float, float]]] = {}
+        self._points: Dict[int, Tuple[float, float]] = {}
+        self._lock = threading.RLock()
+        self._lon_cells = int(math.ceil(360.0 / cell_size_deg))
+        self.is_built = False
+
+    def __len__(self) -> int:
+        return len(self._points)
+
+    def __contains__(self, point_id: int) -> bool:
+        return point_id in self._points
+
+    def _cell_of(self, latitude: float, longitude: float) -> Tuple[int, int]:
+        row = int(math.floor((latitude + 90.0) / self.cell_size_deg))
+        col = int(math.floor((longitude + 180.0) / self.cell_size_deg)) % self._lon_cells
+        return row, col
+
+    def build(self, points: Iterable[Tuple[int, float, float]]) -> None:
+        """
+        Полностью перестроить индекс по набору (id, широта, долгота)
+        """
+        cells: Dict[Tuple[int, int], Dict[int, Tuple[float, float]]] = {}
+        all_points: Dict[int, Tuple[float, float]] = {}
+        for point_id, latitude, longitude in points:
+            coords = (float(latitude), float(longitude))
+            all_points[point_id] = coords
+            cells.setdefault(self._cell_of(*coords), {})[point_id] = coords
+
+        with self._lock:
+            self._cells = cells
+            self._points = all_points
+            self.is_built = True
+
+    def insert(self, point_id: int, latitude: float, longitude: float) -> None:
+        """
+        Добавить точку или переместить уже существующую
+        """
+        with self._lock:
+            self._discard(point_id)
+            coords = (float(latitude), float(longitude))
+            self._points[point_id] = coords
+            self._cells.setdefault(self._cell_of(*coords), {})[point_id] = coords
+
+    def remove(self, point_id: int) -> bool:
+        """
+        Удалить точку из индекса
+        """
+        with self._lock:
+            return self._discard(point_id)
+
+    def _discard(self, point_id: int) -> bool:
+        coords = self._points.pop(point_id, None)
+        if coords is None:
+            return False
+        cell = self._cell_of(*coords)
+        bucket = self._cells.get(cell)
+        if bucket is not None:
+            bucket.pop(point_id, None)
+            if not bucket:
+                del self._cells[cell]
+        return True
+
+    def _box_ranges(
+        self,
+        latitude: float,
+        longitude: float,
+        radius_km: float
+    ) -> Tuple[range, Optional[range]]:
+        """
+        Диапазоны строк и столбцов ячеек, покрывающих ограничивающий прямоугольник
+        круга поиска. Столбцы равны None, если круг накрывает полюс (подходят все).
+        Диапазон столбцов может выходить за _lon_cells при пересечении линии смены дат.
+        """
+        min_lat, max_lat, min_lon, max_lon = bounding_box(latitude, longitude, radius_km)
+        first_row = int(math.floor((min_lat + 90.0) / self.cell_size_deg))
+        last_row = int(math.floor((max_lat + 90.0) / self.cell_size_deg))
+        rows = range(first_row, last_row + 1)
+        if min_lon is None or max_lon is None:
+            return rows, None
+
+        first_col = int(math.floor((min_lon + 180.0) / self.cell_size_deg))
+        last_col = int(math.floor((max_lon + 180.0) / self.cell_size_deg))
+        if min_lon > max_lon:
+            # Прямоугольник пересекает линию смены дат
+            last_col += self._lon_cells
+        return rows, range(first_col, last_col + 1)
+
+    def _cells_in_box(self, rows: range, col_range: Optional[range]) -> Iterable[Tuple[int, int]]:
+        """
+        Ячейки, покрывающие ограничивающий прямоугольник круга поиска
+        """
+        if col_range is None:
+            cols: List[int] = list(range(self._lon_cells))
+        else:
+            cols = [c % self._lon_cells for c in col_range]
+        for row in rows:
+            for col in cols:
+                yield row, col
+
+    def query_radius(
+        self,
+        latitude: float,
+        longitude: float,
+        radius_km: float,
+        limit: Optional[int] = None
+    ) -> List[Tuple[int, float]]:
+        """
+        Точки в радиусе radius_km, отсортированные по расстоянию.
+        Возвращает список (id, расстояние в км).
+        """
+        found: List[Tuple[int, float]] = []
+        with self._lock:
+            rows, col_range = self._box_ranges(latitude, longitude, radius_km)
+            cell_count = len(rows) * (len(col_range) if col_range is not None else self._lon_cells)
+            if cell_count >= len(self._points):
+                # У полюсов и на больших радиусах ячеек больше, чем точек:
+                # полный просмотр точек дешевле перебора пустых ячеек
+                candidates: Iterable[Tuple[int, Tuple[float, float]]] = self._points.items()
+            else:
+                candidates = (
+                    item
+                    for cell in self._cells_in_box(rows, col_range)
+                    for item in self._cells.get(cell, {}).items()
+                )
+            for point_id, (lat, lon) in candidates:
+                distance = haversine_km(latitude, longitude, lat, lon)
+                if distance <= radius_km:
+                    found.append((point_id, distance))
+
+        found.sort(key=lambda item: item[1])
+        return found[:limit] if limit is not None else found
+
+    def query_nearest(
+        self,
+        latitude: float,
+        longitude: float,
+        k: int,
+        max_radius_km: Optional[float] = None
+    ) -> List[Tuple[int, float]]:
+        """
+        k ближайших точек (id, расстояние в км) с расширением области поиска по кольцам ячеек
+        """
+        if k <= 0:
+            return []
+
+        with self._lock:
+            total = len(self._points)
+        if total == 0:
+            return []
+
+        # Стартуем с радиуса в одну ячейку и удваиваем, пока не наберем k точек
+        radius_km = self.cell_size_deg * KM_PER_DEGREE
+        limit_km = max_radius_km if max_radius_km is not None else math.pi * EARTH_RADIUS_KM
+        while True:
+            radius_km = min(radius_km, limit_km)
+            found = self.query_radius(latitude, longitude, radius_km)
+            if len(found) >= k or radius_km >= limit_km or len(found) >= total:
+                return found[:k]
+            radius_km *= 2
+
+    def ids(self) -> Set[int]:
+        with self._lock:
+            return set(self._points)
+
+
+# Глобальный индекс достопримечательностей (строится при старте приложения)
+landmark_index = SpatialIndex(cell_size_deg=settings.SPATIAL_INDEX_CELL_DEG)
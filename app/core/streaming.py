@@ -0,0 +1,93 @@
+import csv
+import io
+import json
+import zlib
+from datetime import date, datetime
+from typing import Any, Dict, Iterable, Iterator, List, Sequence
+
+from sqlalchemy.orm import Query
+
+STREAM_FORMATS = ("ndjson", "csv")
+STREAM_MEDIA_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv; charset=utf-8",
+}
+# Строк за один проход серверного курсора
+DEFAULT_YIELD_PER = 1000
+# Размер отдаваемого клиенту куска: меньше - больше накладных расходов ASGI,
+# больше - дольше ждать первого байта
+CHUNK_SIZE = 64 * 1024
+
+
+def _serialize(value: Any) -> Any:
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return value
+
+
+def iter_query_rows(query: Query, fields: Sequence[str], yield_per: int = DEFAULT_YIELD_PER) -> Iterator[Dict[str, Any]]:
+    """
+    Построчный обход запроса через серверный курсор (stream_results + yield_per):
+    в памяти одновременно не больше yield_per строк, независимо от размера таблицы.
+    Запрос должен выбирать колонки в порядке fields.
+    """
+    for row in query.yield_per(yield_per):
+        yield {field: _serialize(value) for field, value in zip(fields, row)}
+
+
+def _chunked(pieces: Iterable[str], chunk_size: int) -> Iterator[bytes]:
+    """Склеить мелкие строки в куски ~chunk_size байт"""
+    buffer: List[str] = []
+    size = 0
+    for piece in pieces:
+        buffer.append(piece)
+        size += len(piece)
+        if size >= chunk_size:
+            yield "".join(buffer).encode("utf-8")
+            buffer, size = [], 0
+    if buffer:
+        yield "".join(buffer).encode("utf-8")
+
+
+def encode_ndjson(rows: Iterable[Dict[str, Any]], chunk_size: int = CHUNK_SIZE) -> Iterator[bytes]:
+    """Одна JSON-запись на строку"""
+    return _chunked(
+        (json.dumps(row, ensure_ascii=False, separators=(",", ":")) + "\n" for row in rows),
+        chunk_size
+    )
+
+
+def encode_csv(rows: Iterable[Dict[str, Any]], fields: Sequence[str], chunk_size: int = CHUNK_SIZE) -> Iterator[bytes]:
+    """CSV с заголовком; отсутствующие значения - пустые ячейки"""
+    def lines() -> Iterator[str]:
+        buffer = io.StringIO()
+        writer = csv.DictWriter(buffer, fieldnames=list(fields), lineterminator="\n")
+        writer.writeheader()
+        for row in rows:
+            writer.writerow(row)
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+        yield buffer.getvalue()
+
+    return _chunked(lines(), chunk_size)
+
+
+def encode_rows(rows: Iterable[Dict[str, Any]], fields: Sequence[str], stream_format: str) -> Iterator[bytes]:
+    if stream_format == "ndjson":
+        return encode_ndjson(rows)
+    if stream_format == "csv":
+        return encode_csv(rows, fields)
+    raise ValueError(f"Неизвестный формат выгрузки: {stream_format}")
+
+
+def gzip_chunks(chunks: Iterable[bytes], level: int = 6) -> Iterator[bytes]:
+    """
+    Сжатие потока в формат gzip на лету, без буферизации всего ответа
+    """
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+    for chunk in chunks:
+        compressed = compressor.compress(chunk)
+        if compressed:
+            yield compressed
+    yield compressor.flush()
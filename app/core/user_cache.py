@@ -0,0 +1,145 @@
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Callable, Dict, Hashable, Optional, Set
+from app.core.config import settings
+
+
+@dataclass(frozen=True)
+class UserSnapshot:
+    """
+    Неизменяемый снимок данных текущего пользователя, которых достаточно
+    обработчикам запросов (без обращения к сессии БД)
+    """
+    id: int
+    email: str
+    full_name: str
+    avatar_url: Optional[str] = None
+
+    @classmethod
+    def from_user(cls, user) -> "UserSnapshot":
+        return cls(
+            id=user.id,
+            email=user.email,
+            full_name=user.full_name,
+            avatar_url=user.avatar_url
+        )
+
+
+class UserSnapshotCache:
+    """
+    Ограниченный LRU-кэш снимков пользователей с временем жизни записей.
+
+    Ключ - subject токена. Помимо самих записей кэш помнит, когда данные
+    пользователя менялись в последний раз: токены с вложенными данными
+    пользователя, выданные раньше изменения, считаются устаревшими.
+    Эта отметка есть только в процессе, где произошло изменение; в остальных
+    процессах данные из токена устаревают по сроку доверия (uexp).
+    """
+
+    def __init__(
+        self,
+        maxsize: int = 10000,
+        ttl_seconds: float = 60.0,
+        token_lifetime_seconds: float = 5 * 60,
+        clock: Callable[[], float] = time.monotonic,
+        wall_clock: Callable[[], float] = time.time
+    ):
+        self.maxsize = maxsize
+        self.ttl_seconds = ttl_seconds
+        self.token_lifetime_seconds = token_lifetime_seconds
+        self._clock = clock
+        self._wall_clock = wall_clock
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._keys_by_user: Dict[int, Set[Hashable]] = {}
+        self._changed_at: Dict[int, float] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: Hashable) -> Optional[UserSnapshot]:
+        """
+        Снимок по ключу или None, если записи нет или она устарела
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            snapshot, expires_at = entry
+            if expires_at <= self._clock():
+                self._drop(key)
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return snapshot
+
+    def put(self, key: Hashable, snapshot: UserSnapshot) -> None:
+        """
+        Сохранить снимок; самая давно использованная запись вытесняется
+        """
+        if self.maxsize <= 0:
+            return
+        with self._lock:
+            if key in self._entries:
+                self._drop(key)
+            self._entries[key] = (snapshot, self._clock() + self.ttl_seconds)
+            self._keys_by_user.setdefault(snapshot.id, set()).add(key)
+            while len(self._entries) > self.maxsize:
+                oldest = next(iter(self._entries))
+                self._drop(oldest)
+
+    def invalidate_user(self, user_id: int) -> None:
+        """
+        Удалить все снимки пользователя и запомнить момент изменения его данных
+        """
+        with self._lock:
+            for key in list(self._keys_by_user.get(user_id, ())):
+                self._drop(key)
+            now = self._wall_clock()
+            self._changed_at[user_id] = now
+            # Изменения старше срока доверия данным из токена уже ни на что не влияют
+            if len(self._changed_at) > self.maxsize:
+                horizon = now - self.token_lifetime_seconds
+                self._changed_at = {
+                    uid: changed for uid, changed in self._changed_at.items() if changed > horizon
+                }
+
+    def changed_since(self, user_id: int, issued_at: Optional[float]) -> bool:
+        """
+        Менялись ли данные пользователя после момента выдачи токена
+        """
+        with self._lock:
+            changed = self._changed_at.get(user_id)
+        if changed is None:
+            return False
+        return issued_at is None or changed >= issued_at
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._keys_by_user.clear()
+            self._changed_at.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def _drop(self, key: Hashable) -> None:
+        snapshot, _ = self._entries.pop(key)
+        keys = self._keys_by_user.get(snapshot.id)
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self._keys_by_user[snapshot.id]
+
+
+# Глобальный кэш текущих пользователей (на процесс)
+user_cache = UserSnapshotCache(
+    maxsize=settings.USER_CACHE_SIZE if settings.USER_CACHE_ENABLED else 0,
+    ttl_seconds=settings.USER_CACHE_TTL_SECONDS,
+    token_lifetime_seconds=settings.TOKEN_USER_CLAIMS_TTL_MINUTES * 60
+)
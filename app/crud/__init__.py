@@ -5,7 +5,7 @@ from .user_crud import (
 )
 from .landmark_crud import (
     get_landmark, get_landmarks, create_landmark,
-    update_landmark, delete_landmark, get_nearby_landmarks,
+    update_landmark, delete_landmark, get_landmarks_near_location,
     get_cities, get_categories
 )
 from .review_crud import (
@@ -15,7 +15,7 @@ from .review_crud import (
 )
 from .favorite_crud import (
     get_favorite, get_user_favorites, create_favorite,
-    delete_favorite, check_favorite, is_landmark_favorite
+    delete_favorite, is_landmark_favorite
 )
 from .discussion_crud import (
     get_discussion, get_discussions, create_discussion,
@@ -28,82 +28,24 @@ from .city_crud import (
     get_filtered_landmarks_by_city, get_city_categories
 )
 from .notification_crud import (
-    get_notification, get_user_notifications, get_unread_count,
-    create_notification, mark_as_read, mark_all_as_read, delete_notification,
-    create_answer_notification, create_like_notification, create_review_notification
-)
-
-from app.crud.notification_crud import (
-    get_notification,
-    get_user_notifications,
-    create_notification,
-    create_system_notification,
-    mark_as_read,
-    mark_as_archived,
-    delete_notification,
-    delete_all_read_notifications,
-    get_notification_stats
+    get_notification, get_user_notifications, create_notification,
+    create_system_notification, mark_as_read, mark_as_archived, delete_notification,
+    delete_all_read_notifications, get_notification_stats
 )
 
 __all__ = [
-<<<<<<< Updated upstream
-    "get_landmark",
-    "get_landmarks", 
-    "create_landmark",
-    "update_landmark",
-    "delete_landmark",
-    "get_cities",
-    "get_categories",
-    "get_landmarks_near_location",
-    "get_favorite",
-    "get_user_favorites", 
-    "create_favorite",
-    "delete_favorite",
-    "is_landmark_favorite",
-    "get_review",
-    "get_reviews_by_landmark",
-    "get_reviews_by_user",
-    "create_review",
-    "update_review",
-    "delete_review",
-    "get_landmark_rating_summary",
-    "get_user_profile",
-    "update_user_profile",
-    "get_user_stats",
-    "get_discussion",
-    "get_discussions",
-    "create_discussion",
-    "update_discussion",
-    "delete_discussion",
-    "get_answer",
-    "get_answers_by_discussion",
-    "create_answer",
-    "update_answer",
-    "delete_answer",
-    "vote_helpful",
-    "get_discussion_stats",
-    "get_notification",
-    "get_user_notifications",
-    "create_notification",
-    "create_system_notification",
-    "mark_as_read",
-    "mark_as_archived",
-    "delete_notification",
-    "delete_all_read_notifications",
-    "get_notification_stats"
-=======
     # User CRUD
     "get_user", "get_user_by_email", "create_user", "update_user", "delete_user", "get_users",
     "get_user_profile", "update_user_profile", "get_user_stats",
     # Landmark CRUD
     "get_landmark", "get_landmarks", "create_landmark", "update_landmark", "delete_landmark", 
-    "get_nearby_landmarks", "get_cities", "get_categories",
+    "get_landmarks_near_location", "get_cities", "get_categories",
     # Review CRUD
     "get_review", "get_reviews_by_landmark", "get_reviews_by_user", "create_review", 
     "update_review", "delete_review", "get_landmark_rating_summary",
     # Favorite CRUD
     "get_favorite", "get_user_favorites", "create_favorite", "delete_favorite", 
-    "check_favorite", "is_landmark_favorite",
+    "is_landmark_favorite",
     # Discussion CRUD
     "get_discussion", "get_discussions", "create_discussion", "update_discussion", 
     "delete_discussion", "get_discussion_answers", "create_answer", "update_answer", 
@@ -113,8 +55,7 @@ __all__ = [
     "get_city_profile", "get_city_stats", "get_cities_with_stats", 
     "get_filtered_landmarks_by_city", "get_city_categories",
     # Notification CRUD
-    "get_notification", "get_user_notifications", "get_unread_count", "create_notification",
-    "mark_as_read", "mark_all_as_read", "delete_notification",
-    "create_answer_notification", "create_like_notification", "create_review_notification"
->>>>>>> Stashed changes
+    "get_notification", "get_user_notifications", "create_notification",
+    "create_system_notification", "mark_as_read", "mark_as_archived", "delete_notification",
+    "delete_all_read_notifications", "get_notification_stats"
 ]
\ No newline at end of file
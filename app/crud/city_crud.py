@@ -1,9 +1,23 @@
+from collections import defaultdict
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
-from sqlalchemy import distinct, func, desc
-from typing import Dict, List, Optional, Tuple
+from sqlalchemy import and_, case, distinct, exists, func, desc
+from typing import Dict, Iterable, List, Optional, Tuple
+from app.core.filter_keys import filter_key
+from app.core.pagination import fetch_page
+from app.models.city import CityProfile, CityCategoryStats
 from app.models.landmark import Landmark
 from app.models.review import Review
-from app.models.discussion import Discussion
+from app.models.discussion import Discussion, DiscussionAnswer
+
+# Столбцы гистограммы оценок достопримечательности (1-5 звезд)
+RATING_HISTOGRAM_COLUMNS = (
+    Landmark.rating_1,
+    Landmark.rating_2,
+    Landmark.rating_3,
+    Landmark.rating_4,
+    Landmark.rating_5
+)
 
 def get_city_profile(db: Session, city_name: str) -> Dict:
     """
@@ -67,47 +81,77 @@ def get_city_profile(db: Session, city_name: str) -> Dict:
         "landmarks_by_category": landmarks_by_category
     }
 
-def get_city_stats(db: Session, city_name: str) -> Dict:
+def get_city_stats(db: Session, city_name: str) -> Optional[Dict]:
     """
-    Получить детальную статистику по городу
+    Получить детальную статистику по городу за два запроса.
+
+    Достопримечательности, отзывы (из агрегатов Landmark) и категории считаются
+    одним GROUP BY category с условной агрегацией, обсуждения - вторым запросом
+    с FILTER. Возвращает словарь в формате CityStatsResponse или None,
+    если в городе нет ни достопримечательностей, ни обсуждений.
     """
-    # Статистика по достопримечательностям
-    landmarks_stats = {
-        "total": db.query(Landmark).filter(Landmark.city == city_name).count(),
-        "with_images": db.query(Landmark).filter(
-            Landmark.city == city_name,
-            Landmark.image_url.isnot(None)
-        ).count(),
-        "by_category": {}
-    }
-    
-    # Статистика по отзывам
-    reviews_stats = {
-        "total": db.query(Review).join(Landmark).filter(Landmark.city == city_name).count(),
-        "average_rating": db.query(
-            func.avg(Review.rating)
-        ).join(Landmark).filter(Landmark.city == city_name).scalar() or 0,
-        "rating_distribution": {}
-    }
-    
-    # Статистика по обсуждениям
-    discussions_stats = {
-        "total": db.query(Discussion).filter(Discussion.city == city_name).count(),
-        "open": db.query(Discussion).filter(
-            Discussion.city == city_name,
-            Discussion.is_closed == False
-        ).count(),
-        "with_answers": db.query(func.count(distinct(Discussion.id))).filter(
-            Discussion.city == city_name,
-            Discussion.answers.any()
-        ).scalar() or 0
-    }
-    
+    has_image = and_(Landmark.image_url.isnot(None), Landmark.image_url != "")
+    category_rows = db.query(
+        Landmark.category,
+        func.count(Landmark.id),
+        func.count(Landmark.id).filter(has_image),
+        func.coalesce(func.sum(Landmark.review_count), 0),
+        func.coalesce(func.sum(Landmark.rating_sum), 0.0),
+        *[func.coalesce(func.sum(column), 0) for column in RATING_HISTOGRAM_COLUMNS]
+    ).filter(
+        Landmark.city == city_name
+    ).group_by(
+        Landmark.category
+    ).all()
+
+    has_answers = exists().where(DiscussionAnswer.discussion_id == Discussion.id)
+    discussions = db.query(
+        func.count(Discussion.id),
+        func.count(Discussion.id).filter(Discussion.is_closed == False),
+        func.count(Discussion.id).filter(Discussion.is_closed == True),
+        func.count(Discussion.id).filter(has_answers)
+    ).filter(
+        Discussion.city == city_name
+    ).one()
+
+    if not category_rows and not discussions[0]:
+        return None
+
+    by_category = {}
+    total_landmarks = with_images = total_reviews = 0
+    rating_sum = 0.0
+    histogram = [0] * len(RATING_HISTOGRAM_COLUMNS)
+    for category, count, images, reviews, ratings, *buckets in category_rows:
+        by_category[category] = count
+        total_landmarks += count
+        with_images += images
+        total_reviews += int(reviews)
+        rating_sum += float(ratings)
+        for i, bucket in enumerate(buckets):
+            histogram[i] += int(bucket)
+
+    total_discussions, open_discussions, closed_discussions, with_answers = discussions
     return {
         "city_name": city_name,
-        "landmarks_stats": landmarks_stats,
-        "reviews_stats": reviews_stats,
-        "discussions_stats": discussions_stats
+        "landmarks_stats": {
+            "total": total_landmarks,
+            "with_images": with_images,
+            "by_category": by_category,
+            "categories_count": len(by_category)
+        },
+        "reviews_stats": {
+            "total": total_reviews,
+            "average_rating": rating_sum / total_reviews if total_reviews else 0.0,
+            "rating_distribution": {str(stars): count for stars, count in enumerate(histogram, start=1)},
+            "rating_levels": 5  # Максимальный рейтинг
+        },
+        "discussions_stats": {
+            "total": total_discussions,
+            "open": open_discussions,
+            "closed": closed_discussions,
+            "with_answers": with_answers,
+            "without_answers": total_discussions - with_answers
+        }
     }
 
 def get_cities_with_stats(db: Session, limit: int = 20) -> List[Dict]:
@@ -153,32 +197,24 @@ def get_filtered_landmarks_by_city(
     price_filter: Optional[str] = None,
     has_images: Optional[bool] = None,
     skip: int = 0,
-    limit: int = 50
-) -> Tuple[List[Landmark], int]:
+    limit: int = 50,
+    total_mode: str = "exact"
+) -> Tuple[List[Landmark], Optional[int]]:
     """
     Получить отфильтрованные достопримечательности по городу
     """
     from sqlalchemy import and_, or_
     
-    query = db.query(Landmark).filter(Landmark.city == city)
+    # Ключи города и категории - по составному индексу (city_key, category_key)
+    query = db.query(Landmark).filter(Landmark.city_key == filter_key(city))
     
     # Дополнительные фильтры
     if category:
-        query = query.filter(Landmark.category.ilike(f"%{category}%"))
+        query = query.filter(Landmark.category_key == filter_key(category))
     
     if min_rating:
-        # Фильтр по минимальному рейтингу (через подзапрос)
-        from sqlalchemy import select, func
-        subquery = select(
-            Review.landmark_id,
-            func.avg(Review.rating).label('avg_rating')
-        ).group_by(
-            Review.landmark_id
-        ).having(
-            func.avg(Review.rating) >= min_rating
-        ).subquery()
-        
-        query = query.join(subquery, Landmark.id == subquery.c.landmark_id)
+        # Фильтр по минимальному рейтингу (по денормализованным агрегатам)
+        query = query.filter(Landmark.average_rating >= min_rating)
     
     if has_images is not None:
         if has_images:
@@ -188,13 +224,12 @@ def get_filtered_landmarks_by_city(
     
     # Сортировка по рейтингу (если есть)
     if min_rating:
-        query = query.order_by(desc(subquery.c.avg_rating))
+        query = query.order_by(desc(Landmark.average_rating), Landmark.id)
     else:
         query = query.order_by(Landmark.name)
     
-    # Пагинация
-    total = query.count()
-    landmarks = query.offset(skip).limit(limit).all()
+    # Пагинация (общее количество - в том же запросе)
+    landmarks, total = fetch_page(query, skip, limit, total_mode)
     
     return landmarks, total
 
@@ -206,4 +241,219 @@ def get_city_categories(db: Session, city: str) -> List[str]:
         Landmark.city == city
     ).distinct().all()
     
-    return [category[0] for category in categories]
\ No newline at end of file
+    return [category[0] for category in categories]
+
+# --- Инкрементальное обновление статистики городов ---
+
+def adjust_city_stats(
+    db: Session,
+    city: Optional[str],
+    landmarks: int = 0,
+    reviews: int = 0,
+    rating_sum: float = 0.0,
+    discussions: int = 0
+) -> None:
+    """
+    Атомарно изменить счетчики профиля города на заданные приращения
+    в текущей транзакции. Средний рейтинг пересчитывается из суммы оценок.
+    Если профиля еще нет и в городе появилась достопримечательность,
+    профиль создается полным пересчетом по этому городу (категории
+    при этом не трогаются - их ведет adjust_category_count).
+    """
+    if not city or not (landmarks or reviews or rating_sum or discussions):
+        return
+
+    new_reviews = CityProfile.total_reviews + reviews
+    new_rating_sum = CityProfile.rating_sum + rating_sum
+    values = {
+        CityProfile.total_landmarks: CityProfile.total_landmarks + landmarks,
+        CityProfile.total_reviews: new_reviews,
+        CityProfile.total_discussions: CityProfile.total_discussions + discussions,
+        CityProfile.rating_sum: new_rating_sum,
+        CityProfile.average_rating: case((new_reviews > 0, new_rating_sum / new_reviews), else_=0.0)
+    }
+    updated = db.query(CityProfile).filter(
+        CityProfile.city_name == city
+    ).update(values, synchronize_session=False)
+
+    if not updated and landmarks > 0:
+        db.flush()
+        try:
+            # Вложенная транзакция: профиль мог создать параллельный запрос
+            # (первые достопримечательности нового города добавляются одновременно)
+            with db.begin_nested():
+                rebuild_city_stats(db, [city], categories=False)
+            return
+        except IntegrityError:
+            db.query(CityProfile).filter(
+                CityProfile.city_name == city
+            ).update(values, synchronize_session=False)
+
+    # Загруженный в сессию профиль должен перечитать счетчики
+    profile = db.identity_map.get(db.identity_key(CityProfile, city))
+    if profile is not None:
+        db.expire(profile)
+
+
+def adjust_category_count(db: Session, city: Optional[str], category: Optional[str], delta: int) -> None:
+    """
+    Атомарно изменить количество достопримечательностей категории в городе.
+    Пустые категории удаляются.
+    """
+    if not city or not category or not delta:
+        return
+
+    stats_filter = (CityCategoryStats.city_name == city, CityCategoryStats.category == category)
+    updated = db.query(CityCategoryStats).filter(*stats_filter).update(
+        {CityCategoryStats.count: CityCategoryStats.count + delta},
+        synchronize_session=False
+    )
+    if not updated and delta > 0:
+        try:
+            # Вложенная транзакция: строку мог вставить параллельный запрос
+            with db.begin_nested():
+                db.add(CityCategoryStats(city_name=city, category=category, count=delta))
+        except IntegrityError:
+            db.query(CityCategoryStats).filter(*stats_filter).update(
+                {CityCategoryStats.count: CityCategoryStats.count + delta},
+                synchronize_session=False
+            )
+
+    if delta < 0:
+        db.query(CityCategoryStats).filter(
+            *stats_filter, CityCategoryStats.count <= 0
+        ).delete(synchronize_session=False)
+
+
+def apply_landmark_stats_change(db: Session, before: Optional[Dict], after: Optional[Dict]) -> None:
+    """
+    Перенести вклад достопримечательности в статистику городов.
+    before/after - снимки landmark_stats_snapshot до и после изменения
+    (None при создании и удалении соответственно).
+    """
+    apply_landmark_stats_changes(db, [(before, after)])
+
+
+def apply_landmark_stats_changes(
+    db: Session,
+    changes: Iterable[Tuple[Optional[Dict], Optional[Dict]]]
+) -> None:
+    """
+    Перенести в статистику городов сразу пачку изменений (before, after).
+    Приращения суммируются, поэтому на каждый город и каждую пару
+    (город, категория) выполняется одно обновление, а не одно на строку.
+    """
+    category_deltas: Dict[Tuple[str, str], int] = defaultdict(int)
+    city_deltas: Dict[str, List] = defaultdict(lambda: [0, 0, 0.0])
+
+    for before, after in changes:
+        if before == after:
+            continue
+        for snapshot, sign in ((before, -1), (after, 1)):
+            if snapshot is None:
+                continue
+            category_deltas[(snapshot["city"], snapshot["category"])] += sign
+            delta = city_deltas[snapshot["city"]]
+            delta[0] += sign
+            delta[1] += sign * snapshot["review_count"]
+            delta[2] += sign * snapshot["rating_sum"]
+
+    for (city, category), delta in category_deltas.items():
+        adjust_category_count(db, city, category, delta)
+    for city, (landmarks, reviews, rating_sum) in city_deltas.items():
+        adjust_city_stats(db, city, landmarks=landmarks, reviews=reviews, rating_sum=rating_sum)
+
+
+def landmark_stats_snapshot(landmark: Landmark) -> Dict:
+    """
+    Поля достопримечательности, влияющие на статистику городов
+    """
+    return {
+        "city": landmark.city,
+        "category": landmark.category,
+        "review_count": landmark.review_count or 0,
+        "rating_sum": landmark.rating_sum or 0.0
+    }
+
+
+def remove_discussions_from_stats(db: Session, *criteria) -> None:
+    """
+    Снять со счетчиков городов обсуждения, которые будут удалены каскадно
+    (например, вместе с достопримечательностью или пользователем)
+    """
+    counts = db.query(Discussion.city, func.count(Discussion.id)).filter(
+        Discussion.city.isnot(None), *criteria
+    ).group_by(Discussion.city).all()
+    for city, count in counts:
+        adjust_city_stats(db, city, discussions=-count)
+
+
+def rebuild_city_stats(db: Session, cities: Optional[Iterable[str]] = None, categories: bool = True) -> int:
+    """
+    Полный пересчет CityProfile и CityCategoryStats за один проход GROUP BY
+    по каждой таблице (без запросов на каждый город).
+    Без cities пересчитываются все города, categories=False - только профили.
+    Коммит выполняет вызывающий код.
+    Возвращает количество профилей городов.
+    """
+    city_list = list(cities) if cities is not None else None
+
+    landmark_query = db.query(
+        Landmark.city,
+        func.max(Landmark.country),
+        func.count(Landmark.id),
+        func.coalesce(func.sum(Landmark.review_count), 0),
+        func.coalesce(func.sum(Landmark.rating_sum), 0.0)
+    ).group_by(Landmark.city)
+    discussion_query = db.query(
+        Discussion.city,
+        func.count(Discussion.id)
+    ).filter(Discussion.city.isnot(None)).group_by(Discussion.city)
+    category_query = db.query(
+        Landmark.city,
+        Landmark.category,
+        func.count(Landmark.id)
+    ).group_by(Landmark.city, Landmark.category)
+    profile_query = db.query(CityProfile)
+    stats_delete = db.query(CityCategoryStats)
+
+    if city_list is not None:
+        landmark_query = landmark_query.filter(Landmark.city.in_(city_list))
+        discussion_query = discussion_query.filter(Discussion.city.in_(city_list))
+        category_query = category_query.filter(Landmark.city.in_(city_list))
+        profile_query = profile_query.filter(CityProfile.city_name.in_(city_list))
+        stats_delete = stats_delete.filter(CityCategoryStats.city_name.in_(city_list))
+
+    landmark_stats = {city: row for city, *row in landmark_query.all()}
+    discussion_counts = dict(discussion_query.all())
+    profiles = {profile.city_name: profile for profile in profile_query.all()}
+
+    for city, (country, total_landmarks, total_reviews, rating_sum) in landmark_stats.items():
+        profile = profiles.get(city)
+        if profile is None:
+            profile = CityProfile(city_name=city, country=country)
+            db.add(profile)
+            profiles[city] = profile
+        profile.total_landmarks = total_landmarks
+        profile.total_reviews = int(total_reviews)
+        profile.rating_sum = float(rating_sum)
+        profile.average_rating = float(rating_sum) / total_reviews if total_reviews else 0.0
+
+    for city, profile in profiles.items():
+        if city not in landmark_stats:
+            # В городе больше нет достопримечательностей
+            profile.total_landmarks = 0
+            profile.total_reviews = 0
+            profile.rating_sum = 0.0
+            profile.average_rating = 0.0
+        profile.total_discussions = discussion_counts.get(city, 0)
+
+    if categories:
+        # Категории пересобираются целиком одной пачкой
+        stats_delete.delete(synchronize_session=False)
+        db.bulk_insert_mappings(CityCategoryStats, [
+            {"city_name": city, "category": category, "count": count}
+            for city, category, count in category_query.all()
+        ])
+    db.flush()
+    return len(profiles)
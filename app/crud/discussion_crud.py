@@ -1,47 +1,38 @@
-<<<<<<< Updated upstream
-from sqlalchemy.orm import Session, joinedload
-from sqlalchemy import or_, and_, desc, func
-from typing import List, Tuple, Optional
-from app.models.discussion import Discussion, DiscussionAnswer
-from app.schemas.discussion import DiscussionCreate, DiscussionUpdate, DiscussionAnswerCreate, DiscussionAnswerUpdate
-from app.services.notification_service import notification_service
-=======
-from typing import List, Optional, Dict
-from sqlalchemy.orm import Session
+from typing import Dict, List, Optional
+from sqlalchemy.orm import Session, selectinload
 from sqlalchemy import func, desc, or_
 from fastapi import HTTPException
->>>>>>> Stashed changes
+from app.services.notification_service import notification_service
 
 # Импортируем модели и схемы
+from sqlalchemy import select
 from app import models
+from app.core.full_text import (
+    HEADLINE_OPTIONS, full_text_enabled, full_text_match, headline, headline_html, plain_headline, prefix_tsquery,
+    search_vector
+)
+from app.core.pagination import count_pages, count_total, fetch_page, paginate_keyset
+from app.crud.city_crud import adjust_city_stats
 from app.schemas import discussion as schemas  # Импортируем схемы для обсуждений
 
 
 def get_discussion(db: Session, discussion_id: int):
-    """Получить обсуждение по ID"""
-    return db.query(models.Discussion).filter(models.Discussion.id == discussion_id).first()
+    """Получить обсуждение по ID (вместе с автором)"""
+    return db.query(models.Discussion).options(
+        selectinload(models.Discussion.user)
+    ).filter(models.Discussion.id == discussion_id).first()
 
-<<<<<<< Updated upstream
-def get_discussion(db: Session, discussion_id: int) -> Optional[Discussion]:
-    """
-    Получить обсуждение по ID
-    """
-    return db.query(Discussion).options(joinedload(Discussion.user)).filter(Discussion.id == discussion_id).first()
-=======
->>>>>>> Stashed changes
 
-def get_discussions(
+def _filtered_discussions_query(
     db: Session,
-    skip: int = 0,
-    limit: int = 50,
     landmark_id: Optional[int] = None,
     city: Optional[str] = None,
     user_id: Optional[int] = None,
     search: Optional[str] = None,
     only_open: bool = False
 ):
-    """Получить список обсуждений с фильтрами"""
-    query = db.query(models.Discussion)
+    """Запрос обсуждений с применёнными фильтрами (авторы подгружаются одним запросом)"""
+    query = db.query(models.Discussion).options(selectinload(models.Discussion.user))
     
     # Применяем фильтры
     if landmark_id:
@@ -54,23 +45,173 @@ def get_discussions(
         query = query.filter(models.Discussion.user_id == user_id)
     
     if search:
-        search_filter = or_(
-            models.Discussion.title.ilike(f"%{search}%"),
-            models.Discussion.content.ilike(f"%{search}%")
-        )
-        query = query.filter(search_filter)
+        query, _, _ = _apply_discussion_search(db, query, search)
     
     if only_open:
         query = query.filter(models.Discussion.is_closed == False)
     
-    # Считаем общее количество
-    total = query.count()
+    return query
+
+
+def _apply_discussion_search(db: Session, query, search: str, discussion_ids: Optional[List[int]] = None):
+    """
+    Оставить обсуждения, совпавшие с search в заголовке, тексте или хотя бы в одном ответе.
+    Ответы агрегируются по обсуждению в подзапросе (число совпавших ответов и лучшая
+    релевантность), поэтому каждое обсуждение попадает в выдачу один раз.
+
+    В PostgreSQL - полнотекстовый поиск по search_vector (GIN-индексы), релевантность -
+    ts_rank обсуждения плюс лучший ts_rank ответа. Иначе - ILIKE по подстроке без релевантности.
+    discussion_ids ограничивает агрегирование ответов (детали для страницы результатов).
+    Возвращает (запрос, число совпавших ответов, релевантность или None).
+    """
+    Discussion, Answer = models.Discussion, models.DiscussionAnswer
+    tsquery_text = prefix_tsquery(search) if full_text_enabled(db) else None
+    if tsquery_text is None:
+        discussion_condition = or_(
+            Discussion.title.ilike(f"%{search}%"),
+            Discussion.content.ilike(f"%{search}%")
+        )
+        answer_condition, answer_rank = Answer.content.ilike(f"%{search}%"), None
+    else:
+        discussion_condition, discussion_rank = full_text_match(search_vector(Discussion.__tablename__), tsquery_text)
+        answer_condition, answer_rank = full_text_match(search_vector(Answer.__tablename__), tsquery_text)
+
+    columns = [Answer.discussion_id, func.count(Answer.id).label("hits")]
+    if answer_rank is not None:
+        columns.append(func.max(answer_rank).label("rank"))
+    answers = select(*columns).where(answer_condition)
+    if discussion_ids is not None:
+        answers = answers.where(Answer.discussion_id.in_(discussion_ids))
+    answers = answers.group_by(Answer.discussion_id).subquery()
+
+    query = query.outerjoin(answers, answers.c.discussion_id == Discussion.id).filter(
+        or_(discussion_condition, answers.c.discussion_id.isnot(None))
+    )
+    rank = discussion_rank + func.coalesce(answers.c.rank, 0) if answer_rank is not None else None
+    return query, func.coalesce(answers.c.hits, 0), rank
+
+
+def search_discussions(
+    db: Session,
+    search: str,
+    skip: int = 0,
+    limit: int = 20,
+    landmark_id: Optional[int] = None,
+    city: Optional[str] = None,
+    only_open: bool = False,
+    total_mode: str = "exact"
+):
+    """
+    Поиск по обсуждениям и ответам: по убыванию релевантности (без PostgreSQL -
+    новые сначала). Для каждого обсуждения возвращаются число совпавших ответов,
+    релевантность и фрагменты заголовка, текста и лучшего ответа с выделенными совпадениями.
+    """
+    query = _filtered_discussions_query(db, landmark_id, city, None, None, only_open)
+    query, _, rank = _apply_discussion_search(db, query, search)
+    order = [desc(models.Discussion.created_at), desc(models.Discussion.id)]
+    if rank is not None:
+        order.insert(0, rank.desc())
+    discussions, total = fetch_page(query.order_by(*order), skip, limit, total_mode)
+
+    details = _search_details(db, search, [discussion.id for discussion in discussions])
+    items = [dict(details.get(discussion.id, {}), discussion=discussion) for discussion in discussions]
+    return {
+        "items": items,
+        "total": total,
+        "page": skip // limit if limit > 0 else 0,
+        "size": len(items),
+        "pages": count_pages(total, limit)
+    }
+
+
+def _search_details(db: Session, search: str, discussion_ids: List[int]) -> Dict[int, dict]:
+    """
+    Число совпавших ответов, релевантность и фрагменты для обсуждений страницы
+    (ts_headline считается только для них). Фрагменты - экранированный HTML
+    с выделением <b>...</b>
+    """
+    if not discussion_ids:
+        return {}
+    Discussion, Answer = models.Discussion, models.DiscussionAnswer
+    query = db.query(Discussion.id).filter(Discussion.id.in_(discussion_ids))
+    query, hits, rank = _apply_discussion_search(db, query, search, discussion_ids)
+    tsquery_text = prefix_tsquery(search) if rank is not None else None
+
+    if tsquery_text is None:
+        rows = query.add_columns(hits, Discussion.title, Discussion.content).all()
+        details = {
+            discussion_id: {
+                "answer_hits": answer_hits,
+                "rank": None,
+                "title_highlight": plain_headline(title, search, max_words=len(title.split())),
+                "snippet": plain_headline(content, search),
+                "answer_snippet": None
+            }
+            for discussion_id, answer_hits, title, content in rows
+        }
+        answers = (
+            db.query(Answer.discussion_id, Answer.content)
+            .filter(Answer.discussion_id.in_(discussion_ids), Answer.content.ilike(f"%{search}%"))
+            .order_by(Answer.discussion_id, desc(Answer.helpful_votes), Answer.id)
+            .all()
+        )
+        for discussion_id, content in answers:
+            if details[discussion_id]["answer_snippet"] is None:
+                details[discussion_id]["answer_snippet"] = plain_headline(content, search)
+        return details
+
+    rows = query.add_columns(
+        hits,
+        rank,
+        headline(Discussion.title, tsquery_text, f"{HEADLINE_OPTIONS}, HighlightAll=true"),
+        headline(Discussion.content, tsquery_text)
+    ).all()
+    details = {
+        discussion_id: {
+            "answer_hits": answer_hits,
+            "rank": relevance,
+            "title_highlight": headline_html(title),
+            "snippet": headline_html(snippet),
+            "answer_snippet": None
+        }
+        for discussion_id, answer_hits, relevance, title, snippet in rows
+    }
+
+    # Лучший ответ каждого обсуждения (DISTINCT ON), фрагмент - только для него
+    answer_condition, answer_rank = full_text_match(search_vector(Answer.__tablename__), tsquery_text)
+    best = (
+        select(Answer.id)
+        .where(Answer.discussion_id.in_(discussion_ids), answer_condition)
+        .distinct(Answer.discussion_id)
+        .order_by(Answer.discussion_id, answer_rank.desc(), Answer.id)
+    )
+    answers = db.query(Answer.discussion_id, headline(Answer.content, tsquery_text)).filter(Answer.id.in_(best)).all()
+    for discussion_id, snippet in answers:
+        details[discussion_id]["answer_snippet"] = headline_html(snippet)
+    return details
+
+
+def get_discussions(
+    db: Session,
+    skip: int = 0,
+    limit: int = 50,
+    landmark_id: Optional[int] = None,
+    city: Optional[str] = None,
+    user_id: Optional[int] = None,
+    search: Optional[str] = None,
+    only_open: bool = False,
+    total_mode: str = "exact"
+):
+    """Получить список обсуждений с фильтрами"""
+    query = _filtered_discussions_query(db, landmark_id, city, user_id, search, only_open)
     
-    # Применяем пагинацию и сортировку
-    discussions = query.order_by(desc(models.Discussion.created_at)).offset(skip).limit(limit).all()
+    # Применяем пагинацию и сортировку, общее количество - в том же запросе
+    discussions, total = fetch_page(
+        query.order_by(desc(models.Discussion.created_at)), skip, limit, total_mode
+    )
     
     # Вычисляем количество страниц
-    pages = (total + limit - 1) // limit if limit > 0 else 0
+    pages = count_pages(total, limit)
     page = skip // limit if limit > 0 else 0
     
     return {
@@ -82,6 +223,37 @@ def get_discussions(
     }
 
 
+def get_discussions_by_cursor(
+    db: Session,
+    cursor: Optional[str] = None,
+    limit: int = 50,
+    landmark_id: Optional[int] = None,
+    city: Optional[str] = None,
+    user_id: Optional[int] = None,
+    search: Optional[str] = None,
+    only_open: bool = False,
+    total_mode: str = "exact"
+):
+    """Получить страницу обсуждений по курсору (новые сначала)"""
+    query = _filtered_discussions_query(db, landmark_id, city, user_id, search, only_open)
+    total = count_total(query, total_mode)
+    
+    discussions, next_cursor = paginate_keyset(
+        query,
+        [(models.Discussion.created_at, True), (models.Discussion.id, True)],
+        cursor,
+        limit
+    )
+    
+    return {
+        "items": discussions,
+        "total": total,
+        "size": len(discussions),
+        "pages": count_pages(total, limit),
+        "next_cursor": next_cursor
+    }
+
+
 def create_discussion(db: Session, discussion: schemas.DiscussionCreate, user_id: int):
     """Создать новое обсуждение"""
     db_discussion = models.Discussion(
@@ -89,6 +261,7 @@ def create_discussion(db: Session, discussion: schemas.DiscussionCreate, user_id
         user_id=user_id
     )
     db.add(db_discussion)
+    adjust_city_stats(db, db_discussion.city, discussions=1)
     db.commit()
     db.refresh(db_discussion)
     return db_discussion
@@ -123,6 +296,7 @@ def delete_discussion(db: Session, discussion_id: int, user_id: int):
     if not discussion:
         return False
     
+    adjust_city_stats(db, discussion.city, discussions=-1)
     db.delete(discussion)
     db.commit()
     return True
@@ -136,66 +310,76 @@ def get_discussion_answers(
     sort_by_helpful: bool = False
 ):
     """Получить ответы на обсуждение"""
-    query = db.query(models.DiscussionAnswer).filter(
+    query = db.query(models.DiscussionAnswer).options(
+        selectinload(models.DiscussionAnswer.user)
+    ).filter(
         models.DiscussionAnswer.discussion_id == discussion_id
     )
     
     # Применяем сортировку
     if sort_by_helpful:
-        query = query.order_by(desc(models.DiscussionAnswer.helpful_votes))
+        query = query.order_by(desc(models.DiscussionAnswer.helpful_votes), models.DiscussionAnswer.id)
     else:
-        query = query.order_by(desc(models.DiscussionAnswer.created_at))
+        query = query.order_by(desc(models.DiscussionAnswer.created_at), models.DiscussionAnswer.id)
     
-    total = query.count()
-    answers = query.offset(skip).limit(limit).all()
+    answers, total = fetch_page(query, skip, limit)
     
     return {
         "items": answers,
         "total": total
     }
 
-<<<<<<< Updated upstream
+
+def get_answers_by_discussion(
+    db: Session,
+    discussion_id: int,
+    skip: int = 0,
+    limit: int = 50,
+    sort_by_helpful: bool = False
+):
+    """Получить ответы на обсуждение в виде (ответы, общее количество)"""
+    result = get_discussion_answers(db, discussion_id, skip, limit, sort_by_helpful)
+    return result["items"], result["total"]
+
+
+def _adjust_answer_count(db: Session, discussion_id: int, delta: int) -> None:
+    """Атомарно изменить денормализованный счетчик ответов обсуждения"""
+    db.query(models.Discussion).filter(
+        models.Discussion.id == discussion_id
+    ).update(
+        {models.Discussion.answer_count: models.Discussion.answer_count + delta},
+        synchronize_session=False
+    )
+
+
 def create_answer(
     db: Session,
-    answer: DiscussionAnswerCreate,
+    answer: schemas.DiscussionAnswerCreate,
     discussion_id: int,
     user_id: int
-) -> DiscussionAnswer:
+):
     """
     Создать ответ на обсуждение
     """
     # Сначала получаем обсуждение с автором
-    discussion = db.query(Discussion).options(
-        joinedload(Discussion.user)
-    ).filter(Discussion.id == discussion_id).first()
+    discussion = db.query(models.Discussion).options(
+        selectinload(models.Discussion.user)
+    ).filter(models.Discussion.id == discussion_id).first()
     
     if not discussion:
         raise ValueError("Обсуждение не найдено")
     
     # Создаем ответ
-    db_answer = DiscussionAnswer(
-=======
-
-def create_answer(db: Session, answer: schemas.AnswerCreate, user_id: int):
-    """Создать ответ на обсуждение"""
-    # Проверяем, существует ли обсуждение
-    discussion = db.query(models.Discussion).filter(
-        models.Discussion.id == answer.discussion_id
-    ).first()
-    
-    if not discussion:
-        raise HTTPException(status_code=404, detail="Обсуждение не найдено")
-    
     db_answer = models.DiscussionAnswer(
->>>>>>> Stashed changes
         **answer.dict(),
+        discussion_id=discussion_id,
         user_id=user_id
     )
     db.add(db_answer)
+    _adjust_answer_count(db, discussion.id, 1)
     db.commit()
     db.refresh(db_answer)
     
-<<<<<<< Updated upstream
     # Создаем уведомление для автора обсуждения (если это не он сам отвечает)
     if discussion.user_id != user_id:
         try:
@@ -216,28 +400,6 @@ def create_answer(db: Session, answer: schemas.AnswerCreate, user_id: int):
         except Exception as e:
             print(f"❌ Ошибка при создании уведомления: {e}")
             # Не прерываем выполнение, если уведомление не создалось
-=======
-    # Обновляем счетчик ответов в обсуждении
-    discussion.answer_count = db.query(func.count()).filter(
-        models.DiscussionAnswer.discussion_id == discussion.id
-    ).scalar()
-    db.commit()
-    
-    # Создаем уведомление автору обсуждения (если это не сам автор)
-    if user_id != discussion.user_id:
-        try:
-            from app.crud.notification_crud import create_answer_notification
-            create_answer_notification(
-                db=db,
-                answer_user_id=user_id,
-                discussion_author_id=discussion.user_id,
-                answer_id=db_answer.id,
-                discussion_title=discussion.title
-            )
-        except ImportError:
-            # Если модуль уведомлений еще не реализован, просто игнорируем
-            pass
->>>>>>> Stashed changes
     
     return db_answer
 
@@ -271,18 +433,11 @@ def delete_answer(db: Session, answer_id: int, user_id: int):
     if not answer:
         return False
     
-    # Обновляем счетчик ответов в обсуждении
-    discussion = answer.discussion
+    # Обновляем счетчик ответов в обсуждении в той же транзакции
+    _adjust_answer_count(db, answer.discussion_id, -1)
     db.delete(answer)
     db.commit()
     
-    # Обновляем счетчик
-    if discussion:
-        discussion.answer_count = db.query(func.count()).filter(
-            models.DiscussionAnswer.discussion_id == discussion.id
-        ).scalar()
-        db.commit()
-    
     return True
 
 
@@ -336,6 +491,18 @@ def vote_for_answer(db: Session, answer_id: int, vote: schemas.VoteCreate, user_
     
     return answer
 
+
+def vote_helpful(db: Session, answer_id: int, user_id: int, is_helpful: bool) -> bool:
+    """Голосовать за полезность ответа. False - ответ не найден"""
+    exists = db.query(models.DiscussionAnswer.id).filter(
+        models.DiscussionAnswer.id == answer_id
+    ).first()
+    if not exists:
+        return False
+    vote_for_answer(db, answer_id, schemas.VoteCreate(is_helpful=is_helpful), user_id)
+    return True
+
+
 def get_discussion_stats(db: Session, user_id: int) -> dict:
     """
     Получить статистику пользователя по обсуждениям и ответам
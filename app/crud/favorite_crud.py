@@ -1,5 +1,7 @@
 from sqlalchemy.orm import Session, joinedload
-from typing import List, Tuple
+from typing import List, Optional, Tuple
+from app.core.autocomplete import autocomplete_index
+from app.core.pagination import fetch_page
 from app.models.favorite import Favorite
 from app.models.landmark import Landmark
 from app.schemas.favorite import FavoriteCreate
@@ -19,19 +21,18 @@ def get_user_favorites(
     db: Session, 
     user_id: int, 
     skip: int = 0, 
-    limit: int = 100
-) -> Tuple[List[Favorite], int]:
+    limit: int = 100,
+    total_mode: str = "exact"
+) -> Tuple[List[Favorite], Optional[int]]:
     """
     Получить список избранных достопримечательностей пользователя
     """
     query = db.query(Favorite).filter(Favorite.user_id == user_id)
-    total = query.count()
     
     # Исправлено: добавляем joinedload для загрузки связанных данных
-    favorites = query.options(joinedload(Favorite.landmark))\
-                    .offset(skip)\
-                    .limit(limit)\
-                    .all()
+    favorites, total = fetch_page(
+        query.options(joinedload(Favorite.landmark)), skip, limit, total_mode
+    )
     
     return favorites, total
 
@@ -49,6 +50,7 @@ def create_favorite(db: Session, favorite: FavoriteCreate, user_id: int) -> Favo
     db.add(db_favorite)
     db.commit()
     db.refresh(db_favorite)
+    autocomplete_index.adjust_popularity(favorite.landmark_id, favorites=1)
     return db_favorite
 
 
@@ -62,6 +64,7 @@ def delete_favorite(db: Session, user_id: int, landmark_id: int) -> bool:
 
     db.delete(db_favorite)
     db.commit()
+    autocomplete_index.adjust_popularity(landmark_id, favorites=-1)
     return True
 
 
@@ -1,8 +1,26 @@
 from sqlalchemy.orm import Session
-from sqlalchemy import or_, and_
-from typing import Optional, List, Tuple
-from app.models.landmark import Landmark
-from app.schemas.landmark import LandmarkCreate, LandmarkUpdate
+from sqlalchemy import or_, and_, case, func, literal, select
+from typing import Dict, Optional, List, Tuple
+from app.core.autocomplete import Suggestion, autocomplete_index
+from app.core.config import settings
+from app.core.filter_keys import filter_key
+from app.core.full_text import full_text_enabled, full_text_match, prefix_tsquery, search_vector
+from app.core.geo_engine import landmark_coordinates
+from app.core.ngram_index import city_name_index, landmark_name_index
+from app.core.pagination import count_total, fetch_page, paginate_keyset
+from app.core.spatial_index import EARTH_RADIUS_KM, bounding_box, haversine_km, landmark_index
+from app.crud.city_crud import (
+    apply_landmark_stats_change,
+    apply_landmark_stats_changes,
+    landmark_stats_snapshot,
+    remove_discussions_from_stats
+)
+from app.crud.sync_crud import record_deleted, record_deleted_reviews
+from app.models.discussion import Discussion
+from app.models.favorite import Favorite
+from app.models.landmark import FILTER_KEY_COLUMNS, Landmark
+from app.models.review import Review
+from app.schemas.landmark import LandmarkCreate, LandmarkUpdate, LandmarkWithDistance, LandmarkWithSimilarity
 
 
 def get_landmark(db: Session, landmark_id: int) -> Optional[Landmark]:
@@ -12,52 +30,213 @@ def get_landmark(db: Session, landmark_id: int) -> Optional[Landmark]:
     return db.query(Landmark).filter(Landmark.id == landmark_id).first()
 
 
-def get_landmarks(
+def _filtered_landmarks_query(
     db: Session,
-    skip: int = 0,
-    limit: int = 100,
     city: Optional[str] = None,
     country: Optional[str] = None,
     category: Optional[str] = None,
-    search: Optional[str] = None
-) -> Tuple[List[Landmark], int]:
+    search: Optional[str] = None,
+    match: str = "exact"
+):
     """
-    Получить список достопримечательностей с фильтрацией и пагинацией
+    Запрос достопримечательностей с применёнными фильтрами.
+    match: exact - равенство нормализованных ключей (без регистра и диакритики,
+    по индексам), contains - подстрока в значении (ILIKE, полный просмотр)
     """
     query = db.query(Landmark)
 
     # Применяем фильтры
-    if city:
-        query = query.filter(Landmark.city.ilike(f"%{city}%"))
-    if country:
-        query = query.filter(Landmark.country.ilike(f"%{country}%"))
-    if category:
-        query = query.filter(Landmark.category.ilike(f"%{category}%"))
+    for column, value in (("city", city), ("country", country), ("category", category)):
+        if not value:
+            continue
+        if match == "contains":
+            query = query.filter(getattr(Landmark, column).ilike(f"%{value}%"))
+        else:
+            query = query.filter(getattr(Landmark, FILTER_KEY_COLUMNS[column]) == filter_key(value))
     if search:
-        search_filter = or_(
+        condition, _ = landmark_search(db, search)
+        query = query.filter(condition)
+
+    return query
+
+
+def landmark_search(db: Session, search: str):
+    """
+    Условие поиска по названию, описанию и городу и выражение релевантности.
+    В PostgreSQL - полнотекстовый поиск по search_vector (GIN-индекс, ts_rank),
+    иначе (SQLite, выключенный FULL_TEXT_SEARCH_ENABLED, строка без слов) -
+    ILIKE по подстроке, релевантность None.
+    """
+    tsquery_text = prefix_tsquery(search) if full_text_enabled(db) else None
+    if tsquery_text is None:
+        condition = or_(
             Landmark.name.ilike(f"%{search}%"),
             Landmark.description.ilike(f"%{search}%"),
             Landmark.city.ilike(f"%{search}%")
         )
-        query = query.filter(search_filter)
+        return condition, None
+    return full_text_match(search_vector(Landmark.__tablename__), tsquery_text)
+
+
+def fuzzy_search_mode(db: Session) -> str:
+    """Режим нечеткого поиска: trgm (pg_trgm) или index (n-граммный индекс в памяти)"""
+    if settings.FUZZY_SEARCH_MODE == "auto":
+        return "trgm" if db.get_bind().dialect.name == "postgresql" else "index"
+    return settings.FUZZY_SEARCH_MODE
+
+
+def _set_trgm_threshold(db: Session) -> None:
+    # Порог оператора <% действует до конца транзакции
+    db.execute(select(func.set_config(
+        "pg_trgm.word_similarity_threshold", str(settings.FUZZY_SIMILARITY_THRESHOLD), True
+    )))
+
+
+def build_landmark_text_index(db: Session) -> int:
+    """
+    Построить n-граммные индексы названий и городов для нечеткого поиска без pg_trgm.
+    Из БД читаются только id, названия и города.
+    """
+    rows = db.query(Landmark.id, Landmark.name, Landmark.city).yield_per(10000)
+    entries = [(landmark_id, (name, city)) for landmark_id, name, city in rows]
+    landmark_name_index.build(entries)
+    city_name_index.build((city, (city,)) for city in {city for _, (_, city) in entries})
+    return len(landmark_name_index)
+
+
+def get_landmarks_fuzzy(
+    db: Session,
+    search: str,
+    limit: int = 20,
+    city: Optional[str] = None,
+    country: Optional[str] = None,
+    category: Optional[str] = None,
+    match: str = "exact"
+) -> List[LandmarkWithSimilarity]:
+    """
+    limit достопримечательностей, самых похожих на search по названию или городу
+    (устойчиво к опечаткам), по убыванию сходства. Фильтры - как в get_landmarks.
+    """
+    query = _filtered_landmarks_query(db, city, country, category, match=match)
+    if fuzzy_search_mode(db) == "trgm":
+        # Один запрос по триграммным GIN-индексам
+        _set_trgm_threshold(db)
+        term = literal(search)
+        score = func.greatest(func.word_similarity(term, Landmark.name), func.word_similarity(term, Landmark.city))
+        hits = (
+            query.filter(or_(term.op("<%")(Landmark.name), term.op("<%")(Landmark.city)))
+            .add_columns(score.label("similarity"))
+            .order_by(score.desc(), Landmark.id)
+            .limit(limit)
+            .all()
+        )
+    else:
+        if not landmark_name_index.is_built:
+            build_landmark_text_index(db)
+        # Фильтры запроса применяются после индекса - кандидатов берем с запасом
+        candidates = landmark_name_index.search(search, limit * 5, settings.FUZZY_SIMILARITY_THRESHOLD)
+        ids = [landmark_id for landmark_id, _ in candidates]
+        by_id = {landmark.id: landmark for landmark in query.filter(Landmark.id.in_(ids)).all()} if ids else {}
+        hits = [(by_id[landmark_id], score) for landmark_id, score in candidates if landmark_id in by_id][:limit]
+
+    result = []
+    for landmark, score in hits:
+        item = LandmarkWithSimilarity.model_validate(landmark)
+        item.similarity = round(score, 4)
+        result.append(item)
+    return result
+
+
+def find_cities_fuzzy(db: Session, search: str, limit: int = 10) -> List[Tuple[str, float]]:
+    """
+    Города, похожие на search (с опечатками), по убыванию сходства: список (город, сходство)
+    """
+    if fuzzy_search_mode(db) == "trgm":
+        _set_trgm_threshold(db)
+        term = literal(search)
+        score = func.max(func.word_similarity(term, Landmark.city))
+        rows = (
+            db.query(Landmark.city, score)
+            .filter(term.op("<%")(Landmark.city))
+            .group_by(Landmark.city)
+            .order_by(score.desc(), Landmark.city)
+            .limit(limit)
+            .all()
+        )
+        return [(city, round(similarity, 4)) for city, similarity in rows]
 
-    # Получаем общее количество для пагинации
-    total = query.count()
+    if not city_name_index.is_built:
+        build_landmark_text_index(db)
+    return [
+        (city, round(similarity, 4))
+        for city, similarity in city_name_index.search(search, limit, settings.FUZZY_SIMILARITY_THRESHOLD)
+    ]
 
-    # Применяем пагинацию
-    landmarks = query.offset(skip).limit(limit).all()
+
+def get_landmarks(
+    db: Session,
+    skip: int = 0,
+    limit: int = 100,
+    city: Optional[str] = None,
+    country: Optional[str] = None,
+    category: Optional[str] = None,
+    search: Optional[str] = None,
+    total_mode: str = "exact",
+    match: str = "exact"
+) -> Tuple[List[Landmark], Optional[int]]:
+    """
+    Получить список достопримечательностей с фильтрацией и пагинацией.
+    total_mode: exact (count(*) OVER () в том же запросе), estimate или none;
+    match - режим фильтров city, country и category (см. _filtered_landmarks_query)
+    """
+    query = _filtered_landmarks_query(db, city, country, category, match=match)
+    if search:
+        # Условие и релевантность из одного выражения поиска, самые релевантные сначала
+        condition, rank = landmark_search(db, search)
+        query = query.filter(condition)
+        if rank is not None:
+            query = query.order_by(rank.desc(), Landmark.id)
+
+    # Страница и общее количество за один запрос
+    landmarks, total = fetch_page(query, skip, limit, total_mode)
 
     return landmarks, total
 
 
+def get_landmarks_by_cursor(
+    db: Session,
+    cursor: Optional[str] = None,
+    limit: int = 100,
+    city: Optional[str] = None,
+    country: Optional[str] = None,
+    category: Optional[str] = None,
+    search: Optional[str] = None,
+    total_mode: str = "exact",
+    match: str = "exact"
+) -> Tuple[List[Landmark], Optional[int], Optional[str]]:
+    """
+    Получить страницу достопримечательностей по курсору (сортировка по названию и id).
+    Время ответа не зависит от глубины страницы.
+    """
+    query = _filtered_landmarks_query(db, city, country, category, search, match)
+    total = count_total(query, total_mode)
+    landmarks, next_cursor = paginate_keyset(
+        query, [(Landmark.name, False), (Landmark.id, False)], cursor, limit
+    )
+    return landmarks, total, next_cursor
+
+
 def create_landmark(db: Session, landmark: LandmarkCreate) -> Landmark:
     """
     Создать новую достопримечательность
     """
     db_landmark = Landmark(**landmark.dict())
     db.add(db_landmark)
+    db.flush()
+    apply_landmark_stats_change(db, None, landmark_stats_snapshot(db_landmark))
     db.commit()
     db.refresh(db_landmark)
+    _sync_landmark_index(db_landmark)
     return db_landmark
 
 
@@ -73,13 +252,17 @@ def update_landmark(
     if not db_landmark:
         return None
 
+    before = landmark_stats_snapshot(db_landmark)
+
     # Обновляем только переданные поля
     update_data = landmark.dict(exclude_unset=True)
     for field, value in update_data.items():
         setattr(db_landmark, field, value)
 
+    apply_landmark_stats_change(db, before, landmark_stats_snapshot(db_landmark))
     db.commit()
     db.refresh(db_landmark)
+    _sync_landmark_index(db_landmark)
     return db_landmark
 
 def delete_landmark(db: Session, landmark_id: int) -> bool:
@@ -90,11 +273,98 @@ def delete_landmark(db: Session, landmark_id: int) -> bool:
     if not db_landmark:
         return False
 
+    # Отзывы и обсуждения удаляются каскадно вместе с достопримечательностью
+    apply_landmark_stats_change(db, landmark_stats_snapshot(db_landmark), None)
+    remove_discussions_from_stats(db, Discussion.landmark_id == landmark_id)
+    record_deleted_reviews(db, Review.landmark_id == landmark_id)
+    record_deleted(db, "landmark", landmark_id)
     db.delete(db_landmark)
     db.commit()
+    _remove_from_landmark_index(landmark_id)
     return True
 
 
+# Поля, которые массовый импорт записывает в landmarks
+IMPORT_COLUMNS = (
+    "name", "description", "city", "country", "category",
+    "latitude", "longitude", "address", "image_url", "external_id"
+)
+
+
+def _dialect_insert(db: Session):
+    """
+    INSERT с поддержкой ON CONFLICT для текущей СУБД
+    """
+    dialect = db.get_bind().dialect.name
+    if dialect == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+    elif dialect == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert
+    else:
+        raise NotImplementedError(f"Массовый импорт не поддерживается для {dialect}")
+    return insert
+
+
+def bulk_upsert_landmarks(db: Session, landmarks: List[LandmarkCreate]) -> Tuple[int, int]:
+    """
+    Записать пачку достопримечательностей одним INSERT ... ON CONFLICT по external_id
+    (строки без external_id только вставляются). Статистика городов и категорий
+    обновляется один раз на пачку. Возвращает (вставлено, обновлено).
+    """
+    keyed: Dict[str, Dict] = {}
+    plain: List[Dict] = []
+    for landmark in landmarks:
+        data = landmark.dict(include=set(IMPORT_COLUMNS))
+        # Core INSERT минует валидаторы модели - ключи фильтров заполняем сами
+        data.update({key_column: filter_key(data[column]) for column, key_column in FILTER_KEY_COLUMNS.items()})
+        if data["external_id"]:
+            # Повтор ключа внутри пачки: побеждает последняя строка
+            keyed[data["external_id"]] = data
+        else:
+            plain.append(data)
+
+    existing: Dict[str, Dict] = {}
+    if keyed:
+        rows = db.query(
+            Landmark.external_id, Landmark.city, Landmark.category,
+            Landmark.review_count, Landmark.rating_sum
+        ).filter(Landmark.external_id.in_(list(keyed))).all()
+        existing = {row.external_id: landmark_stats_snapshot(row) for row in rows}
+
+    insert = _dialect_insert(db)
+    returning = (
+        Landmark.id, Landmark.latitude, Landmark.longitude, Landmark.name, Landmark.city,
+        Landmark.category, Landmark.review_count
+    )
+    written = []
+    if keyed:
+        stmt = insert(Landmark).values(list(keyed.values()))
+        updates = {
+            column: stmt.excluded[column]
+            for column in (*IMPORT_COLUMNS, *FILTER_KEY_COLUMNS.values()) if column != "external_id"
+        }
+        updates["updated_at"] = func.now()
+        stmt = stmt.on_conflict_do_update(index_elements=[Landmark.external_id], set_=updates)
+        written.extend(db.execute(stmt.returning(*returning)).all())
+    if plain:
+        written.extend(db.execute(insert(Landmark).values(plain).returning(*returning)).all())
+
+    # Отзывы при обновлении сохраняются, меняются только город и категория
+    changes = []
+    for external_id, data in keyed.items():
+        before = existing.get(external_id)
+        after = dict(before or {"review_count": 0, "rating_sum": 0.0}, city=data["city"], category=data["category"])
+        changes.append((before, after))
+    for data in plain:
+        changes.append((None, {"city": data["city"], "category": data["category"], "review_count": 0, "rating_sum": 0.0}))
+    apply_landmark_stats_changes(db, changes)
+    db.commit()
+
+    for row in written:
+        _sync_landmark_index(row)
+    return len(keyed) - len(existing) + len(plain), len(existing)
+
+
 def get_cities(db: Session) -> List[str]:
     """
     Получить список уникальных городов
@@ -111,27 +381,232 @@ def get_categories(db: Session) -> List[str]:
     return [category[0] for category in categories]
 
 
+def build_landmark_index(db: Session) -> int:
+    """
+    Построить пространственный индекс по всем достопримечательностям.
+    Из БД читаются только id и координаты.
+    """
+    rows = db.query(Landmark.id, Landmark.latitude, Landmark.longitude).yield_per(10000)
+    points = [(landmark_id, latitude, longitude) for landmark_id, latitude, longitude in rows]
+    landmark_index.build(points)
+    if landmark_coordinates is not None:
+        landmark_coordinates.build(points)
+    return len(landmark_index)
+
+
+def build_autocomplete_index(db: Session) -> int:
+    """
+    Построить префиксный индекс подсказок. Из БД читаются названия, города, категории,
+    число отзывов и число добавлений в избранное (одним запросом с агрегатом).
+    """
+    favorites = (
+        db.query(Favorite.landmark_id, func.count(Favorite.id).label("favorites"))
+        .group_by(Favorite.landmark_id)
+        .subquery()
+    )
+    rows = (
+        db.query(
+            Landmark.id, Landmark.name, Landmark.city, Landmark.category,
+            Landmark.review_count, func.coalesce(favorites.c.favorites, 0)
+        )
+        .outerjoin(favorites, favorites.c.landmark_id == Landmark.id)
+        .yield_per(10000)
+    )
+    autocomplete_index.build(tuple(row) for row in rows)
+    return len(autocomplete_index)
+
+
+def autocomplete(db: Session, prefix: str, limit: int = 10) -> List[Suggestion]:
+    """
+    Подсказки по началу слова среди названий, городов и категорий, по популярности.
+    БД используется только для построения индекса, если он еще не построен.
+    """
+    if not autocomplete_index.is_built:
+        build_autocomplete_index(db)
+    return autocomplete_index.suggest(prefix, limit)
+
+
+def _sync_landmark_index(db_landmark: Landmark) -> None:
+    """
+    Обновить координаты достопримечательности в пространственном индексе,
+    название с городом в n-граммных индексах и подсказки автодополнения
+    """
+    if landmark_index.is_built:
+        landmark_index.insert(db_landmark.id, db_landmark.latitude, db_landmark.longitude)
+    if landmark_coordinates is not None and landmark_coordinates.is_built:
+        landmark_coordinates.upsert(db_landmark.id, db_landmark.latitude, db_landmark.longitude)
+    if landmark_name_index.is_built:
+        landmark_name_index.upsert(db_landmark.id, (db_landmark.name, db_landmark.city))
+    if city_name_index.is_built:
+        city_name_index.upsert(db_landmark.city, (db_landmark.city,))
+    if autocomplete_index.is_built:
+        autocomplete_index.upsert_landmark(
+            db_landmark.id, db_landmark.name, db_landmark.city, db_landmark.category, db_landmark.review_count
+        )
+
+
+def _remove_from_landmark_index(landmark_id: int) -> None:
+    """
+    Удалить достопримечательность из пространственного индекса, хранилища координат,
+    n-граммного индекса названий и подсказок автодополнения
+    """
+    landmark_index.remove(landmark_id)
+    if landmark_coordinates is not None:
+        landmark_coordinates.remove(landmark_id)
+    landmark_name_index.remove(landmark_id)
+    autocomplete_index.remove_landmark(landmark_id)
+
+
+def _hydrate_with_distance(db: Session, hits: List[Tuple[int, float]]) -> List[Landmark]:
+    """
+    Загрузить из БД только найденные достопримечательности, сохранив порядок по расстоянию
+    """
+    return _hydrate_batch_with_distance(db, [hits])[0]
+
+
+def _hydrate_batch_with_distance(
+    db: Session,
+    batches: List[List[Tuple[int, float]]]
+) -> List[List[Landmark]]:
+    """
+    Загрузить достопримечательности для нескольких результатов поиска одним запросом.
+    Расстояние проставляется в копии объекта, так как одна запись может попасть
+    в выдачу разных исходных точек.
+    """
+    all_ids = {landmark_id for hits in batches for landmark_id, _ in hits}
+    if not all_ids:
+        return [[] for _ in batches]
+
+    landmarks = db.query(Landmark).filter(Landmark.id.in_(all_ids)).all()
+    by_id = {landmark.id: landmark for landmark in landmarks}
+    for landmark_id in all_ids - by_id.keys():
+        # Запись удалена другим процессом - убираем ее из индекса
+        _remove_from_landmark_index(landmark_id)
+
+    results = []
+    for hits in batches:
+        result = []
+        for landmark_id, distance in hits:
+            landmark = by_id.get(landmark_id)
+            if landmark is None:
+                continue
+            if len(batches) > 1:
+                landmark = LandmarkWithDistance.model_validate(landmark)
+            landmark.distance = round(distance, 3)  # type: ignore
+            result.append(landmark)
+        results.append(result)
+    return results
+
+
+def get_nearest_landmarks(
+    db: Session,
+    latitude: float,
+    longitude: float,
+    k: int = 10,
+    max_radius_km: Optional[float] = None
+) -> List[Landmark]:
+    """
+    Получить k ближайших достопримечательностей к указанным координатам
+    """
+    if not (settings.SPATIAL_INDEX_ENABLED and landmark_index.is_built):
+        radius_km = max_radius_km if max_radius_km is not None else 20037.5
+        return get_landmarks_near_location(db, latitude, longitude, radius_km=radius_km, limit=k)
+
+    hits = landmark_index.query_nearest(latitude, longitude, k, max_radius_km=max_radius_km)
+    return _hydrate_with_distance(db, hits)
+
+
+def _great_circle_distance(latitude: float, longitude: float):
+    """
+    SQL-выражение расстояния по формуле гаверсинуса (в км) от точки до Landmark
+    """
+    d_lat = func.radians(Landmark.latitude - latitude)
+    d_lon = func.radians(Landmark.longitude - longitude)
+    a = (
+        func.power(func.sin(d_lat / 2.0), 2)
+        + func.cos(func.radians(latitude))
+        * func.cos(func.radians(Landmark.latitude))
+        * func.power(func.sin(d_lon / 2.0), 2)
+    )
+    # min(1, a) через CASE: LEAST нет в SQLite
+    return 2 * EARTH_RADIUS_KM * func.asin(func.sqrt(case((a > 1.0, 1.0), else_=a)))
+
+
+def _get_landmarks_near_location_sql(
+    db: Session,
+    latitude: float,
+    longitude: float,
+    radius_km: float,
+    limit: int
+) -> List[Landmark]:
+    """
+    Поиск поблизости средствами БД: отбор по ограничивающему прямоугольнику
+    (индекс idx_landmark_lat_lon), точное расстояние и сортировка в SQL
+    """
+    min_lat, max_lat, min_lon, max_lon = bounding_box(latitude, longitude, radius_km)
+    distance = _great_circle_distance(latitude, longitude)
+
+    query = db.query(Landmark, distance.label("distance")).filter(
+        Landmark.latitude.between(min_lat, max_lat)
+    )
+    if min_lon is not None and max_lon is not None:
+        if min_lon <= max_lon:
+            query = query.filter(Landmark.longitude.between(min_lon, max_lon))
+        else:
+            # Прямоугольник пересекает линию смены дат
+            query = query.filter(or_(Landmark.longitude >= min_lon, Landmark.longitude <= max_lon))
+
+    rows = query.filter(distance <= radius_km).order_by(distance).limit(limit).all()
+
+    nearby_landmarks = []
+    for landmark, landmark_distance in rows:
+        landmark.distance = round(float(landmark_distance), 3)  # type: ignore
+        nearby_landmarks.append(landmark)
+    return nearby_landmarks
+
+
 def get_landmarks_near_location(
     db: Session,
     latitude: float,
     longitude: float,
     radius_km: float = 10,
-    limit: int = 50
+    limit: int = 50,
+    mode: Optional[str] = None
 ) -> List[Landmark]:
     """
-    Получить достопримечательности в радиусе от указанных координат
-    (Упрощенная версия - в продакшене лучше использовать PostGIS)
+    Получить достопримечательности в радиусе от указанных координат.
+
+    Режимы (по умолчанию settings.NEARBY_SEARCH_MODE):
+    - index: пространственный индекс в памяти, из БД загружаются только limit строк;
+      при большом радиусе кандидаты считаются векторизованно (numpy)
+    - vector: векторизованный расчет по колоночному хранилищу координат
+    - sql: ограничивающий прямоугольник и гаверсинус на стороне БД
+    - scan: полный просмотр таблицы (для отладки)
     """
-    # Простая формула гаверсинуса для расчета расстояния
-    landmarks = db.query(Landmark).all()
+    mode = mode or settings.NEARBY_SEARCH_MODE
+    vector_ready = landmark_coordinates is not None and landmark_coordinates.is_built
 
-    def calculate_distance(lat1, lon1, lat2, lon2):
-        # Упрощенный расчет расстояния
-        return ((lat1 - lat2) ** 2 + (lon1 - lon2) ** 2) ** 0.5 * 111  # примерно км
+    # Большой радиус дает тысячи кандидатов - их дешевле обработать numpy, чем циклом
+    if mode == "index" and vector_ready and radius_km >= settings.GEO_VECTOR_MIN_RADIUS_KM:
+        mode = "vector"
+
+    if mode == "vector" and vector_ready:
+        hits = landmark_coordinates.query_radius(latitude, longitude, radius_km, limit=limit)
+        return _hydrate_with_distance(db, hits)
+
+    # Если пространственный индекс построен, БД нужна только для загрузки limit строк
+    if mode in ("index", "vector") and settings.SPATIAL_INDEX_ENABLED and landmark_index.is_built:
+        hits = landmark_index.query_radius(latitude, longitude, radius_km, limit=limit)
+        return _hydrate_with_distance(db, hits)
+
+    if mode in ("index", "vector", "sql"):
+        return _get_landmarks_near_location_sql(db, latitude, longitude, radius_km, limit)
+
+    landmarks = db.query(Landmark).all()
 
     nearby_landmarks = []
     for landmark in landmarks:
-        distance = calculate_distance(
+        distance = haversine_km(
             latitude, longitude,
             landmark.latitude, landmark.longitude
         )
@@ -141,4 +616,24 @@ def get_landmarks_near_location(
 
     # Сортируем по расстоянию и ограничиваем количество
     nearby_landmarks.sort(key=lambda x: x.distance)  # type: ignore
-    return nearby_landmarks[:limit]
\ No newline at end of file
+    return nearby_landmarks[:limit]
+
+
+def get_landmarks_near_locations(
+    db: Session,
+    points: List[Tuple[float, float]],
+    radius_km: float = 10,
+    limit: int = 20
+) -> List[List[Landmark]]:
+    """
+    Пакетный поиск поблизости для нескольких точек за один вызов.
+    Достопримечательности всех точек загружаются из БД одним запросом.
+    """
+    if landmark_coordinates is not None and landmark_coordinates.is_built:
+        batches = landmark_coordinates.query_radius_batch(points, radius_km, limit=limit)
+        return _hydrate_batch_with_distance(db, batches)
+
+    return [
+        get_landmarks_near_location(db, latitude, longitude, radius_km=radius_km, limit=limit)
+        for latitude, longitude in points
+    ]
@@ -1,7 +1,7 @@
-<<<<<<< Updated upstream
 from sqlalchemy.orm import Session
 from typing import List, Tuple, Optional, Dict, Any
 from sqlalchemy import desc
+from app.core.pagination import count_total, fetch_page, paginate_keyset
 from app.models.notification import Notification
 from app.schemas.notification import NotificationCreate, NotificationUpdate
 
@@ -15,8 +15,9 @@ def get_user_notifications(
     skip: int = 0,
     limit: int = 50,
     only_unread: bool = False,
-    include_archived: bool = False
-) -> Tuple[List[Notification], int, int]:
+    include_archived: bool = False,
+    total_mode: str = "exact"
+) -> Tuple[List[Notification], Optional[int], int]:
     """Получить уведомления пользователя"""
     query = db.query(Notification).filter(Notification.user_id == user_id)
     
@@ -26,9 +27,6 @@ def get_user_notifications(
     if not include_archived:
         query = query.filter(Notification.is_archived == False)
     
-    # Получаем общее количество
-    total = query.count()
-    
     # Получаем количество непрочитанных
     unread_count = db.query(Notification).filter(
         Notification.user_id == user_id,
@@ -36,74 +34,56 @@ def get_user_notifications(
         Notification.is_archived == False
     ).count()
     
-    # Применяем сортировку (новые сначала) и пагинацию
-    notifications = query.order_by(desc(Notification.created_at))\
-                        .offset(skip)\
-                        .limit(limit)\
-                        .all()
+    # Применяем сортировку (новые сначала) и пагинацию, общее количество - в том же запросе
+    notifications, total = fetch_page(
+        query.order_by(desc(Notification.created_at)), skip, limit, total_mode
+    )
     
     return notifications, total, unread_count
 
-def create_notification(db: Session, notification: NotificationCreate) -> Notification:
-    """Создать новое уведомление"""
-    db_notification = Notification(**notification.dict())
-=======
-from typing import List, Optional
-from sqlalchemy.orm import Session
-from sqlalchemy import func, desc
-from app.models.notification import Notification
-from app.schemas.notification import NotificationCreate, NotificationUpdate
-
-
-def get_notification(db: Session, notification_id: int):
-    """Получить уведомление по ID"""
-    return db.query(Notification).filter(Notification.id == notification_id).first()
-
-
-def get_user_notifications(
-    db: Session, 
-    user_id: int, 
-    skip: int = 0, 
+def get_user_notifications_by_cursor(
+    db: Session,
+    user_id: int,
+    cursor: Optional[str] = None,
     limit: int = 50,
-    unread_only: bool = False
-):
-    """Получить уведомления пользователя"""
+    only_unread: bool = False,
+    include_archived: bool = False,
+    total_mode: str = "exact"
+) -> Tuple[List[Notification], Optional[int], int, Optional[str]]:
+    """Получить уведомления пользователя по курсору (новые сначала)"""
     query = db.query(Notification).filter(Notification.user_id == user_id)
     
-    if unread_only:
+    if only_unread:
         query = query.filter(Notification.is_read == False)
     
-    total = query.count()
-    notifications = query.order_by(desc(Notification.created_at)).offset(skip).limit(limit).all()
+    if not include_archived:
+        query = query.filter(Notification.is_archived == False)
     
-    return notifications, total
-
-
-def get_unread_count(db: Session, user_id: int) -> int:
-    """Получить количество непрочитанных уведомлений"""
-    return db.query(func.count()).filter(
+    total = count_total(query, total_mode)
+    
+    unread_count = db.query(Notification).filter(
         Notification.user_id == user_id,
-        Notification.is_read == False
-    ).scalar()
-
+        Notification.is_read == False,
+        Notification.is_archived == False
+    ).count()
+    
+    notifications, next_cursor = paginate_keyset(
+        query,
+        [(Notification.created_at, True), (Notification.id, True)],
+        cursor,
+        limit
+    )
+    
+    return notifications, total, unread_count, next_cursor
 
-def create_notification(db: Session, notification: NotificationCreate):
+def create_notification(db: Session, notification: NotificationCreate) -> Notification:
     """Создать новое уведомление"""
-    db_notification = Notification(
-        user_id=notification.user_id,
-        type=notification.type,
-        title=notification.title,
-        message=notification.message,
-        related_id=notification.related_id,
-        related_type=notification.related_type
-    )
->>>>>>> Stashed changes
+    db_notification = Notification(**notification.dict())
     db.add(db_notification)
     db.commit()
     db.refresh(db_notification)
     return db_notification
 
-<<<<<<< Updated upstream
 def create_system_notification(
     db: Session,
     user_id: int,
@@ -156,17 +136,10 @@ def mark_as_archived(db: Session, user_id: int, notification_ids: List[int]) ->
 def delete_notification(db: Session, notification_id: int, user_id: int) -> bool:
     """Удалить уведомление"""
     db_notification = db.query(Notification).filter(
-=======
-
-def mark_as_read(db: Session, notification_id: int, user_id: int):
-    """Отметить уведомление как прочитанное"""
-    notification = db.query(Notification).filter(
->>>>>>> Stashed changes
         Notification.id == notification_id,
         Notification.user_id == user_id
     ).first()
     
-<<<<<<< Updated upstream
     if not db_notification:
         return False
     
@@ -203,83 +176,3 @@ def get_notification_stats(db: Session, user_id: int) -> Dict[str, int]:
         "read": read,
         "archived": archived
     }
-=======
-    if notification:
-        notification.is_read = True
-        db.commit()
-        db.refresh(notification)
-    
-    return notification
-
-
-def mark_all_as_read(db: Session, user_id: int):
-    """Отметить все уведомления пользователя как прочитанные"""
-    db.query(Notification).filter(
-        Notification.user_id == user_id,
-        Notification.is_read == False
-    ).update({"is_read": True})
-    db.commit()
-    
-    return get_unread_count(db, user_id) == 0
-
-
-def delete_notification(db: Session, notification_id: int, user_id: int):
-    """Удалить уведомление"""
-    notification = db.query(Notification).filter(
-        Notification.id == notification_id,
-        Notification.user_id == user_id
-    ).first()
-    
-    if notification:
-        db.delete(notification)
-        db.commit()
-        return True
-    
-    return False
-
-
-# Функции для автоматического создания уведомлений
-def create_answer_notification(db: Session, answer_user_id: int, discussion_author_id: int, answer_id: int, discussion_title: str):
-    """Создать уведомление о новом ответе на обсуждение"""
-    if answer_user_id != discussion_author_id:  # Не уведомляем, если ответил автор обсуждения
-        notification = NotificationCreate(
-            user_id=discussion_author_id,
-            type="new_answer",
-            title="Новый ответ на ваше обсуждение",
-            message=f"Пользователь ответил на ваше обсуждение '{discussion_title}'",
-            related_id=answer_id,
-            related_type="answer"
-        )
-        return create_notification(db, notification)
-    return None
-
-
-def create_like_notification(db: Session, voter_id: int, answer_author_id: int, answer_id: int):
-    """Создать уведомление о лайке ответа"""
-    if voter_id != answer_author_id:  # Не уведомляем, если лайкнул сам автор
-        notification = NotificationCreate(
-            user_id=answer_author_id,
-            type="answer_liked",
-            title="Ваш ответ отметили как полезный",
-            message="Кто-то отметил ваш ответ как полезный",
-            related_id=answer_id,
-            related_type="answer"
-        )
-        return create_notification(db, notification)
-    return None
-
-
-def create_review_notification(db: Session, review_user_id: int, landmark_owner_id: int, review_id: int, landmark_name: str):
-    """Создать уведомление о новом отзыве на достопримечательность (для модераторов/админов)"""
-    if review_user_id != landmark_owner_id:
-        notification = NotificationCreate(
-            user_id=landmark_owner_id,
-            type="new_review",
-            title="Новый отзыв на достопримечательность",
-            message=f"Добавлен новый отзыв на '{landmark_name}'",
-            related_id=review_id,
-            related_type="review"
-        )
-        return create_notification(db, notification)
-    return None
->>>>>>> Stashed changes
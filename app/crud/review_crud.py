@@ -1,10 +1,77 @@
+from sqlalchemy import case, func, update
 from sqlalchemy.orm import Session, joinedload
-from typing import List, Tuple, Optional, Dict
+from typing import Iterable, List, Tuple, Optional, Dict
+from app.core.autocomplete import autocomplete_index
+from app.core.pagination import count_total, fetch_page, paginate_keyset
+from app.crud.city_crud import adjust_city_stats
+from app.crud.sync_crud import record_deleted
 from app.models.review import Review
 from app.models.user import User
 from app.models.landmark import Landmark
 from app.schemas.review import ReviewCreate, ReviewUpdate
 
+# Столбцы гистограммы оценок в Landmark
+RATING_COLUMNS = {
+    1: Landmark.rating_1,
+    2: Landmark.rating_2,
+    3: Landmark.rating_3,
+    4: Landmark.rating_4,
+    5: Landmark.rating_5
+}
+
+
+def rating_bucket(rating: float) -> int:
+    """
+    Столбец гистограммы для оценки (дробная часть отбрасывается)
+    """
+    return min(5, max(1, int(rating)))
+
+
+def _apply_rating_change(
+    db: Session,
+    landmark_id: int,
+    old_rating: Optional[float],
+    new_rating: Optional[float]
+) -> None:
+    """
+    Инкрементально обновить агрегаты отзывов достопримечательности и ее города
+    в текущей транзакции: old_rating - снятая оценка, new_rating - добавленная.
+    Обновление атомарное (column = column + delta), без чтения строки.
+    Индекс подсказок обновляет вызывающий код после коммита.
+    """
+    count_delta = 0
+    sum_delta = 0.0
+    bucket_deltas: Dict[int, int] = {}
+    if old_rating is not None:
+        count_delta -= 1
+        sum_delta -= old_rating
+        bucket = rating_bucket(old_rating)
+        bucket_deltas[bucket] = bucket_deltas.get(bucket, 0) - 1
+    if new_rating is not None:
+        count_delta += 1
+        sum_delta += new_rating
+        bucket = rating_bucket(new_rating)
+        bucket_deltas[bucket] = bucket_deltas.get(bucket, 0) + 1
+
+    values = {}
+    if count_delta:
+        values[Landmark.review_count] = Landmark.review_count + count_delta
+    if sum_delta:
+        values[Landmark.rating_sum] = Landmark.rating_sum + sum_delta
+    for bucket, delta in bucket_deltas.items():
+        if delta:
+            values[RATING_COLUMNS[bucket]] = RATING_COLUMNS[bucket] + delta
+    if not values:
+        return
+
+    db.query(Landmark).filter(Landmark.id == landmark_id).update(values, synchronize_session=False)
+    city = db.query(Landmark.city).filter(Landmark.id == landmark_id).scalar()
+    adjust_city_stats(db, city, reviews=count_delta, rating_sum=sum_delta)
+    # Загруженный в сессию объект должен перечитать агрегаты
+    landmark = db.identity_map.get(db.identity_key(Landmark, landmark_id))
+    if landmark is not None:
+        db.expire(landmark, ["review_count", "rating_sum", *(column.key for column in RATING_COLUMNS.values())])
+
 
 def get_review(db: Session, user_id: int, landmark_id: int) -> Review | None:
     """
@@ -20,24 +87,47 @@ def get_reviews_by_landmark(
     db: Session, 
     landmark_id: int, 
     skip: int = 0, 
-    limit: int = 100
-) -> Tuple[List[Review], int]:
+    limit: int = 100,
+    total_mode: str = "exact"
+) -> Tuple[List[Review], Optional[int]]:
     """
     Получить все отзывы для достопримечательности
     """
     query = db.query(Review).filter(Review.landmark_id == landmark_id)
-    total = query.count()
     
     # Исправлено: добавляем joinedload для загрузки связанных данных
-    reviews = query.options(joinedload(Review.user))\
-                  .order_by(Review.created_at.desc())\
-                  .offset(skip)\
-                  .limit(limit)\
-                  .all()
+    reviews, total = fetch_page(
+        query.options(joinedload(Review.user)).order_by(Review.created_at.desc()),
+        skip,
+        limit,
+        total_mode
+    )
     
     return reviews, total
 
 
+def get_reviews_by_landmark_cursor(
+    db: Session,
+    landmark_id: int,
+    cursor: Optional[str] = None,
+    limit: int = 100,
+    total_mode: str = "exact"
+) -> Tuple[List[Review], Optional[int], Optional[str]]:
+    """
+    Получить отзывы для достопримечательности по курсору (новые сначала)
+    """
+    query = db.query(Review).filter(Review.landmark_id == landmark_id)
+    total = count_total(query, total_mode)
+
+    reviews, next_cursor = paginate_keyset(
+        query.options(joinedload(Review.user)),
+        [(Review.created_at, True), (Review.id, True)],
+        cursor,
+        limit
+    )
+    return reviews, total, next_cursor
+
+
 def get_reviews_by_user(
     db: Session, 
     user_id: int, 
@@ -72,8 +162,10 @@ def create_review(db: Session, review: ReviewCreate, user_id: int) -> Review:
 
     db_review = Review(**review.dict(), user_id=user_id)
     db.add(db_review)
+    _apply_rating_change(db, db_review.landmark_id, None, db_review.rating)
     db.commit()
     db.refresh(db_review)
+    autocomplete_index.adjust_popularity(db_review.landmark_id, reviews=1)
     return db_review
 
 
@@ -90,10 +182,13 @@ def update_review(
     if not db_review:
         return None
 
+    old_rating = db_review.rating
     update_data = review.dict(exclude_unset=True)
     for field, value in update_data.items():
         setattr(db_review, field, value)
 
+    if db_review.rating != old_rating:
+        _apply_rating_change(db, landmark_id, old_rating, db_review.rating)
     db.commit()
     db.refresh(db_review)
     return db_review
@@ -107,27 +202,94 @@ def delete_review(db: Session, user_id: int, landmark_id: int) -> bool:
     if not db_review:
         return False
 
+    _apply_rating_change(db, landmark_id, db_review.rating, None)
+    record_deleted(db, "review", db_review.id, landmark_id)
     db.delete(db_review)
     db.commit()
+    autocomplete_index.adjust_popularity(landmark_id, reviews=-1)
     return True
 
 
+def remove_user_ratings(db: Session, user_id: int) -> List[int]:
+    """
+    Снять оценки пользователя с агрегатов перед каскадным удалением его отзывов.
+    Коммит выполняет вызывающий код, он же после коммита снимает отзывы
+    с индекса подсказок (release_user_ratings).
+    Возвращает id достопримечательностей, с которых сняты отзывы.
+    """
+    ratings = db.query(Review.landmark_id, Review.rating).filter(Review.user_id == user_id).all()
+    for landmark_id, rating in ratings:
+        _apply_rating_change(db, landmark_id, rating, None)
+    return [landmark_id for landmark_id, _ in ratings]
+
+
+def release_user_ratings(landmark_ids: Iterable[int]) -> None:
+    """
+    Снять удаленные отзывы с популярности в индексе подсказок
+    (после коммита удаления, по результату remove_user_ratings)
+    """
+    for landmark_id in landmark_ids:
+        autocomplete_index.adjust_popularity(landmark_id, reviews=-1)
+
+
+def recompute_rating_aggregates(db: Session, landmark_ids: Optional[Iterable[int]] = None) -> int:
+    """
+    Пересчитать агрегаты отзывов с нуля по таблице reviews (восстановление
+    после расхождений). Без landmark_ids пересчитываются все достопримечательности.
+    Индекс подсказок после этого перестраивается при следующем запросе.
+    Возвращает количество достопримечательностей с отзывами.
+    """
+    ids = list(landmark_ids) if landmark_ids is not None else None
+
+    # Сначала обнуляем, чтобы достопримечательности без отзывов тоже получили 0
+    reset = update(Landmark).values(
+        review_count=0, rating_sum=0.0, rating_1=0, rating_2=0, rating_3=0, rating_4=0, rating_5=0
+    )
+    if ids is not None:
+        reset = reset.where(Landmark.id.in_(ids))
+    db.execute(reset)
+
+    bucket = case(
+        (Review.rating < 2, 1),
+        (Review.rating < 3, 2),
+        (Review.rating < 4, 3),
+        (Review.rating < 5, 4),
+        else_=5
+    )
+    aggregates = db.query(
+        Review.landmark_id.label("landmark_id"),
+        func.count(Review.id).label("review_count"),
+        func.sum(Review.rating).label("rating_sum"),
+        *[func.sum(case((bucket == stars, 1), else_=0)).label(f"rating_{stars}") for stars in RATING_COLUMNS]
+    ).group_by(Review.landmark_id)
+    if ids is not None:
+        aggregates = aggregates.filter(Review.landmark_id.in_(ids))
+    aggregates = aggregates.subquery()
+
+    # Один UPDATE ... FROM по сгруппированному подзапросу
+    result = db.execute(
+        update(Landmark)
+        .where(Landmark.id == aggregates.c.landmark_id)
+        .values(
+            review_count=aggregates.c.review_count,
+            rating_sum=aggregates.c.rating_sum,
+            **{f"rating_{stars}": aggregates.c[f"rating_{stars}"] for stars in RATING_COLUMNS}
+        )
+        .execution_options(synchronize_session=False)
+    )
+    db.commit()
+    autocomplete_index.invalidate()
+    return result.rowcount
+
+
 def get_landmark_rating_summary(db: Session, landmark_id: int) -> Tuple[Optional[float], int, Dict[int, int]]:
     """
-    Получить сводку по рейтингам достопримечательности
+    Получить сводку по рейтингам достопримечательности (из агрегатов Landmark)
     """
-    reviews = db.query(Review).filter(Review.landmark_id == landmark_id).all()
+    landmark = db.query(Landmark).filter(Landmark.id == landmark_id).first()
     
-    if not reviews:
+    if not landmark or not landmark.review_count:
         return None, 0, {}
 
-    total_rating = sum(review.rating for review in reviews)
-    average_rating = round(total_rating / len(reviews), 1)
-    
-    # Распределение оценок
-    rating_distribution = {1: 0, 2: 0, 3: 0, 4: 0, 5: 0}
-    for review in reviews:
-        rating = int(review.rating)
-        rating_distribution[rating] = rating_distribution.get(rating, 0) + 1
-
-    return average_rating, len(reviews), rating_distribution
\ No newline at end of file
+    average_rating = round(landmark.average_rating, 1)
+    return average_rating, landmark.review_count, landmark.rating_distribution
\ No newline at end of file
@@ -0,0 +1,149 @@
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import and_, func, insert, literal, or_, select
+from sqlalchemy.orm import Query, Session, joinedload
+
+from app.core.config import settings
+from app.core.pagination import InvalidCursorError, decode_cursor, encode_cursor
+from app.models.landmark import Landmark
+from app.models.review import Review
+from app.models.sync import DeletedRecord
+
+# Позиция в потоке изменений одной сущности: (момент изменения, id)
+Position = Tuple[datetime, int]
+
+
+class SyncTokenExpiredError(InvalidCursorError):
+    """Токен старше срока хранения надгробий - нужна полная синхронизация"""
+
+
+def record_deleted(db: Session, entity_type: str, entity_id: int, landmark_id: Optional[int] = None) -> None:
+    """
+    Оставить надгробие удаленной записи. Коммит выполняет вызывающий код.
+    """
+    db.add(DeletedRecord(entity_type=entity_type, entity_id=entity_id, landmark_id=landmark_id))
+
+
+def record_deleted_reviews(db: Session, condition) -> None:
+    """
+    Надгробия отзывов, которые будут удалены каскадно (вместе с достопримечательностью
+    или пользователем), одним INSERT ... SELECT. Коммит выполняет вызывающий код.
+    """
+    db.execute(
+        insert(DeletedRecord).from_select(
+            ["entity_type", "entity_id", "landmark_id"],
+            select(literal("review"), Review.id, Review.landmark_id).where(condition)
+        )
+    )
+
+
+def purge_deleted_records(db: Session, retention_days: Optional[int] = None) -> int:
+    """
+    Удалить надгробия старше срока хранения. Возвращает количество удаленных.
+    """
+    days = settings.SYNC_TOMBSTONE_RETENTION_DAYS if retention_days is None else retention_days
+    threshold = datetime.now(timezone.utc) - timedelta(days=days)
+    deleted = db.query(DeletedRecord).filter(DeletedRecord.deleted_at < threshold).delete(synchronize_session=False)
+    db.commit()
+    return deleted
+
+
+def _comparable_moment(db: Session):
+    """
+    SQLite хранит метки времени строками: server_default CURRENT_TIMESTAMP пишет их
+    без долей секунды, а параметры передаются с ними, и равные моменты не совпадают.
+    Там сравниваем моменты как числа (julianday), в PostgreSQL - как есть.
+    """
+    if db.get_bind().dialect.name == "sqlite":
+        return func.julianday
+    return lambda value: value
+
+
+def _changes_after(
+    query: Query,
+    changed_at,
+    id_column,
+    position: Optional[Position],
+    upper: datetime,
+    limit: int
+) -> Tuple[List[Any], Position, bool]:
+    """
+    Изменения строго после позиции и строго до верхней границы, по (changed_at, id).
+    Возвращает (записи, новая позиция, есть ли еще записи до верхней границы).
+    """
+    moment = _comparable_moment(query.session)
+    if position is not None:
+        position_at, position_id = position
+        query = query.filter(or_(
+            moment(changed_at) > moment(position_at),
+            and_(moment(changed_at) == moment(position_at), id_column > position_id)
+        ))
+    rows = query.filter(changed_at < upper).order_by(moment(changed_at), id_column).limit(limit + 1).all()
+
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        return rows, (last.changed_at, last.id), True
+    # Все изменения до верхней границы выбраны - следующий запрос начнется с нее
+    return rows, (upper, 0), False
+
+
+def decode_sync_token(token: str) -> Tuple[Position, Position, Position]:
+    values = decode_cursor(token, 6)
+    if not all(isinstance(values[i], datetime) and isinstance(values[i + 1], int) for i in (0, 2, 4)):
+        raise InvalidCursorError("Некорректный токен синхронизации")
+    # SQLite возвращает время без часового пояса - метки времени хранятся в UTC
+    moments = [value if value.tzinfo else value.replace(tzinfo=timezone.utc) for value in values[0::2]]
+    return (moments[0], values[1]), (moments[1], values[3]), (moments[2], values[5])
+
+
+def encode_sync_token(landmarks: Position, reviews: Position, deleted: Position) -> str:
+    return encode_cursor([*landmarks, *reviews, *deleted])
+
+
+def get_changes(db: Session, since: Optional[str] = None, limit: int = 500) -> Dict[str, Any]:
+    """
+    Изменения для дельта-синхронизации после токена since.
+
+    Токен хранит позицию (момент изменения, id) отдельно для достопримечательностей,
+    отзывов и надгробий, поэтому порция любого размера не теряет записи с одинаковым
+    временем. Верхняя граница отстает от текущего времени на SYNC_SAFETY_LAG_SECONDS:
+    now() в PostgreSQL - время начала транзакции, и запись долгой транзакции
+    становится видна позже, чем ее метка времени.
+
+    Без токена возвращается полный снимок без надгробий.
+    Агрегаты рейтинга приходят в записях достопримечательностей: изменение отзыва
+    обновляет агрегаты и updated_at достопримечательности.
+    """
+    now = datetime.now(timezone.utc)
+    upper = now - timedelta(seconds=settings.SYNC_SAFETY_LAG_SECONDS)
+
+    if since:
+        landmark_position, review_position, deleted_position = decode_sync_token(since)
+        retention = timedelta(days=settings.SYNC_TOMBSTONE_RETENTION_DAYS)
+        if deleted_position[0] < now - retention:
+            raise SyncTokenExpiredError("Токен устарел: выполните полную синхронизацию")
+    else:
+        # Клиенту без данных нечего удалять - надгробия пропускаем
+        landmark_position, review_position, deleted_position = None, None, (upper, 0)
+
+    landmarks, landmark_position, landmarks_more = _changes_after(
+        db.query(Landmark), Landmark.changed_at, Landmark.id, landmark_position, upper, limit
+    )
+    reviews, review_position, reviews_more = _changes_after(
+        db.query(Review).options(joinedload(Review.user)),
+        Review.changed_at, Review.id, review_position, upper, limit
+    )
+    deleted, deleted_position, deleted_more = _changes_after(
+        db.query(DeletedRecord), DeletedRecord.changed_at, DeletedRecord.id, deleted_position, upper, limit
+    )
+
+    return {
+        "landmarks": landmarks,
+        "reviews": reviews,
+        "deleted": deleted,
+        "next_token": encode_sync_token(landmark_position, review_position, deleted_position),
+        "has_more": landmarks_more or reviews_more or deleted_more,
+        "server_time": upper
+    }
@@ -1,9 +1,16 @@
+from sqlalchemy import func, select
 from sqlalchemy.orm import Session
 from typing import Optional, List, Tuple
 from app.models.user import User
 from app.schemas.user import UserCreate, UserUpdate
 from app.schemas.profile import UserProfileUpdate
 from app.core.security import get_password_hash
+from app.core.user_cache import user_cache
+from app.crud.city_crud import remove_discussions_from_stats
+from app.crud.review_crud import release_user_ratings, remove_user_ratings
+from app.crud.sync_crud import record_deleted_reviews
+from app.models.discussion import Discussion, DiscussionAnswer
+from app.models.review import Review
 
 
 def get_user(db: Session, user_id: int) -> Optional[User]:
@@ -48,6 +55,7 @@ def update_user(db: Session, user_id: int, user_update: UserUpdate) -> Optional[
         setattr(db_user, field, value)
     
     db.commit()
+    user_cache.invalidate_user(user_id)
     db.refresh(db_user)
     return db_user
 
@@ -60,8 +68,21 @@ def delete_user(db: Session, user_id: int) -> bool:
     if not db_user:
         return False
     
+    # Отзывы, обсуждения и ответы удаляются каскадно - снимаем их со счетчиков
+    rated_landmarks = remove_user_ratings(db, user_id)
+    record_deleted_reviews(db, Review.user_id == user_id)
+    remove_discussions_from_stats(db, Discussion.user_id == user_id)
+    user_answers = select(func.count(DiscussionAnswer.id)).where(
+        DiscussionAnswer.discussion_id == Discussion.id,
+        DiscussionAnswer.user_id == user_id
+    ).scalar_subquery()
+    db.query(Discussion).filter(
+        Discussion.id.in_(select(DiscussionAnswer.discussion_id).where(DiscussionAnswer.user_id == user_id))
+    ).update({Discussion.answer_count: Discussion.answer_count - user_answers}, synchronize_session=False)
     db.delete(db_user)
     db.commit()
+    user_cache.invalidate_user(user_id)
+    release_user_ratings(rated_landmarks)
     return True
 
 
@@ -100,6 +121,7 @@ def update_user_profile(
             setattr(db_user, field, value)
     
     db.commit()
+    user_cache.invalidate_user(user_id)
     db.refresh(db_user)
     return db_user
 
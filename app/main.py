@@ -1,4 +1,4 @@
-from fastapi import FastAPI
+from fastapi import FastAPI, Response
 from fastapi.middleware.cors import CORSMiddleware
 
 # Импорты роутеров
@@ -9,6 +9,19 @@ from app.api.routes.reviews import router as reviews_router
 from app.api.routes.profile import router as profile_router
 from app.api.routes.discussions import router as discussions_router
 from app.api.routes.cities import router as cities_router
+from app.api.routes.notifications import router as notifications_router
+from app.api.routes.sync import router as sync_router
+from app.core.config import settings
+from app.core.database import SessionLocal, collect_pool_metrics, get_pool_stats
+from app.core.metrics import PROMETHEUS_CONTENT_TYPE, MetricsMiddleware, cache_collector, metrics_registry
+from app.core.password_hasher import password_hasher
+from app.core.query_inspector import QueryInspectorMiddleware
+from app.core.user_cache import user_cache
+# Регистрация всех моделей, включая надгробия синхронизации (DeletedRecord)
+import app.models  # noqa: F401
+from app.crud.landmark_crud import (
+    build_autocomplete_index, build_landmark_index, build_landmark_text_index, fuzzy_search_mode
+)
 
 # Проверяем наличие роутеров
 try:
@@ -17,39 +30,11 @@ try:
 except ImportError:
     HAS_USERS_ROUTER = False
 
-try:
-<<<<<<< Updated upstream
-    # Явно импортируем модели для регистрации
-    from app.models.user import User
-    from app.models.landmark import Landmark
-    from app.models.favorite import Favorite
-    from app.models.review import Review
-    from app.models.discussion import Discussion, DiscussionAnswer
-    from app.models.city import CityProfile, CityCategoryStats
-    from app.models.notification import Notification
-    
-    # Создаём таблицы
-    Base.metadata.create_all(bind=engine)
-    print("✅ Таблицы успешно созданы!")
-    
-except Exception as e:
-    print(f"❌ Ошибка при создании таблиц: {e}")
-=======
-    from app.api.routes.notifications import router as notifications_router
-    HAS_NOTIFICATIONS_ROUTER = True
-except ImportError:
-    HAS_NOTIFICATIONS_ROUTER = False
->>>>>>> Stashed changes
-
 app = FastAPI(
     title="Universal Tourist Guide API",
-    version="0.7.0",
+    version="0.8.0",
     description="Бэкенд API для мобильного приложения-гида по достопримечательностям",
-<<<<<<< Updated upstream
-    version = "0.8.0",  # Обновляем версию
-=======
     openapi_url="/openapi.json",
->>>>>>> Stashed changes
     docs_url="/docs",
     redoc_url="/redoc",
 )
@@ -63,40 +48,87 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Инспектор SQL-запросов: бюджет, повторы (N+1), заголовки X-DB-* в режиме отладки
+app.add_middleware(
+    QueryInspectorMiddleware,
+    budget=settings.QUERY_BUDGET,
+    repeat_threshold=settings.QUERY_REPEAT_THRESHOLD,
+    debug_headers=settings.QUERY_DEBUG_HEADERS
+)
+
+# Метрики запросов (подключается последним, чтобы учитывать и работу CORS)
+app.add_middleware(MetricsMiddleware)
+metrics_registry.register_collector(collect_pool_metrics)
+metrics_registry.register_collector(cache_collector("user", user_cache))
+
 # Подключаем роутеры
-<<<<<<< Updated upstream
-from app.api.routes import auth, landmarks, favorites, reviews, profile, discussions, notifications
-app.include_router(auth.router, prefix="/api/auth", tags=["Аутентификация"])
-app.include_router(landmarks.router, prefix="/api", tags=["Достопримечательности"])
-app.include_router(favorites.router, prefix="/api", tags=["Избранное"])
-app.include_router(reviews.router, prefix="/api", tags=["Отзывы и оценки"])
-app.include_router(profile.router, prefix="/api", tags=["Профили пользователей"])
-app.include_router(discussions.router, prefix="/api", tags=["Обсуждения"])
-app.include_router(cities.router, prefix="/api", tags=["Города"])
-app.include_router(notifications.router, prefix="/api", tags=["Уведомления"])
-=======
 app.include_router(auth_router, prefix="/api/auth", tags=["Аутентификация"])
-app.include_router(landmarks_router, prefix="/api/landmarks", tags=["Достопримечательности"])
-app.include_router(favorites_router, prefix="/api/favorites", tags=["Избранное"])
-app.include_router(reviews_router, prefix="/api/reviews", tags=["Отзывы и оценки"])
-app.include_router(profile_router, prefix="/api/profile", tags=["Профили пользователей"])
-app.include_router(discussions_router, prefix="/api/discussions", tags=["Обсуждения"])
+app.include_router(landmarks_router, prefix="/api", tags=["Достопримечательности"])
+app.include_router(favorites_router, prefix="/api", tags=["Избранное"])
+app.include_router(reviews_router, prefix="/api", tags=["Отзывы и оценки"])
+app.include_router(profile_router, prefix="/api", tags=["Профили пользователей"])
+app.include_router(discussions_router, prefix="/api", tags=["Обсуждения"])
+# Пути роутера городов не содержат /cities
 app.include_router(cities_router, prefix="/api/cities", tags=["Города"])
->>>>>>> Stashed changes
+app.include_router(notifications_router, prefix="/api", tags=["Уведомления"])
+app.include_router(sync_router, prefix="/api", tags=["Синхронизация"])
 
 # Подключаем users_router, если он существует
 if HAS_USERS_ROUTER:
     app.include_router(users_router, prefix="/api/users", tags=["Пользователи"])
 
-# Подключаем notifications_router, если он существует
-if HAS_NOTIFICATIONS_ROUTER:
-    app.include_router(notifications_router, prefix="/api/notifications", tags=["Уведомления"])
+# Построение пространственного индекса достопримечательностей при старте
+@app.on_event("startup")
+def build_spatial_index():
+    if not settings.SPATIAL_INDEX_ENABLED:
+        return
+
+    db = SessionLocal()
+    try:
+        count = build_landmark_index(db)
+        print(f"✅ Пространственный индекс построен: {count} достопримечательностей")
+    except Exception as e:
+        # Без индекса поиск поблизости работает через полный просмотр таблицы
+        print(f"❌ Ошибка при построении пространственного индекса: {e}")
+    finally:
+        db.close()
+
+# N-граммный индекс для нечеткого поиска, если pg_trgm не используется
+@app.on_event("startup")
+def build_text_index():
+    db = SessionLocal()
+    try:
+        if fuzzy_search_mode(db) == "index":
+            count = build_landmark_text_index(db)
+            print(f"✅ Индекс нечеткого поиска построен: {count} достопримечательностей")
+    except Exception as e:
+        # Индекс будет построен при первом нечетком поиске
+        print(f"❌ Ошибка при построении индекса нечеткого поиска: {e}")
+    finally:
+        db.close()
+
+# Префиксный индекс подсказок автодополнения
+@app.on_event("startup")
+def build_suggestions_index():
+    db = SessionLocal()
+    try:
+        count = build_autocomplete_index(db)
+        print(f"✅ Индекс автодополнения построен: {count} подсказок")
+    except Exception as e:
+        # Индекс будет построен при первом запросе подсказок
+        print(f"❌ Ошибка при построении индекса автодополнения: {e}")
+    finally:
+        db.close()
+
+# Остановка пула хэширования паролей
+@app.on_event("shutdown")
+def shutdown_password_hasher():
+    password_hasher.shutdown()
 
 # Корневой эндпоинт
 @app.get("/")
 async def root():
     return {
-<<<<<<< Updated upstream
         "message": "Universal Tourist Guide API", 
         "status": "работает",
         "version": "0.8.0",  # Обновляем версию
@@ -113,12 +145,6 @@ async def root():
             "профили городов с фильтрацией",
             "система уведомлений"  # Добавляем новую фичу
         ]
-=======
-        "message": "Universal Tourist Guide API",
-        "version": "0.7.0",
-        "docs": "/docs",
-        "openapi": "/openapi.json"
->>>>>>> Stashed changes
     }
 
 # Эндпоинт для проверки здоровья
@@ -126,11 +152,15 @@ async def root():
 async def health_check():
     return {"status": "healthy"}
 
+# Состояние пула соединений с БД: занятые соединения, overflow, ожидание и таймауты
+@app.get("/health/db-pool")
+def db_pool_health():
+    return get_pool_stats()
+
 # Эндпоинт для получения информации о API
 @app.get("/api/info")
 async def api_info():
     return {
-<<<<<<< Updated upstream
         "status": "operational",
         "version": "0.8.0",  # Обновляем версию
         "database": "connected",
@@ -147,20 +177,6 @@ async def api_info():
             "discussions": True,
             "city_profiles": True,
             "notifications": True  # Добавляем новую фичу
-=======
-        "name": "Universal Tourist Guide API",
-        "version": "0.7.0",
-        "description": "Бэкенд для мобильного приложения-гида по достопримечательностям",
-        "author": "Tourist Guide Team",
-        "endpoints": {
-            "auth": "/api/auth",
-            "landmarks": "/api/landmarks",
-            "favorites": "/api/favorites",
-            "reviews": "/api/reviews",
-            "profile": "/api/profile",
-            "discussions": "/api/discussions",
-            "cities": "/api/cities",
->>>>>>> Stashed changes
         }
     }
 
@@ -196,16 +212,12 @@ async def get_all_filters():
 # Эндпоинт для проверки версии
 @app.get("/api/version")
 async def get_version():
-    return {"version": "0.7.0"}
+    return {"version": "0.8.0"}
 
-# Эндпоинт для получения метрик (можно использовать для мониторинга)
+# Метрики в текстовом формате Prometheus
 @app.get("/api/metrics")
 async def get_metrics():
-    return {
-        "status": "ok",
-        "timestamp": "2026-01-20T10:00:00Z",
-        "uptime": "не реализовано"
-    }
+    return Response(content=metrics_registry.render(), media_type=PROMETHEUS_CONTENT_TYPE)
 
 # Запуск приложения (для локальной разработки)
 if __name__ == "__main__":
@@ -5,10 +5,12 @@ from app.models.review import Review
 from app.models.discussion import Discussion, DiscussionAnswer
 from app.models.city import CityProfile, CityCategoryStats
 from app.models.notification import Notification
+from app.models.sync import DeletedRecord
 
 __all__ = [
     "User", "Landmark", "Favorite", "Review", 
     "Discussion", "DiscussionAnswer",
     "CityProfile", "CityCategoryStats",
-    "Notification"
+    "Notification",
+    "DeletedRecord"
 ]
\ No newline at end of file
@@ -15,6 +15,8 @@ class CityProfile(Base):
     total_reviews = Column(Integer, default=0, nullable=False)
     total_discussions = Column(Integer, default=0, nullable=False)
     average_rating = Column(Float, default=0.0, nullable=False)
+    # Сумма оценок - для инкрементального пересчета average_rating
+    rating_sum = Column(Float, default=0.0, server_default='0', nullable=False)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
     
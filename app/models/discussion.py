@@ -1,7 +1,8 @@
-from sqlalchemy import Column, Integer, String, Text, ForeignKey, DateTime, Boolean, Index
+from sqlalchemy import Column, Integer, String, Text, ForeignKey, DateTime, Boolean, Index, DDL, event
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.core.database import Base
+from app.core.full_text import search_vector_ddl
 
 class Discussion(Base):
     __tablename__ = "discussions"
@@ -18,6 +19,7 @@ class Discussion(Base):
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
     is_closed = Column(Boolean, default=False)  # Закрыто ли обсуждение
+    answer_count = Column(Integer, default=0, server_default='0', nullable=False)  # Денормализованный счетчик ответов
     
     # Отношения
     user = relationship("User", back_populates="discussions")
@@ -28,6 +30,7 @@ class Discussion(Base):
     __table_args__ = (
         Index('idx_discussion_city_created', 'city', 'created_at'),
         Index('idx_discussion_landmark_created', 'landmark_id', 'created_at'),
+        Index('idx_discussion_created_id', 'created_at', 'id'),
     )
     
     def __repr__(self):
@@ -52,4 +55,16 @@ class DiscussionAnswer(Base):
     discussion = relationship("Discussion", back_populates="answers")
     
     def __repr__(self):
-        return f"<Answer {self.content[:30]}...>"
\ No newline at end of file
+        return f"<Answer {self.content[:30]}...>"
+
+
+# Полнотекстовый поиск по обсуждениям и ответам: генерируемые столбцы search_vector
+# и GIN-индексы (только PostgreSQL). Совпадение в ответе весит меньше, чем в заголовке
+DISCUSSION_SEARCH_COLUMNS = (("title", "A"), ("content", "B"))
+ANSWER_SEARCH_COLUMNS = (("content", "C"),)
+for table, columns, index_name in (
+    (Discussion.__table__, DISCUSSION_SEARCH_COLUMNS, "idx_discussion_search_vector"),
+    (DiscussionAnswer.__table__, ANSWER_SEARCH_COLUMNS, "idx_discussion_answer_search_vector"),
+):
+    for statement in search_vector_ddl(table.name, columns, index_name):
+        event.listen(table, "after_create", DDL(statement).execute_if(dialect="postgresql"))
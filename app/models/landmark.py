@@ -1,7 +1,13 @@
-from sqlalchemy import Column, Integer, String, Float, Text, DateTime
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, Integer, String, Float, Text, DateTime, Index, DDL, event
+from sqlalchemy.ext.hybrid import hybrid_property
+from sqlalchemy.orm import relationship, validates
 from sqlalchemy.sql import func
 from app.core.database import Base
+from app.core.filter_keys import filter_key
+from app.core.full_text import search_vector_ddl
+
+# Столбцы точных фильтров: нормализованный ключ (см. filter_key) для каждого значения
+FILTER_KEY_COLUMNS = {"city": "city_key", "country": "country_key", "category": "category_key"}
 
 class Landmark(Base):
     __tablename__ = "landmarks"
@@ -12,18 +18,94 @@ class Landmark(Base):
     city = Column(String(100), nullable=False, index=True)
     country = Column(String(100), nullable=False)
     category = Column(String(100), nullable=False, index=True)
+    # Ключи точных фильтров, заполняются при записи city, country и category
+    city_key = Column(String(100), nullable=False, server_default="")
+    country_key = Column(String(100), nullable=False, server_default="", index=True)
+    category_key = Column(String(100), nullable=False, server_default="", index=True)
     latitude = Column(Float, nullable=False)
     longitude = Column(Float, nullable=False)
     address = Column(String(500))
     image_url = Column(String(500))
+    # Идентификатор во внешнем источнике: ключ upsert при массовом импорте
+    external_id = Column(String(100), unique=True, nullable=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
 
+    # Денормализованные агрегаты отзывов (поддерживаются в review_crud)
+    review_count = Column(Integer, default=0, server_default='0', nullable=False)
+    rating_sum = Column(Float, default=0.0, server_default='0', nullable=False)
+    rating_1 = Column(Integer, default=0, server_default='0', nullable=False)
+    rating_2 = Column(Integer, default=0, server_default='0', nullable=False)
+    rating_3 = Column(Integer, default=0, server_default='0', nullable=False)
+    rating_4 = Column(Integer, default=0, server_default='0', nullable=False)
+    rating_5 = Column(Integer, default=0, server_default='0', nullable=False)
+
     favorites = relationship("Favorite", back_populates="landmark", cascade="all, delete-orphan")
     reviews = relationship("Review", back_populates="landmark", cascade="all, delete-orphan")
     
     # Добавляем новую связь для обсуждений
     discussions = relationship("Discussion", back_populates="landmark", cascade="all, delete-orphan")
 
+    # Индексы
+    __table_args__ = (
+        Index('idx_landmark_lat_lon', 'latitude', 'longitude'),
+    )
+
+    @hybrid_property
+    def average_rating(self):
+        if not self.review_count:
+            return None
+        return self.rating_sum / self.review_count
+
+    @average_rating.expression
+    def average_rating(cls):
+        return cls.rating_sum / func.nullif(cls.review_count, 0)
+
+    @hybrid_property
+    def changed_at(self):
+        # Момент последнего изменения: updated_at заполняется только при обновлении
+        return self.updated_at or self.created_at
+
+    @changed_at.expression
+    def changed_at(cls):
+        return func.coalesce(cls.updated_at, cls.created_at)
+
+    @validates("city", "country", "category")
+    def _set_filter_key(self, field, value):
+        if value is not None:
+            setattr(self, FILTER_KEY_COLUMNS[field], filter_key(value))
+        return value
+
+    @property
+    def rating_distribution(self):
+        return {
+            1: self.rating_1 or 0,
+            2: self.rating_2 or 0,
+            3: self.rating_3 or 0,
+            4: self.rating_4 or 0,
+            5: self.rating_5 or 0
+        }
+
     def __repr__(self):
-        return f"<Landmark {self.name} ({self.city})>"
\ No newline at end of file
+        return f"<Landmark {self.name} ({self.city})>"
+
+
+# Выборка изменений для дельта-синхронизации идет по (changed_at, id)
+Index('idx_landmark_changed_at', Landmark.changed_at, Landmark.id)
+
+# Фильтр по городу и категории; префикс индекса обслуживает фильтр только по городу
+Index('idx_landmark_city_category_key', Landmark.city_key, Landmark.category_key)
+
+# Полнотекстовый поиск: генерируемый столбец search_vector и GIN-индекс (только PostgreSQL).
+# В модели столбец не объявлен - он нужен только в условиях поиска
+LANDMARK_SEARCH_COLUMNS = (("name", "A"), ("city", "B"), ("description", "C"))
+for statement in search_vector_ddl("landmarks", LANDMARK_SEARCH_COLUMNS, "idx_landmark_search_vector"):
+    event.listen(Landmark.__table__, "after_create", DDL(statement).execute_if(dialect="postgresql"))
+
+# Нечеткий поиск по названию и городу: триграммные GIN-индексы pg_trgm (только PostgreSQL)
+for statement in (
+    "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+    "CREATE INDEX IF NOT EXISTS idx_landmark_name_trgm ON landmarks USING GIN (name gin_trgm_ops)",
+    "CREATE INDEX IF NOT EXISTS idx_landmark_city_trgm ON landmarks USING GIN (city gin_trgm_ops)",
+):
+    event.listen(Landmark.__table__, "after_create", DDL(statement).execute_if(dialect="postgresql"))
@@ -1,22 +1,13 @@
-<<<<<<< Updated upstream
-from sqlalchemy import Column, Integer, String, Text, ForeignKey, DateTime, Boolean, JSON
-=======
-from sqlalchemy import Column, Integer, String, Text, Boolean, ForeignKey, DateTime
->>>>>>> Stashed changes
+from sqlalchemy import Column, Integer, String, Text, ForeignKey, DateTime, Boolean, JSON, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.core.database import Base
 
-<<<<<<< Updated upstream
-=======
-
->>>>>>> Stashed changes
 class Notification(Base):
     __tablename__ = "notifications"
     
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True)
-<<<<<<< Updated upstream
     
     # Тип уведомления
     notification_type = Column(String(50), nullable=False, index=True)
@@ -39,20 +30,10 @@ class Notification(Base):
     # Связи
     user = relationship("User", back_populates="notifications")
     
-    def __repr__(self):
-        return f"<Notification {self.id} for user {self.user_id}>"
-=======
-    type = Column(String(50), nullable=False, index=True)  # new_answer, answer_liked, etc.
-    title = Column(String(200), nullable=False)
-    message = Column(Text, nullable=False)
-    related_id = Column(Integer, nullable=True)  # ID связанной сущности
-    related_type = Column(String(50), nullable=True)  # Тип сущности: discussion, answer, review
-    is_read = Column(Boolean, default=False)
-    created_at = Column(DateTime(timezone=True), server_default=func.now())
-    
-    # Отношения
-    user = relationship("User", back_populates="notifications")
+    # Индексы
+    __table_args__ = (
+        Index('idx_notifications_user_created', 'user_id', 'created_at', 'id'),
+    )
     
     def __repr__(self):
-        return f"<Notification {self.type} for user {self.user_id}>"
->>>>>>> Stashed changes
+        return f"<Notification {self.id} for user {self.user_id}>"
@@ -1,4 +1,5 @@
-from sqlalchemy import Column, Integer, ForeignKey, Text, Float, DateTime, UniqueConstraint, CheckConstraint
+from sqlalchemy import Column, Integer, ForeignKey, Text, Float, DateTime, UniqueConstraint, CheckConstraint, Index
+from sqlalchemy.ext.hybrid import hybrid_property
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.core.database import Base
@@ -21,8 +22,20 @@ class Review(Base):
     # Уникальное ограничение: один пользователь - один отзыв на достопримечательность
     __table_args__ = (
         UniqueConstraint('user_id', 'landmark_id', name='unique_user_landmark_review'),
-        CheckConstraint('rating >= 1 AND rating <= 5', name='rating_range_check')
+        CheckConstraint('rating >= 1 AND rating <= 5', name='rating_range_check'),
+        Index('idx_review_landmark_created', 'landmark_id', 'created_at', 'id'),
     )
 
+    @hybrid_property
+    def changed_at(self):
+        return self.updated_at or self.created_at
+
+    @changed_at.expression
+    def changed_at(cls):
+        return func.coalesce(cls.updated_at, cls.created_at)
+
     def __repr__(self):
-        return f"<Review user_id={self.user_id} landmark_id={self.landmark_id} rating={self.rating}>"
\ No newline at end of file
+        return f"<Review user_id={self.user_id} landmark_id={self.landmark_id} rating={self.rating}>"
+
+
+Index('idx_review_changed_at', Review.changed_at, Review.id)
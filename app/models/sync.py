@@ -0,0 +1,28 @@
+from sqlalchemy import Column, Integer, String, DateTime, Index
+from sqlalchemy.orm import synonym
+from sqlalchemy.sql import func
+from app.core.database import Base
+
+
+class DeletedRecord(Base):
+    """
+    Надгробие удаленной записи для дельта-синхронизации клиентов:
+    сами строки удаляются физически, а клиенту нужно узнать, что их больше нет
+    """
+    __tablename__ = "deleted_records"
+
+    id = Column(Integer, primary_key=True, index=True)
+    entity_type = Column(String(50), nullable=False)  # landmark, review
+    entity_id = Column(Integer, nullable=False)
+    # Для отзывов - достопримечательность, чтобы клиент мог найти запись без полного поиска
+    landmark_id = Column(Integer, nullable=True)
+    deleted_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    # Единое имя момента изменения для выборки изменений всех сущностей
+    changed_at = synonym("deleted_at")
+
+    __table_args__ = (
+        Index('idx_deleted_records_deleted_id', 'deleted_at', 'id'),
+    )
+
+    def __repr__(self):
+        return f"<DeletedRecord {self.entity_type} {self.entity_id}>"
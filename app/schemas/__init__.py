@@ -1,65 +1,54 @@
-from .user import User, UserCreate, UserLogin, UserInDB, UserUpdate, UserResponse
+from .user import User, UserCreate, UserLogin, UserInDB, UserUpdate, UserResponse, Token
+from .profile import UserProfileResponse, UserProfileUpdate, UserStatsResponse
 from .landmark import (
-    Landmark, LandmarkCreate, LandmarkUpdate, LandmarkResponse,
+    Landmark, LandmarkBase, LandmarkCreate, LandmarkUpdate, LandmarkResponse,
     LandmarkListResponse, FiltersResponse, LandmarkWithDistance
 )
-from .favorite import Favorite, FavoriteCreate, FavoriteResponse
-from .review import Review, ReviewCreate, ReviewUpdate, ReviewResponse
+from .favorite import (
+    Favorite, FavoriteBase, FavoriteCreate, FavoriteResponse,
+    FavoriteListResponse, FavoriteWithLandmarkResponse
+)
+from .review import (
+    Review, ReviewBase, ReviewCreate, ReviewUpdate, ReviewResponse,
+    ReviewListResponse, ReviewWithLandmarkResponse, LandmarkReviewSummary
+)
 from .discussion import (
-    Discussion, DiscussionCreate, DiscussionUpdate, DiscussionResponse,
-    AnswerCreate, AnswerUpdate, AnswerResponse, VoteCreate
+    Discussion, DiscussionBase, DiscussionCreate, DiscussionUpdate, DiscussionResponse,
+    DiscussionWithAnswersResponse, DiscussionListResponse,
+    AnswerCreate, AnswerUpdate, AnswerResponse, AnswerListResponse, VoteCreate,
+    DiscussionAnswerCreate, DiscussionAnswerUpdate, DiscussionAnswerResponse, HelpfulVote
 )
 from .city import (
     CityBase, CityProfileResponse, CityFilters, CityStatsResponse, 
     PopularCityResponse, CategoryStat
 )
 from .notification import (
-    NotificationBase, NotificationCreate, NotificationUpdate, 
-    NotificationResponse, UnreadCountResponse, NotificationListResponse,
-    NotificationType
-)
-from app.schemas.city import CityBase, CityProfileResponse, CityFilters, CityStatsResponse, PopularCityResponse
-from app.schemas.notification import (
     NotificationBase, NotificationCreate, NotificationUpdate, NotificationResponse,
     NotificationListResponse, NotificationStatsResponse, MarkAsReadRequest, MarkAsReadResponse
 )
 
 __all__ = [
-<<<<<<< Updated upstream
-    # Существующие
-    "UserCreate", "UserLogin", "UserResponse", "Token",
-    "UserProfileResponse", "UserProfileUpdate", "UserStatsResponse",
-    "LandmarkBase", "LandmarkCreate", "LandmarkResponse", "LandmarkUpdate", "LandmarkListResponse", "FiltersResponse", "LandmarkWithDistance",
-    "FavoriteBase", "FavoriteCreate", "FavoriteResponse", "FavoriteListResponse", "FavoriteWithLandmarkResponse",
-    "ReviewBase", "ReviewCreate", "ReviewUpdate", "ReviewResponse", "ReviewListResponse", "ReviewWithLandmarkResponse", "LandmarkReviewSummary",
-    # Новые - обсуждения
-    "DiscussionBase", "DiscussionCreate", "DiscussionUpdate", "DiscussionResponse", "DiscussionWithAnswersResponse",
-    "DiscussionAnswerBase", "DiscussionAnswerCreate", "DiscussionAnswerUpdate", "DiscussionAnswerResponse",
-    "DiscussionListResponse", "AnswerListResponse", "HelpfulVote",
-    # Города
-    "CityBase", "CityProfileResponse", "CityFilters", "CityStatsResponse", "PopularCityResponse",
-    # Уведомления
-    "NotificationBase", "NotificationCreate", "NotificationUpdate", "NotificationResponse",
-    "NotificationListResponse", "NotificationStatsResponse", "MarkAsReadRequest", "MarkAsReadResponse"
-=======
     # User
-    "User", "UserCreate", "UserLogin", "UserInDB", "UserUpdate", "UserResponse",
+    "User", "UserCreate", "UserLogin", "UserInDB", "UserUpdate", "UserResponse", "Token",
+    "UserProfileResponse", "UserProfileUpdate", "UserStatsResponse",
     # Landmark
-    "Landmark", "LandmarkCreate", "LandmarkUpdate", "LandmarkResponse",
+    "Landmark", "LandmarkBase", "LandmarkCreate", "LandmarkUpdate", "LandmarkResponse",
     "LandmarkListResponse", "FiltersResponse", "LandmarkWithDistance",
     # Favorite
-    "Favorite", "FavoriteCreate", "FavoriteResponse",
+    "Favorite", "FavoriteBase", "FavoriteCreate", "FavoriteResponse",
+    "FavoriteListResponse", "FavoriteWithLandmarkResponse",
     # Review
-    "Review", "ReviewCreate", "ReviewUpdate", "ReviewResponse",
+    "Review", "ReviewBase", "ReviewCreate", "ReviewUpdate", "ReviewResponse",
+    "ReviewListResponse", "ReviewWithLandmarkResponse", "LandmarkReviewSummary",
     # Discussion
-    "Discussion", "DiscussionCreate", "DiscussionUpdate", "DiscussionResponse",
-    "AnswerCreate", "AnswerUpdate", "AnswerResponse", "VoteCreate",
+    "Discussion", "DiscussionBase", "DiscussionCreate", "DiscussionUpdate", "DiscussionResponse",
+    "DiscussionWithAnswersResponse", "DiscussionListResponse",
+    "AnswerCreate", "AnswerUpdate", "AnswerResponse", "AnswerListResponse", "VoteCreate",
+    "DiscussionAnswerCreate", "DiscussionAnswerUpdate", "DiscussionAnswerResponse", "HelpfulVote",
     # City
     "CityBase", "CityProfileResponse", "CityFilters", "CityStatsResponse", 
     "PopularCityResponse", "CategoryStat",
     # Notification
-    "NotificationBase", "NotificationCreate", "NotificationUpdate", 
-    "NotificationResponse", "UnreadCountResponse", "NotificationListResponse",
-    "NotificationType",
->>>>>>> Stashed changes
+    "NotificationBase", "NotificationCreate", "NotificationUpdate", "NotificationResponse",
+    "NotificationListResponse", "NotificationStatsResponse", "MarkAsReadRequest", "MarkAsReadResponse"
 ]
\ No newline at end of file
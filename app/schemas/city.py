@@ -65,4 +65,9 @@ class CityFilters(BaseModel):
     categories: List[str]
 
     class Config:
-        from_attributes = True
\ No newline at end of file
+        from_attributes = True
+
+
+class CitySuggestion(BaseModel):
+    city: str
+    similarity: float
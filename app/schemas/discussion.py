@@ -1,5 +1,5 @@
 from pydantic import BaseModel, Field
-from typing import Optional
+from typing import Optional, List
 from datetime import datetime
 
 
@@ -26,7 +26,7 @@ class DiscussionResponse(DiscussionBase):
     user_name: str
     user_avatar: Optional[str] = None
     created_at: datetime
-    updated_at: datetime
+    updated_at: Optional[datetime] = None
     is_closed: bool
     answer_count: int
 
@@ -34,6 +34,32 @@ class DiscussionResponse(DiscussionBase):
         from_attributes = True
 
 
+class DiscussionListResponse(BaseModel):
+    items: List[DiscussionResponse]
+    total: Optional[int] = None
+    page: Optional[int] = None
+    size: int
+    pages: Optional[int] = None
+    next_cursor: Optional[str] = None
+
+
+class DiscussionSearchHit(DiscussionResponse):
+    answer_hits: int = Field(0, description="Количество ответов, совпавших с запросом")
+    rank: Optional[float] = Field(None, description="Релевантность (только PostgreSQL)")
+    # Фрагменты - экранированный HTML, совпадения выделены <b>...</b>
+    title_highlight: str
+    snippet: str
+    answer_snippet: Optional[str] = None
+
+
+class DiscussionSearchResponse(BaseModel):
+    items: List[DiscussionSearchHit]
+    total: Optional[int] = None
+    page: Optional[int] = None
+    size: int
+    pages: Optional[int] = None
+
+
 class AnswerBase(BaseModel):
     content: str = Field(..., min_length=1)
 
@@ -46,6 +72,15 @@ class AnswerUpdate(AnswerBase):
     pass
 
 
+class DiscussionAnswerCreate(AnswerBase):
+    """Ответ на обсуждение: discussion_id берется из пути запроса"""
+    pass
+
+
+class DiscussionAnswerUpdate(AnswerUpdate):
+    pass
+
+
 class AnswerResponse(AnswerBase):
     id: int
     user_id: int
@@ -53,7 +88,7 @@ class AnswerResponse(AnswerBase):
     user_avatar: Optional[str] = None
     discussion_id: int
     created_at: datetime
-    updated_at: datetime
+    updated_at: Optional[datetime] = None
     is_helpful: bool
     helpful_votes: int
 
@@ -61,10 +96,27 @@ class AnswerResponse(AnswerBase):
         from_attributes = True
 
 
+class DiscussionAnswerResponse(AnswerResponse):
+    pass
+
+
+class AnswerListResponse(BaseModel):
+    items: List[AnswerResponse]
+    total: Optional[int] = None
+
+
+class DiscussionWithAnswersResponse(DiscussionResponse):
+    answers: List[AnswerResponse] = []
+
+
 class VoteCreate(BaseModel):
     is_helpful: bool
 
 
+class HelpfulVote(VoteCreate):
+    pass
+
+
 # Для совместимости
 class Discussion(DiscussionResponse):
     pass
\ No newline at end of file
@@ -1,4 +1,4 @@
-from typing import Optional
+from typing import List, Optional
 from pydantic import BaseModel
 from datetime import datetime
 
@@ -23,6 +23,15 @@ class FavoriteResponse(FavoriteBase):
         from_attributes = True
 
 
+class FavoriteWithLandmarkResponse(FavoriteResponse):
+    pass
+
+
+class FavoriteListResponse(BaseModel):
+    items: List[FavoriteWithLandmarkResponse]
+    total: Optional[int] = None
+
+
 # Для совместимости
 class Favorite(FavoriteResponse):
     pass
\ No newline at end of file
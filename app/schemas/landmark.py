@@ -13,6 +13,7 @@ class LandmarkBase(BaseModel):
     longitude: float = Field(..., ge=-180, le=180, description="Долгота")
     address: Optional[str] = Field(None, max_length=500, description="Адрес")
     image_url: Optional[str] = Field(None, max_length=500, description="URL изображения")
+    external_id: Optional[str] = Field(None, max_length=100, description="Идентификатор во внешнем источнике")
 
 
 class LandmarkCreate(LandmarkBase):
@@ -35,6 +36,8 @@ class LandmarkResponse(LandmarkBase):
     id: int
     created_at: datetime
     updated_at: Optional[datetime] = None
+    review_count: int = 0
+    average_rating: Optional[float] = None
 
     class Config:
         from_attributes = True
@@ -50,12 +53,52 @@ class LandmarkWithDistance(LandmarkResponse):
     distance: Optional[float] = None
 
 
+class LandmarkWithSimilarity(LandmarkResponse):
+    # Заполняется только в режиме нечеткого поиска
+    similarity: Optional[float] = None
+
+
+class AutocompleteSuggestion(BaseModel):
+    kind: str = Field(..., description="landmark, city или category")
+    text: str
+    weight: int = Field(..., description="Популярность подсказки")
+    landmark_id: Optional[int] = None
+    city: Optional[str] = None
+
+
+class GeoPoint(BaseModel):
+    latitude: float = Field(..., ge=-90, le=90, description="Широта")
+    longitude: float = Field(..., ge=-180, le=180, description="Долгота")
+
+
+class NearbyBatchRequest(BaseModel):
+    points: List[GeoPoint] = Field(..., min_length=1, max_length=500, description="Исходные точки")
+    radius: float = Field(10, ge=1, le=100, description="Радиус поиска в км")
+    limit: int = Field(20, ge=1, le=100, description="Максимальное количество результатов на точку")
+
+
 class LandmarkListResponse(BaseModel):
-    items: List[LandmarkResponse]
-    total: int
-    page: int
+    items: List[LandmarkWithSimilarity]
+    total: Optional[int] = None
+    page: Optional[int] = None
     size: int
-    pages: int
+    pages: Optional[int] = None
+    next_cursor: Optional[str] = None
+
+
+class LandmarkImportError(BaseModel):
+    line: int
+    external_id: Optional[str] = None
+    error: str
+
+
+class LandmarkImportResult(BaseModel):
+    total: int
+    inserted: int
+    updated: int
+    failed: int
+    errors: List[LandmarkImportError]
+    errors_truncated: bool = False
 
 
 class FiltersResponse(BaseModel):
@@ -1,4 +1,3 @@
-<<<<<<< Updated upstream
 from pydantic import BaseModel, ConfigDict, Field
 from typing import Optional, Dict, Any, List
 from datetime import datetime
@@ -8,34 +7,10 @@ class NotificationBase(BaseModel):
     title: str = Field(..., min_length=1, max_length=200, description="Заголовок уведомления")
     message: str = Field(..., min_length=1, description="Текст уведомления")
     data: Optional[Dict[str, Any]] = Field(None, description="Дополнительные данные")
-=======
-from pydantic import BaseModel, Field
-from typing import Optional, List, Dict, Any
-from datetime import datetime
-from enum import Enum
-
-
-class NotificationType(str, Enum):
-    NEW_ANSWER = "new_answer"
-    ANSWER_LIKED = "answer_liked"
-    NEW_REVIEW = "new_review"
-    NEW_DISCUSSION = "new_discussion"
-    SYSTEM = "system"
-
-
-class NotificationBase(BaseModel):
-    type: NotificationType
-    title: str = Field(..., max_length=200)
-    message: str
-    related_id: Optional[int] = None
-    related_type: Optional[str] = None
-
->>>>>>> Stashed changes
 
 class NotificationCreate(NotificationBase):
     user_id: int
 
-<<<<<<< Updated upstream
 class NotificationUpdate(BaseModel):
     is_read: Optional[bool] = None
     is_archived: Optional[bool] = None
@@ -49,32 +24,12 @@ class NotificationResponse(NotificationBase):
     is_archived: bool
     created_at: datetime
     read_at: Optional[datetime] = None
-=======
-
-class NotificationUpdate(BaseModel):
-    is_read: Optional[bool] = None
-
-
-class NotificationResponse(NotificationBase):
-    id: int
-    user_id: int
-    is_read: bool
-    created_at: datetime
-
-    class Config:
-        from_attributes = True
-
-
-class UnreadCountResponse(BaseModel):
-    count: int
-
->>>>>>> Stashed changes
 
 class NotificationListResponse(BaseModel):
     items: List[NotificationResponse]
-    total: int
-<<<<<<< Updated upstream
+    total: Optional[int] = None
     unread_count: int
+    next_cursor: Optional[str] = None
 
 class NotificationStatsResponse(BaseModel):
     total: int
@@ -88,6 +43,3 @@ class MarkAsReadRequest(BaseModel):
 
 class MarkAsReadResponse(BaseModel):
     updated_count: int
-=======
-    unread_count: int
->>>>>>> Stashed changes
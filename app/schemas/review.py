@@ -1,5 +1,5 @@
 from pydantic import BaseModel, Field
-from typing import Optional
+from typing import Dict, Optional, List
 from datetime import datetime
 
 
@@ -23,12 +23,29 @@ class ReviewResponse(ReviewBase):
     user_id: int
     user_name: str
     created_at: datetime
-    updated_at: datetime
+    updated_at: Optional[datetime] = None
 
     class Config:
         from_attributes = True
 
 
+class ReviewWithLandmarkResponse(ReviewResponse):
+    landmark_name: str
+    landmark_city: str
+
+
 # Для совместимости
 class Review(ReviewResponse):
-    pass
\ No newline at end of file
+    pass
+
+
+class ReviewListResponse(BaseModel):
+    items: List[ReviewResponse]
+    total: Optional[int] = None
+    next_cursor: Optional[str] = None
+
+
+class LandmarkReviewSummary(BaseModel):
+    average_rating: Optional[float] = None
+    total_reviews: int
+    rating_distribution: Dict[int, int]
@@ -0,0 +1,41 @@
+from pydantic import BaseModel
+from typing import Dict, Optional, List
+from datetime import datetime
+
+from app.schemas.landmark import LandmarkResponse
+
+
+class SyncLandmark(LandmarkResponse):
+    rating_distribution: Dict[int, int]
+
+
+class SyncReview(BaseModel):
+    id: int
+    landmark_id: int
+    user_id: int
+    user_name: str
+    rating: float
+    comment: Optional[str] = None
+    created_at: datetime
+    updated_at: Optional[datetime] = None
+
+
+class DeletedRecordResponse(BaseModel):
+    entity_type: str
+    entity_id: int
+    landmark_id: Optional[int] = None
+    deleted_at: datetime
+
+    class Config:
+        from_attributes = True
+
+
+class SyncChangesResponse(BaseModel):
+    landmarks: List[SyncLandmark]
+    reviews: List[SyncReview]
+    deleted: List[DeletedRecordResponse]
+    # Передать в since следующего запроса
+    next_token: str
+    # Порция неполная - запросить еще раз с next_token
+    has_more: bool
+    server_time: datetime
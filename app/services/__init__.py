@@ -1,6 +1,10 @@
 from app.services.notification_service import NotificationService, notification_service
+from app.services.landmark_import import import_landmarks
+from app.services.data_export import stream_export
 
 __all__ = [
     "NotificationService",
-    "notification_service"
+    "notification_service",
+    "import_landmarks",
+    "stream_export"
 ]
\ No newline at end of file
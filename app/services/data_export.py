@@ -0,0 +1,105 @@
+"""
+Потоковая выгрузка достопримечательностей и отзывов в NDJSON/CSV
+"""
+from datetime import datetime
+from typing import Callable, Dict, Iterator, Optional
+
+from sqlalchemy.orm import Query, Session
+
+from app.core.streaming import DEFAULT_YIELD_PER, encode_rows, gzip_chunks, iter_query_rows
+from app.models.landmark import Landmark
+from app.models.review import Review
+
+EXPORT_ENTITIES = ("landmarks", "reviews")
+
+LANDMARK_EXPORT_FIELDS = (
+    "id", "external_id", "name", "description", "city", "country", "category",
+    "latitude", "longitude", "address", "image_url",
+    "review_count", "average_rating", "rating_1", "rating_2", "rating_3", "rating_4", "rating_5",
+    "created_at", "updated_at",
+)
+REVIEW_EXPORT_FIELDS = (
+    "id", "landmark_id", "user_id", "rating", "comment", "created_at", "updated_at",
+)
+
+
+def _landmark_query(
+    db: Session,
+    city: Optional[str],
+    category: Optional[str],
+    updated_since: Optional[datetime]
+) -> Query:
+    columns = [
+        Landmark.average_rating.label("average_rating") if field == "average_rating" else getattr(Landmark, field)
+        for field in LANDMARK_EXPORT_FIELDS
+    ]
+    query = db.query(*columns)
+    if city:
+        query = query.filter(Landmark.city == city)
+    if category:
+        query = query.filter(Landmark.category == category)
+    if updated_since:
+        query = query.filter(Landmark.changed_at >= updated_since)
+    return query.order_by(Landmark.id)
+
+
+def _review_query(
+    db: Session,
+    city: Optional[str],
+    category: Optional[str],
+    updated_since: Optional[datetime]
+) -> Query:
+    query = db.query(*[getattr(Review, field) for field in REVIEW_EXPORT_FIELDS])
+    if city or category:
+        query = query.join(Landmark, Landmark.id == Review.landmark_id)
+        if city:
+            query = query.filter(Landmark.city == city)
+        if category:
+            query = query.filter(Landmark.category == category)
+    if updated_since:
+        query = query.filter(Review.changed_at >= updated_since)
+    return query.order_by(Review.id)
+
+
+EXPORTS = {
+    "landmarks": (_landmark_query, LANDMARK_EXPORT_FIELDS),
+    "reviews": (_review_query, REVIEW_EXPORT_FIELDS),
+}
+
+
+def stream_export(
+    session_factory: Callable[[], Session],
+    entity: str,
+    export_format: str,
+    city: Optional[str] = None,
+    category: Optional[str] = None,
+    updated_since: Optional[datetime] = None,
+    compress: bool = False,
+    yield_per: int = DEFAULT_YIELD_PER
+) -> Iterator[bytes]:
+    """
+    Генератор байтов выгрузки для StreamingResponse или записи в файл.
+    Сессия открывается на время обхода и закрывается по его окончании
+    (в том числе при обрыве соединения клиентом), поэтому генератор не зависит
+    от жизненного цикла зависимости get_db.
+    """
+    build_query, fields = EXPORTS[entity]
+    db = session_factory()
+    try:
+        rows = iter_query_rows(build_query(db, city, category, updated_since), fields, yield_per=yield_per)
+        chunks = encode_rows(rows, fields, export_format)
+        if compress:
+            chunks = gzip_chunks(chunks)
+        yield from chunks
+    finally:
+        db.close()
+
+
+def export_headers(entity: str, export_format: str, compress: bool = False) -> Dict[str, str]:
+    """Заголовки ответа: имя файла и сжатие"""
+    filename = f"{entity}-{datetime.utcnow():%Y%m%d}.{export_format}"
+    headers = {"Content-Disposition": f'attachment; filename="{filename}"'}
+    if compress:
+        # Content-Encoding: клиенты HTTP распаковывают поток прозрачно
+        headers["Content-Encoding"] = "gzip"
+    return headers
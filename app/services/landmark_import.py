@@ -0,0 +1,147 @@
+"""
+Массовый импорт достопримечательностей из CSV и JSONL
+"""
+import csv
+import json
+from typing import Dict, IO, Iterator, List, Optional, Tuple
+
+from pydantic import ValidationError
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+
+from app.crud.landmark_crud import bulk_upsert_landmarks
+from app.schemas.landmark import LandmarkCreate
+
+IMPORT_FORMATS = ("csv", "jsonl")
+DEFAULT_BATCH_SIZE = 1000
+# Сколько ошибок возвращать в отчете (счетчик failed учитывает все)
+MAX_REPORTED_ERRORS = 1000
+
+
+def detect_format(filename: Optional[str]) -> Optional[str]:
+    """Формат по расширению файла"""
+    if not filename:
+        return None
+    name = filename.lower()
+    if name.endswith(".csv"):
+        return "csv"
+    if name.endswith((".jsonl", ".ndjson")):
+        return "jsonl"
+    return None
+
+
+def iter_records(stream: IO[str], file_format: str) -> Iterator[Tuple[int, Optional[Dict], Optional[str]]]:
+    """
+    Построчный разбор файла без чтения целиком.
+    Возвращает (номер строки, запись или None, ошибка разбора или None)
+    """
+    if file_format == "csv":
+        reader = csv.DictReader(stream)
+        for record in reader:
+            # Пустые ячейки CSV - отсутствующие значения
+            yield reader.line_num, {key: value for key, value in record.items() if key and value != ""}, None
+    elif file_format == "jsonl":
+        for line_number, line in enumerate(stream, start=1):
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError as e:
+                yield line_number, None, f"Некорректный JSON: {e.msg}"
+                continue
+            if not isinstance(record, dict):
+                yield line_number, None, "Строка должна быть JSON-объектом"
+                continue
+            yield line_number, record, None
+    else:
+        raise ValueError(f"Неизвестный формат импорта: {file_format}")
+
+
+def _validation_message(error: ValidationError) -> str:
+    return "; ".join(
+        f"{'.'.join(str(part) for part in item['loc'])}: {item['msg']}" for item in error.errors()
+    )
+
+
+class LandmarkImporter:
+    """
+    Накопление провалидированных строк в пачки и запись пачек через upsert.
+    Ошибки валидации и записи отдельных строк попадают в отчет и не прерывают импорт.
+    """
+
+    def __init__(self, db: Session, batch_size: int = DEFAULT_BATCH_SIZE):
+        self.db = db
+        self.batch_size = batch_size
+        self.batch: List[Tuple[int, LandmarkCreate]] = []
+        self.total = 0
+        self.inserted = 0
+        self.updated = 0
+        self.failed = 0
+        self.errors: List[Dict] = []
+
+    def add_error(self, line: int, error: str, external_id: Optional[str] = None) -> None:
+        self.failed += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append({"line": line, "external_id": external_id, "error": error})
+
+    def add(self, line: int, record: Optional[Dict], parse_error: Optional[str] = None) -> None:
+        self.total += 1
+        if parse_error is not None:
+            self.add_error(line, parse_error)
+            return
+        try:
+            landmark = LandmarkCreate(**record)
+        except ValidationError as e:
+            external_id = record.get("external_id")
+            self.add_error(line, _validation_message(e), str(external_id) if external_id is not None else None)
+            return
+        self.batch.append((line, landmark))
+        if len(self.batch) >= self.batch_size:
+            self.flush()
+
+    def flush(self) -> None:
+        batch, self.batch = self.batch, []
+        if not batch:
+            return
+        try:
+            inserted, updated = bulk_upsert_landmarks(self.db, [landmark for _, landmark in batch])
+            self.inserted += inserted
+            self.updated += updated
+        except SQLAlchemyError:
+            self.db.rollback()
+            # Пачка отклонена БД целиком - пишем по одной строке, чтобы найти виновные
+            for line, landmark in batch:
+                try:
+                    inserted, updated = bulk_upsert_landmarks(self.db, [landmark])
+                    self.inserted += inserted
+                    self.updated += updated
+                except SQLAlchemyError as e:
+                    self.db.rollback()
+                    self.add_error(line, f"Ошибка записи: {e.__class__.__name__}", landmark.external_id)
+
+    def result(self) -> Dict:
+        return {
+            "total": self.total,
+            "inserted": self.inserted,
+            "updated": self.updated,
+            "failed": self.failed,
+            "errors": self.errors,
+            "errors_truncated": self.failed > len(self.errors)
+        }
+
+
+def import_landmarks(
+    db: Session,
+    stream: IO[str],
+    file_format: str,
+    batch_size: int = DEFAULT_BATCH_SIZE
+) -> Dict:
+    """
+    Импортировать достопримечательности из текстового потока CSV или JSONL.
+    Возвращает отчет: сколько строк вставлено, обновлено и отклонено, с ошибками по строкам.
+    """
+    importer = LandmarkImporter(db, batch_size=batch_size)
+    for line, record, parse_error in iter_records(stream, file_format):
+        importer.add(line, record, parse_error)
+    importer.flush()
+    return importer.result()
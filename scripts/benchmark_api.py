@@ -0,0 +1,222 @@
+import sys
+import os
+import argparse
+import asyncio
+import json
+import platform
+import random
+import statistics
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+# Добавляем корневую директорию проекта в sys.path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from generate_synthetic_data import CITIES, SCALES, generate_dataset, truncate_tables
+
+# Самый активный пользователь синтетического набора (больше всего уведомлений)
+BENCH_EMAIL = "user1@example.com"
+
+
+def configure_environment(database_url):
+    """
+    Настройки приложения читаются при импорте, поэтому задаются до импорта app:
+    база для бенчмарка и заголовки X-DB-Queries с числом SQL-запросов
+    """
+    os.environ["DATABASE_URL"] = database_url
+    os.environ["QUERY_DEBUG_HEADERS"] = "true"
+    os.environ.setdefault("SECRET_KEY", "benchmark-secret-key")
+
+
+def build_scenarios(prefix, cities_prefix, landmark_ids, requests, seed):
+    """Детерминированный список путей для каждого эндпоинта"""
+    rng = random.Random(seed)
+
+    def point():
+        city = rng.choice(CITIES)
+        return rng.gauss(city[2], 0.05), rng.gauss(city[3], 0.08)
+
+    def nearby_path():
+        lat, lon = point()
+        return f"{prefix}/landmarks/nearby?latitude={lat:.5f}&longitude={lon:.5f}&radius=2&limit=20"
+
+    generators = {
+        "landmarks": lambda: f"{prefix}/landmarks?city={rng.choice(CITIES)[0]}&skip={rng.randrange(0, 200)}&limit=20",
+        "landmarks_nearby": nearby_path,
+        "review_summary": lambda: f"{prefix}/reviews/landmark/{rng.choice(landmark_ids)}/summary",
+        "city_profile": lambda: f"{cities_prefix}/profile/{rng.choice(CITIES)[0]}",
+        "discussions": lambda: f"{prefix}/discussions?city={rng.choice(CITIES)[0]}&limit=20",
+        "notifications": lambda: f"{prefix}/notifications?limit=20",
+    }
+    return {name: [make() for _ in range(requests)] for name, make in generators.items()}
+
+
+def percentile(values, fraction):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+async def run_scenario(client, paths, headers, concurrency, warmup):
+    """Прогнать пути через приложение и собрать задержки, статусы и число SQL-запросов"""
+    for path in paths[:warmup]:
+        await client.get(path, headers=headers)
+
+    queue = asyncio.Queue()
+    for path in paths:
+        queue.put_nowait(path)
+    latencies, queries, statuses = [], [], {}
+
+    async def worker():
+        while not queue.empty():
+            path = queue.get_nowait()
+            start = time.perf_counter()
+            response = await client.get(path, headers=headers)
+            latencies.append((time.perf_counter() - start) * 1000)
+            statuses[response.status_code] = statuses.get(response.status_code, 0) + 1
+            if "x-db-queries" in response.headers:
+                queries.append(int(response.headers["x-db-queries"]))
+
+    start = time.perf_counter()
+    await asyncio.gather(*[worker() for _ in range(concurrency)])
+    elapsed = time.perf_counter() - start
+
+    return {
+        "requests": len(latencies),
+        "statuses": {str(code): count for code, count in sorted(statuses.items())},
+        "throughput_rps": round(len(latencies) / elapsed, 2),
+        "latency_ms": {
+            "p50": round(percentile(latencies, 0.50), 3),
+            "p95": round(percentile(latencies, 0.95), 3),
+            "p99": round(percentile(latencies, 0.99), 3),
+            "max": round(max(latencies), 3),
+            "mean": round(statistics.mean(latencies), 3),
+        },
+        "queries": {
+            "p50": percentile(queries, 0.50) if queries else None,
+            "max": max(queries) if queries else None,
+        },
+    }
+
+
+async def run_benchmark(app, scenarios, token, concurrency, warmup, only):
+    import httpx
+
+    headers = {"Authorization": f"Bearer {token}"}
+    results = {}
+    async with httpx.AsyncClient(app=app, base_url="http://benchmark", timeout=120) as client:
+        for name, paths in scenarios.items():
+            if only and name not in only:
+                continue
+            results[name] = await run_scenario(client, paths, headers, concurrency, warmup)
+            result = results[name]
+            print(f"  {name:18} p50 {result['latency_ms']['p50']:8.2f} мс  "
+                  f"p95 {result['latency_ms']['p95']:8.2f} мс  p99 {result['latency_ms']['p99']:8.2f} мс  "
+                  f"{result['throughput_rps']:8.1f} запросов/с  SQL p50/max: "
+                  f"{result['queries']['p50']}/{result['queries']['max']}  статусы: {result['statuses']}")
+    return results
+
+
+def compare(results, baseline_path, threshold):
+    """Сравнить p95 с сохраненным результатом; вернуть число регрессий"""
+    baseline = json.loads(Path(baseline_path).read_text(encoding="utf-8"))["results"]
+    regressions = 0
+    print(f"\n📈 Сравнение с {baseline_path} (порог {threshold:.0%}):")
+    for name, result in results.items():
+        if name not in baseline:
+            continue
+        before, after = baseline[name]["latency_ms"]["p95"], result["latency_ms"]["p95"]
+        change = (after - before) / before if before else 0.0
+        marker = "❌" if change > threshold else "✅"
+        regressions += change > threshold
+        print(f"  {marker} {name:18} p95 {before:8.2f} -> {after:8.2f} мс ({change:+.1%}), "
+              f"SQL max {baseline[name]['queries']['max']} -> {result['queries']['max']}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Бенчмарк основных эндпоинтов API (в процессе, без сервера)")
+    parser.add_argument("--database-url", default="sqlite:///./benchmark.db",
+                        help="База для бенчмарка: PostgreSQL или SQLite")
+    parser.add_argument("--scale", choices=sorted(SCALES), default="small", help="Размер набора данных")
+    parser.add_argument("--landmarks", type=int, help="Переопределить число достопримечательностей")
+    parser.add_argument("--reviews", type=int, help="Переопределить число отзывов")
+    parser.add_argument("--skip-seed", action="store_true", help="Использовать уже заполненную базу")
+    parser.add_argument("--reset", action="store_true", help="Очистить таблицы перед генерацией")
+    parser.add_argument("--seed", type=int, default=42, help="Зерно генератора данных и запросов")
+    parser.add_argument("--requests", type=int, default=200, help="Запросов на эндпоинт")
+    parser.add_argument("--warmup", type=int, default=10, help="Прогревочных запросов на эндпоинт")
+    parser.add_argument("--concurrency", type=int, default=1, help="Параллельных клиентов")
+    parser.add_argument("--prefix", default="/api", help="Префикс основных роутеров")
+    parser.add_argument("--cities-prefix", default="/api/cities", help="Префикс роутера городов")
+    parser.add_argument("--only", nargs="*", help="Запустить только указанные сценарии")
+    parser.add_argument("--output", help="Сохранить результаты в JSON")
+    parser.add_argument("--compare", help="JSON с прошлым результатом для сравнения")
+    parser.add_argument("--threshold", type=float, default=0.2, help="Допустимый рост p95 при сравнении")
+    args = parser.parse_args()
+
+    configure_environment(args.database_url)
+
+    from app.core.database import Base, SessionLocal, engine
+    from app.core.security import create_access_token
+    from app.crud.landmark_crud import build_landmark_index
+    from app.main import app
+    from app.models.landmark import Landmark
+
+    scale = dict(SCALES[args.scale])
+    if args.landmarks:
+        scale["landmarks"] = args.landmarks
+    if args.reviews:
+        scale["reviews"] = args.reviews
+
+    db = SessionLocal()
+    try:
+        if args.skip_seed:
+            landmark_ids = [row.id for row in db.query(Landmark.id).order_by(Landmark.id)]
+        else:
+            Base.metadata.create_all(bind=engine)
+            if args.reset:
+                truncate_tables(db)
+            start = time.perf_counter()
+            try:
+                generate_dataset(db, scale, seed=args.seed)
+            except ValueError as e:
+                print(f"❌ {e}. Используйте --skip-seed или --reset")
+                sys.exit(1)
+            print(f"✅ Данные сгенерированы за {time.perf_counter() - start:.1f} с")
+            landmark_ids = [row.id for row in db.query(Landmark.id).order_by(Landmark.id)]
+        # Событие startup при работе через ASGI-транспорт не вызывается
+        build_landmark_index(db)
+    finally:
+        db.close()
+
+    if not landmark_ids:
+        print("❌ В базе нет достопримечательностей")
+        sys.exit(1)
+
+    scenarios = build_scenarios(args.prefix, args.cities_prefix, landmark_ids, args.requests, args.seed)
+    token = create_access_token(subject=BENCH_EMAIL)
+
+    print(f"\n🚀 {args.requests} запросов на эндпоинт, {args.concurrency} параллельно ({engine.dialect.name})")
+    results = asyncio.run(run_benchmark(app, scenarios, token, args.concurrency, args.warmup, args.only))
+
+    report = {
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "database": engine.dialect.name,
+        "python": platform.python_version(),
+        "scale": scale,
+        "seed": args.seed,
+        "requests": args.requests,
+        "concurrency": args.concurrency,
+        "results": results,
+    }
+    if args.output:
+        Path(args.output).write_text(json.dumps(report, ensure_ascii=False, indent=2), encoding="utf-8")
+        print(f"\n💾 Результаты сохранены в {args.output}")
+    if args.compare and compare(results, args.compare, args.threshold):
+        sys.exit(2)
+
+
+if __name__ == "__main__":
+    main()
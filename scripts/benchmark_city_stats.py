@@ -0,0 +1,115 @@
+import sys
+import argparse
+import statistics
+import time
+from pathlib import Path
+
+# Добавляем корневую директорию проекта в sys.path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from sqlalchemy import event, func
+from app.core.database import SessionLocal, engine
+from app.crud.city_crud import get_city_stats
+from app.models.city import CityProfile, CityCategoryStats
+from app.models.landmark import Landmark
+from app.models.review import Review
+from app.models.discussion import Discussion
+
+
+class QueryCounter:
+    """Считает SQL-запросы, выполненные движком"""
+
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, *args, **kwargs):
+        self.count += 1
+
+
+def legacy_city_stats(db, city_name):
+    """Прежняя реализация /cities/stats: отдельный запрос на каждую метрику"""
+    city_profile = db.query(CityProfile).filter(CityProfile.city_name == city_name).first()
+    if not city_profile:
+        return None
+
+    category_stats = db.query(CityCategoryStats).filter(
+        CityCategoryStats.city_name == city_name
+    ).all()
+
+    rating_distribution = {}
+    for i in range(1, 6):
+        rating_distribution[str(i)] = db.query(func.count()).filter(
+            Review.landmark_id.in_(db.query(Landmark.id).filter(Landmark.city == city_name)),
+            Review.rating == i
+        ).scalar() or 0
+
+    open_discussions = db.query(func.count()).filter(
+        Discussion.city == city_name, Discussion.is_closed == False
+    ).scalar() or 0
+    closed_discussions = db.query(func.count()).filter(
+        Discussion.city == city_name, Discussion.is_closed == True
+    ).scalar() or 0
+    discussions_with_answers = db.query(func.count()).filter(
+        Discussion.city == city_name, Discussion.answers.any()
+    ).scalar() or 0
+    landmarks_with_images = db.query(func.count()).filter(
+        Landmark.city == city_name, Landmark.image_url != None, Landmark.image_url != ""
+    ).scalar() or 0
+
+    return {
+        "category_stats": len(category_stats),
+        "rating_distribution": rating_distribution,
+        "open": open_discussions,
+        "closed": closed_discussions,
+        "with_answers": discussions_with_answers,
+        "with_images": landmarks_with_images
+    }
+
+
+def measure(db, fn, city_name, repeats):
+    """Количество запросов за вызов и время в миллисекундах (медиана, p95)"""
+    counter = QueryCounter()
+    event.listen(engine, "before_cursor_execute", counter)
+    try:
+        fn(db, city_name)
+        queries = counter.count
+
+        timings = []
+        for _ in range(repeats):
+            start = time.perf_counter()
+            fn(db, city_name)
+            timings.append((time.perf_counter() - start) * 1000)
+    finally:
+        event.remove(engine, "before_cursor_execute", counter)
+
+    timings.sort()
+    p95 = timings[min(len(timings) - 1, int(len(timings) * 0.95))]
+    return queries, statistics.median(timings), p95
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Сравнение старой и новой статистики города")
+    parser.add_argument("city", nargs="?", help="Город (по умолчанию - с наибольшим числом достопримечательностей)")
+    parser.add_argument("--repeats", type=int, default=50, help="Количество повторов")
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        city_name = args.city or db.query(Landmark.city).group_by(Landmark.city).order_by(
+            func.count(Landmark.id).desc()
+        ).limit(1).scalar()
+        if not city_name:
+            print("❌ В базе нет достопримечательностей")
+            return
+
+        print(f"🏙️  Город: {city_name}, повторов: {args.repeats}")
+        for title, fn in (("до (по запросу на метрику)", legacy_city_stats), ("после (get_city_stats)", get_city_stats)):
+            queries, median_ms, p95_ms = measure(db, fn, city_name, args.repeats)
+            print(f"  {title:30} запросов: {queries:3}  медиана: {median_ms:8.2f} мс  p95: {p95_ms:8.2f} мс")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
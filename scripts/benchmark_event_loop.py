@@ -0,0 +1,89 @@
+import sys
+import argparse
+import asyncio
+import statistics
+import time
+
+import httpx
+
+BASE_URL = "http://127.0.0.1:8000"
+
+
+def percentile(values, fraction):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+async def ping_loop(client, stop, latencies, interval):
+    """Раз в interval секунд запрашивает легкий эндпоинт и копит задержки"""
+    while not stop.is_set():
+        start = time.perf_counter()
+        await client.get("/")
+        latencies.append((time.perf_counter() - start) * 1000)
+        await asyncio.sleep(interval)
+
+
+async def load_worker(client, paths, requests_per_worker, counters):
+    """Последовательно выполняет тяжелые запросы к роутеру городов"""
+    for i in range(requests_per_worker):
+        response = await client.get(paths[i % len(paths)])
+        counters[response.status_code] = counters.get(response.status_code, 0) + 1
+
+
+async def run(base_url, city, prefix, concurrency, requests_per_worker, interval):
+    paths = [
+        f"{prefix}/profile/{city}",
+        f"{prefix}/stats/{city}",
+        f"{prefix}/popular",
+        f"{prefix}/{city}/landmarks/filtered",
+        f"{prefix}/{city}/categories",
+    ]
+    limits = httpx.Limits(max_connections=concurrency + 5)
+    async with httpx.AsyncClient(base_url=base_url, timeout=60, limits=limits) as client:
+        # Задержка пинга без нагрузки
+        idle, stop = [], asyncio.Event()
+        pinger = asyncio.create_task(ping_loop(client, stop, idle, interval))
+        await asyncio.sleep(1)
+        stop.set()
+        await pinger
+
+        # Задержка пинга, пока роутер городов обрабатывает concurrency параллельных потоков запросов
+        loaded, stop, counters = [], asyncio.Event(), {}
+        pinger = asyncio.create_task(ping_loop(client, stop, loaded, interval))
+        start = time.perf_counter()
+        await asyncio.gather(*[
+            load_worker(client, paths, requests_per_worker, counters) for _ in range(concurrency)
+        ])
+        elapsed = time.perf_counter() - start
+        stop.set()
+        await pinger
+
+    total = concurrency * requests_per_worker
+    print(f"🏙️  Нагрузка: {total} запросов к городам, {concurrency} параллельно, {elapsed:.2f} с "
+          f"({total / elapsed:.1f} запросов/с), статусы: {counters}")
+    for title, latencies in (("пинг без нагрузки", idle), ("пинг под нагрузкой", loaded)):
+        print(f"  {title:20} p50: {statistics.median(latencies):8.2f} мс  "
+              f"p95: {percentile(latencies, 0.95):8.2f} мс  max: {max(latencies):8.2f} мс")
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Проверка, что запросы к роутеру городов не останавливают остальные запросы"
+    )
+    parser.add_argument("city", nargs="?", default="Санкт-Петербург", help="Город для запросов")
+    parser.add_argument("--base-url", default=BASE_URL, help="Адрес запущенного сервера")
+    parser.add_argument("--prefix", default="/api/cities", help="Префикс роутера городов")
+    parser.add_argument("--concurrency", type=int, default=20, help="Количество параллельных клиентов")
+    parser.add_argument("--requests", type=int, default=20, help="Запросов на клиента")
+    parser.add_argument("--interval", type=float, default=0.01, help="Интервал пинга в секундах")
+    args = parser.parse_args()
+
+    try:
+        asyncio.run(run(args.base_url, args.city, args.prefix, args.concurrency, args.requests, args.interval))
+    except httpx.ConnectError:
+        print(f"❌ Сервер {args.base_url} недоступен")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
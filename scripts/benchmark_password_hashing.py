@@ -0,0 +1,66 @@
+import sys
+import argparse
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+# Добавляем корневую директорию проекта в sys.path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from app.core.config import settings
+from app.core.password_hasher import PasswordHashingService
+from app.core.security import pwd_context
+
+PASSWORD = "benchmark-password-123"
+
+
+def sequential_rate(fn, seconds):
+    """Операций в секунду в одном потоке"""
+    count, start = 0, time.perf_counter()
+    while time.perf_counter() - start < seconds:
+        fn()
+        count += 1
+    return count / (time.perf_counter() - start)
+
+
+def pool_rate(service, fn_name, args, total, clients):
+    """Операций в секунду через пул при clients одновременных клиентах"""
+    method = getattr(service, fn_name)
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=clients) as executor:
+        list(executor.map(lambda _: method(*args), range(total)))
+    return total / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Микробенчмарк Argon2: хэшей в секунду на ядро")
+    parser.add_argument("--seconds", type=float, default=3.0, help="Длительность однопоточного замера")
+    parser.add_argument("--total", type=int, default=0, help="Операций для замера пула (по умолчанию 4 на поток)")
+    args = parser.parse_args()
+
+    cores = os.cpu_count() or 1
+    workers = settings.PASSWORD_HASH_WORKERS or cores
+    total = args.total or workers * 4
+    hashed = pwd_context.hash(PASSWORD)
+
+    print(f"🔐 Argon2: time_cost={settings.ARGON2_TIME_COST}, memory_cost={settings.ARGON2_MEMORY_COST} КиБ, "
+          f"parallelism={settings.ARGON2_PARALLELISM}; ядер: {cores}, потоков пула: {workers}")
+
+    hash_rate = sequential_rate(lambda: pwd_context.hash(PASSWORD), args.seconds)
+    verify_rate = sequential_rate(lambda: pwd_context.verify(PASSWORD, hashed), args.seconds)
+    print(f"  один поток:  хэширование {hash_rate:7.2f}/с, проверка {verify_rate:7.2f}/с")
+
+    service = PasswordHashingService(workers=workers, queue_limit=total)
+    try:
+        pool_hash = pool_rate(service, "hash", (PASSWORD,), total, workers)
+        pool_verify = pool_rate(service, "verify", (PASSWORD, hashed), total, workers)
+    finally:
+        service.shutdown()
+    print(f"  пул:         хэширование {pool_hash:7.2f}/с, проверка {pool_verify:7.2f}/с")
+    print(f"  на ядро:     хэширование {pool_hash / cores:7.2f}/с, проверка {pool_verify / cores:7.2f}/с")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,46 @@
+import sys
+import argparse
+import time
+from datetime import datetime
+from pathlib import Path
+
+# Добавляем корневую директорию проекта в sys.path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from app.core.database import SessionLocal
+from app.core.streaming import STREAM_FORMATS
+from app.services.data_export import EXPORT_ENTITIES, stream_export
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Потоковая выгрузка достопримечательностей или отзывов в NDJSON/CSV")
+    parser.add_argument("entity", choices=EXPORT_ENTITIES, help="Что выгружать")
+    parser.add_argument("path", help="Файл результата")
+    parser.add_argument("--format", choices=STREAM_FORMATS, default="ndjson", help="Формат выгрузки")
+    parser.add_argument("--city", help="Фильтр по городу")
+    parser.add_argument("--category", help="Фильтр по категории")
+    parser.add_argument("--updated-since", type=datetime.fromisoformat, help="Только измененные с даты (ISO 8601)")
+    parser.add_argument("--gzip", action="store_true", help="Сжать результат gzip")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    size = 0
+    with open(args.path, "wb") as output:
+        for chunk in stream_export(
+            SessionLocal,
+            args.entity,
+            args.format,
+            city=args.city,
+            category=args.category,
+            updated_since=args.updated_since,
+            compress=args.gzip
+        ):
+            output.write(chunk)
+            size += len(chunk)
+
+    print(f"✅ {args.path}: {size / 1024 / 1024:.1f} МБ за {time.perf_counter() - start:.1f} с")
+
+
+if __name__ == "__main__":
+    main()
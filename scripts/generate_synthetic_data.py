@@ -0,0 +1,392 @@
+import sys
+import argparse
+import csv
+import io
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+import numpy as np
+
+# Добавляем корневую директорию проекта в sys.path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+# Готовые размеры наборов данных
+SCALES = {
+    "tiny": dict(users=200, landmarks=1_000, reviews=5_000, favorites=2_000, discussions=500, notifications=5_000),
+    "small": dict(users=2_000, landmarks=10_000, reviews=100_000, favorites=30_000, discussions=5_000, notifications=50_000),
+    "medium": dict(users=20_000, landmarks=100_000, reviews=1_000_000, favorites=300_000, discussions=50_000, notifications=500_000),
+    "large": dict(users=100_000, landmarks=1_000_000, reviews=5_000_000, favorites=2_000_000, discussions=200_000, notifications=2_000_000),
+}
+
+# Города: название, страна, центр, относительный вес (доля достопримечательностей)
+CITIES = [
+    ("Санкт-Петербург", "Россия", 59.9343, 30.3351, 0.22),
+    ("Москва", "Россия", 55.7558, 37.6173, 0.30),
+    ("Казань", "Россия", 55.7963, 49.1088, 0.08),
+    ("Нижний Новгород", "Россия", 56.3269, 44.0059, 0.07),
+    ("Екатеринбург", "Россия", 56.8389, 60.6057, 0.07),
+    ("Калининград", "Россия", 54.7104, 20.4522, 0.06),
+    ("Сочи", "Россия", 43.5855, 39.7231, 0.06),
+    ("Новосибирск", "Россия", 55.0084, 82.9357, 0.05),
+    ("Ярославль", "Россия", 57.6261, 39.8845, 0.04),
+    ("Владимир", "Россия", 56.1290, 40.4070, 0.03),
+    ("Псков", "Россия", 57.8136, 28.3496, 0.02),
+]
+CATEGORIES = [
+    ("Музей", 0.20), ("Храм", 0.16), ("Памятник", 0.16), ("Парк", 0.12), ("Дворец", 0.06),
+    ("Театр", 0.06), ("Мост", 0.05), ("Площадь", 0.06), ("Галерея", 0.07), ("Усадьба", 0.06),
+]
+NAME_WORDS = [
+    "Заря", "Север", "Волна", "Парус", "Маяк", "Рассвет", "Звезда", "Радуга", "Ладога", "Нева",
+    "Сокол", "Березка", "Кремль", "Гавань", "Орбита", "Аврора", "Исток", "Причал", "Янтарь", "Пристань",
+]
+DESCRIPTION_WORDS = [
+    "история", "архитектура", "экспозиция", "вид", "набережная", "колокольня", "фонтан", "сад",
+    "коллекция", "росписи", "экскурсия", "фасад", "купол", "аллея", "выставка", "реставрация",
+]
+NOTIFICATION_TYPES = ["new_answer", "answer_liked", "discussion_closed", "review_reply"]
+
+BATCH_SIZE = 50_000
+# Отметка времени, от которой отсчитываются даты (для воспроизводимости)
+DEFAULT_BASE_TIME = datetime(2026, 1, 1, tzinfo=timezone.utc)
+HISTORY_DAYS = 730
+
+
+def power_law_cdf(n, alpha, rng=None):
+    """
+    Функция распределения степенного закона по n объектам: вес ранга k равен 1/k^alpha.
+    Если передан rng, ранги перемешиваются, иначе самые популярные - первые id
+    """
+    weights = 1.0 / np.arange(1, n + 1, dtype=np.float64) ** alpha
+    if rng is not None:
+        weights = weights[rng.permutation(n)]
+    cdf = np.cumsum(weights)
+    return cdf / cdf[-1]
+
+
+def sample(rng, cdf, size):
+    """Индексы объектов (с нуля) по функции распределения"""
+    return np.minimum(np.searchsorted(cdf, rng.random(size)), len(cdf) - 1)
+
+
+def unique_pairs(rng, user_cdf, landmark_cdf, total):
+    """
+    Уникальные пары (пользователь, достопримечательность) с популярностью по степенному
+    закону - для отзывов и избранного, где пара ограничена уникальным ключом
+    """
+    landmarks = len(landmark_cdf)
+    total = min(total, len(user_cdf) * landmarks)
+    keys = np.empty(0, dtype=np.int64)
+    while len(keys) < total:
+        need = int((total - len(keys)) * 1.3) + 1000
+        batch = sample(rng, user_cdf, need).astype(np.int64) * landmarks + sample(rng, landmark_cdf, need)
+        keys = np.unique(np.concatenate([keys, batch]))
+    # Перемешиваем, чтобы даты создания не зависели от id пользователя
+    keys = rng.permutation(keys)[:total]
+    return keys // landmarks, keys % landmarks
+
+
+def timestamps(rng, base_time, size, days=HISTORY_DAYS):
+    seconds = rng.integers(0, days * 86400, size)
+    return [base_time - timedelta(seconds=int(value)) for value in seconds]
+
+
+class BulkLoader:
+    """
+    Загрузка строк пачками: в PostgreSQL через COPY FROM STDIN,
+    в остальных СУБД через executemany
+    """
+
+    def __init__(self, connection):
+        self.connection = connection
+        self.is_postgresql = connection.dialect.name == "postgresql"
+        self.counts = {}
+
+    def load(self, table, columns, rows):
+        batch = []
+        for row in rows:
+            batch.append(row)
+            if len(batch) >= BATCH_SIZE:
+                self._flush(table, columns, batch)
+                batch = []
+        if batch:
+            self._flush(table, columns, batch)
+
+    def _flush(self, table, columns, batch):
+        if self.is_postgresql:
+            buffer = io.StringIO()
+            writer = csv.writer(buffer)
+            for row in batch:
+                # В CSV-формате COPY пустое значение без кавычек - NULL
+                writer.writerow(["" if value is None else value for value in row])
+            buffer.seek(0)
+            cursor = self.connection.connection.cursor()
+            try:
+                cursor.copy_expert(
+                    f"COPY {table.name} ({', '.join(columns)}) FROM STDIN WITH (FORMAT csv)", buffer
+                )
+            finally:
+                cursor.close()
+        else:
+            self.connection.execute(table.insert(), [dict(zip(columns, row)) for row in batch])
+        self.counts[table.name] = self.counts.get(table.name, 0) + len(batch)
+
+    def reset_sequences(self, tables):
+        """После загрузки с явными id сдвигаем последовательности PostgreSQL"""
+        if not self.is_postgresql:
+            return
+        from sqlalchemy import text
+        for table in tables:
+            self.connection.execute(text(
+                f"SELECT setval(pg_get_serial_sequence('{table.name}', 'id'), "
+                f"COALESCE((SELECT MAX(id) FROM {table.name}), 1))"
+            ))
+
+
+def generate_dataset(db, scale, seed=42, base_time=DEFAULT_BASE_TIME, log=print):
+    """
+    Сгенерировать детерминированный набор данных в пустую базу.
+
+    Достопримечательности сгруппированы вокруг центров городов (несколько районов
+    на город), популярность достопримечательностей и активность пользователей
+    подчиняются степенному закону. Пользователь 1 (user1@example.com) - самый
+    активный. Возвращает количество строк по таблицам.
+    """
+    from app.core.filter_keys import filter_key
+    from app.core.security import get_password_hash
+    from app.crud.city_crud import rebuild_city_stats
+    from app.crud.review_crud import recompute_rating_aggregates
+    from app.models.discussion import Discussion, DiscussionAnswer
+    from app.models.favorite import Favorite
+    from app.models.landmark import Landmark
+    from app.models.notification import Notification
+    from app.models.review import Review
+    from app.models.user import User
+
+    if db.query(User.id).first() is not None or db.query(Landmark.id).first() is not None:
+        raise ValueError("База не пуста: генератор загружает данные только в пустые таблицы")
+
+    rng = np.random.default_rng(seed)
+    loader = BulkLoader(db.connection())
+    n_users, n_landmarks = scale["users"], scale["landmarks"]
+
+    # Пользователи: один хэш пароля на всех, чтобы не считать Argon2 миллионы раз
+    log(f"👤 Пользователи: {n_users}")
+    password = get_password_hash("password123")
+    user_created = timestamps(rng, base_time, n_users)
+    loader.load(User.__table__, ["id", "email", "hashed_password", "full_name", "reputation_score", "created_at"], (
+        (i, f"user{i}@example.com", password, f"Пользователь {i}", 0, user_created[i - 1])
+        for i in range(1, n_users + 1)
+    ))
+
+    # Достопримечательности: город по весу, внутри города - район (смесь гауссиан)
+    log(f"🏛️  Достопримечательности: {n_landmarks}")
+    city_weights = np.array([city[4] for city in CITIES])
+    city_index = rng.choice(len(CITIES), n_landmarks, p=city_weights / city_weights.sum())
+    districts = rng.normal(0.0, 0.04, (len(CITIES), 6, 2))
+    district_index = rng.integers(0, 6, n_landmarks)
+    outskirts = rng.random(n_landmarks) < 0.15
+    spread = np.where(outskirts, 0.12, 0.012)
+    centers = np.array([[city[2], city[3]] for city in CITIES])
+    offsets = districts[city_index, district_index] * (~outskirts)[:, None] + rng.normal(0, 1, (n_landmarks, 2)) * spread[:, None]
+    latitudes = centers[city_index, 0] + offsets[:, 0]
+    longitudes = centers[city_index, 1] + offsets[:, 1] / np.cos(np.radians(centers[city_index, 0]))
+    category_weights = np.array([category[1] for category in CATEGORIES])
+    category_index = rng.choice(len(CATEGORIES), n_landmarks, p=category_weights / category_weights.sum())
+    name_index = rng.integers(0, len(NAME_WORDS), n_landmarks)
+    word_index = rng.integers(0, len(DESCRIPTION_WORDS), (n_landmarks, 3))
+    has_image = rng.random(n_landmarks) < 0.7
+    landmark_created = timestamps(rng, base_time, n_landmarks)
+    # Качество определяет средний рейтинг отзывов
+    quality = np.clip(rng.normal(4.0, 0.6, n_landmarks), 1.0, 5.0)
+
+    # COPY минует валидаторы модели - ключи точных фильтров считаем здесь (по одному на значение)
+    city_keys = {city[0]: (filter_key(city[0]), filter_key(city[1])) for city in CITIES}
+    category_keys = {category[0]: filter_key(category[0]) for category in CATEGORIES}
+
+    def landmark_rows():
+        for i in range(n_landmarks):
+            city, country = CITIES[city_index[i]][0], CITIES[city_index[i]][1]
+            category = CATEGORIES[category_index[i]][0]
+            words = ", ".join(DESCRIPTION_WORDS[j] for j in word_index[i])
+            yield (
+                i + 1, f"{category} «{NAME_WORDS[name_index[i]]}» {i + 1}",
+                f"{category} в городе {city}: {words}.", city, country, category,
+                round(float(latitudes[i]), 6), round(float(longitudes[i]), 6),
+                f"{city}, ул. Синтетическая, {i + 1}",
+                f"https://example.com/images/{i + 1}.jpg" if has_image[i] else None,
+                landmark_created[i], *city_keys[city], category_keys[category],
+            )
+
+    loader.load(Landmark.__table__, [
+        "id", "name", "description", "city", "country", "category",
+        "latitude", "longitude", "address", "image_url", "created_at",
+        "city_key", "country_key", "category_key",
+    ], landmark_rows())
+
+    user_cdf = power_law_cdf(n_users, 1.0)
+    landmark_cdf = power_law_cdf(n_landmarks, 0.9, rng)
+
+    log(f"⭐ Отзывы: {scale['reviews']}")
+    review_users, review_landmarks = unique_pairs(rng, user_cdf, landmark_cdf, scale["reviews"])
+    ratings = np.clip(np.rint(quality[review_landmarks] + rng.normal(0, 0.9, len(review_users))), 1, 5)
+    review_created = timestamps(rng, base_time, len(review_users))
+    has_comment = rng.random(len(review_users)) < 0.6
+    loader.load(Review.__table__, ["id", "user_id", "landmark_id", "rating", "comment", "created_at"], (
+        (i + 1, int(review_users[i]) + 1, int(review_landmarks[i]) + 1, float(ratings[i]),
+         "Синтетический отзыв" if has_comment[i] else None, review_created[i])
+        for i in range(len(review_users))
+    ))
+
+    log(f"❤️  Избранное: {scale['favorites']}")
+    favorite_users, favorite_landmarks = unique_pairs(rng, user_cdf, landmark_cdf, scale["favorites"])
+    favorite_created = timestamps(rng, base_time, len(favorite_users))
+    loader.load(Favorite.__table__, ["id", "user_id", "landmark_id", "created_at"], (
+        (i + 1, int(favorite_users[i]) + 1, int(favorite_landmarks[i]) + 1, favorite_created[i])
+        for i in range(len(favorite_users))
+    ))
+
+    # Обсуждения: 70% о достопримечательности (город берется из нее), остальные о городе
+    n_discussions = scale["discussions"]
+    log(f"💬 Обсуждения: {n_discussions}")
+    discussion_users = sample(rng, user_cdf, n_discussions)
+    discussion_landmarks = sample(rng, landmark_cdf, n_discussions)
+    about_landmark = rng.random(n_discussions) < 0.7
+    discussion_cities = rng.choice(len(CITIES), n_discussions, p=city_weights / city_weights.sum())
+    answer_counts = np.minimum(rng.zipf(2.2, n_discussions) - 1, 200)
+    closed = rng.random(n_discussions) < 0.2
+    discussion_created = timestamps(rng, base_time, n_discussions)
+
+    def discussion_rows():
+        for i in range(n_discussions):
+            landmark = int(discussion_landmarks[i])
+            city = CITIES[city_index[landmark] if about_landmark[i] else discussion_cities[i]][0]
+            yield (
+                i + 1, f"Вопрос {i + 1}: {DESCRIPTION_WORDS[i % len(DESCRIPTION_WORDS)]}",
+                f"Подскажите, где лучше посмотреть {DESCRIPTION_WORDS[(i * 7) % len(DESCRIPTION_WORDS)]}?",
+                int(discussion_users[i]) + 1, landmark + 1 if about_landmark[i] else None, city,
+                discussion_created[i], bool(closed[i]), int(answer_counts[i]),
+            )
+
+    loader.load(Discussion.__table__, [
+        "id", "title", "content", "user_id", "landmark_id", "city", "created_at", "is_closed", "answer_count",
+    ], discussion_rows())
+
+    n_answers = int(answer_counts.sum())
+    log(f"🗨️  Ответы: {n_answers}")
+    answer_discussions = np.repeat(np.arange(n_discussions), answer_counts)
+    answer_users = sample(rng, user_cdf, n_answers)
+    answer_delay = rng.integers(60, 14 * 86400, n_answers)
+    helpful_votes = np.minimum(rng.zipf(2.5, n_answers) - 1, 500)
+    loader.load(DiscussionAnswer.__table__, [
+        "id", "content", "user_id", "discussion_id", "created_at", "is_helpful", "helpful_votes",
+    ], (
+        (i + 1, f"Ответ {i + 1}", int(answer_users[i]) + 1, int(answer_discussions[i]) + 1,
+         discussion_created[answer_discussions[i]] + timedelta(seconds=int(answer_delay[i])),
+         bool(helpful_votes[i] >= 5), int(helpful_votes[i]))
+        for i in range(n_answers)
+    ))
+
+    # Уведомления: накопившиеся у активных пользователей, старые чаще прочитаны
+    n_notifications = scale["notifications"]
+    log(f"🔔 Уведомления: {n_notifications}")
+    notification_users = sample(rng, user_cdf, n_notifications)
+    notification_types = rng.integers(0, len(NOTIFICATION_TYPES), n_notifications)
+    notification_age = rng.integers(0, 180 * 86400, n_notifications)
+    is_read = rng.random(n_notifications) < np.minimum(0.95, notification_age / (30 * 86400))
+    related = rng.integers(1, max(n_discussions, 1) + 1, n_notifications)
+    # В ветках модели уведомлений тип и связанная сущность хранятся в разных колонках
+    notification_columns = Notification.__table__.columns
+    if "notification_type" in notification_columns:
+        columns = ["id", "user_id", "notification_type", "title", "message", "is_read", "is_archived", "created_at"]
+
+        def extra(i):
+            return (False,)
+    else:
+        columns = ["id", "user_id", "type", "title", "message", "is_read", "related_id", "related_type", "created_at"]
+
+        def extra(i):
+            return (int(related[i]), "discussion")
+
+    loader.load(Notification.__table__, columns, (
+        (i + 1, int(notification_users[i]) + 1, NOTIFICATION_TYPES[notification_types[i]], "Новое событие",
+         f"Уведомление {i + 1}", bool(is_read[i])) + extra(i)
+        + (base_time - timedelta(seconds=int(notification_age[i])),)
+        for i in range(n_notifications)
+    ))
+
+    loader.reset_sequences([
+        User.__table__, Landmark.__table__, Review.__table__, Favorite.__table__,
+        Discussion.__table__, DiscussionAnswer.__table__, Notification.__table__,
+    ])
+
+    log("📊 Пересчет агрегатов рейтингов и статистики городов...")
+    recompute_rating_aggregates(db)
+    rebuild_city_stats(db)
+    db.commit()
+    return loader.counts
+
+
+def truncate_tables(db):
+    """Очистить таблицы с данными (схема и версия миграций сохраняются)"""
+    from sqlalchemy import text
+    from app.core.database import Base
+
+    tables = [table for table in reversed(Base.metadata.sorted_tables)]
+    if db.bind.dialect.name == "postgresql":
+        db.execute(text(f"TRUNCATE {', '.join(table.name for table in tables)} RESTART IDENTITY CASCADE"))
+    else:
+        for table in tables:
+            db.execute(table.delete())
+    db.commit()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Генерация больших воспроизводимых наборов данных")
+    parser.add_argument("--scale", choices=list(SCALES), default="small", help="Размер набора данных")
+    parser.add_argument("--seed", type=int, default=42, help="Зерно генератора")
+    parser.add_argument("--database-url", help="База для загрузки (по умолчанию из настроек)")
+    parser.add_argument("--create-tables", action="store_true", help="Создать недостающие таблицы по моделям")
+    parser.add_argument("--reset", action="store_true", help="Очистить таблицы перед загрузкой")
+    for name in SCALES["small"]:
+        parser.add_argument(f"--{name}", type=int, help=f"Переопределить количество: {name}")
+    args = parser.parse_args()
+
+    if args.database_url:
+        import os
+        os.environ["DATABASE_URL"] = args.database_url
+
+    import app.models  # noqa: F401 - регистрация всех моделей в metadata
+    from app.core.database import Base, SessionLocal, engine
+
+    scale = dict(SCALES[args.scale])
+    for name in scale:
+        if getattr(args, name) is not None:
+            scale[name] = getattr(args, name)
+
+    if args.create_tables:
+        Base.metadata.create_all(bind=engine)
+
+    db = SessionLocal()
+    try:
+        if args.reset:
+            truncate_tables(db)
+            print("✅ Таблицы очищены")
+        start = time.perf_counter()
+        counts = generate_dataset(db, scale, seed=args.seed)
+        elapsed = time.perf_counter() - start
+        print(f"✅ Загружено {sum(counts.values())} строк за {elapsed:.1f} с ({engine.dialect.name}):")
+        for table, count in counts.items():
+            print(f"   {table}: {count}")
+    except ValueError as e:
+        db.rollback()
+        print(f"❌ {e}. Используйте --reset")
+        sys.exit(1)
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,47 @@
+import sys
+import argparse
+import time
+from pathlib import Path
+
+# Добавляем корневую директорию проекта в sys.path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from app.core.database import SessionLocal
+from app.services.landmark_import import DEFAULT_BATCH_SIZE, IMPORT_FORMATS, detect_format, import_landmarks
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Массовый импорт достопримечательностей из CSV или JSONL")
+    parser.add_argument("path", help="Путь к файлу")
+    parser.add_argument("--format", choices=IMPORT_FORMATS, help="Формат файла (по умолчанию по расширению)")
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE, help="Размер пачки записи")
+    parser.add_argument("--show-errors", type=int, default=20, help="Сколько ошибок вывести")
+    args = parser.parse_args()
+
+    file_format = args.format or detect_format(args.path)
+    if file_format is None:
+        print("❌ Не удалось определить формат файла, укажите --format")
+        sys.exit(1)
+
+    db = SessionLocal()
+    try:
+        start = time.perf_counter()
+        with open(args.path, encoding="utf-8-sig", newline="") as stream:
+            result = import_landmarks(db, stream, file_format, batch_size=args.batch_size)
+        elapsed = time.perf_counter() - start
+    finally:
+        db.close()
+
+    print(f"✅ Обработано строк: {result['total']} за {elapsed:.1f} с")
+    print(f"   вставлено: {result['inserted']}, обновлено: {result['updated']}, с ошибками: {result['failed']}")
+    for error in result["errors"][:args.show_errors]:
+        key = f" [{error['external_id']}]" if error["external_id"] else ""
+        print(f"   ❌ строка {error['line']}{key}: {error['error']}")
+    if result["failed"] > args.show_errors:
+        print(f"   ... и еще {result['failed'] - args.show_errors}")
+    sys.exit(1 if result["failed"] else 0)
+
+
+if __name__ == "__main__":
+    main()
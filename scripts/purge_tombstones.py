@@ -0,0 +1,26 @@
+import sys
+from pathlib import Path
+
+# Добавляем корневую директорию проекта в sys.path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.crud.sync_crud import purge_deleted_records
+
+
+def purge_tombstones(retention_days=None):
+    """Удаляет надгробия дельта-синхронизации старше срока хранения"""
+    db = SessionLocal()
+    try:
+        deleted = purge_deleted_records(db, retention_days)
+        days = settings.SYNC_TOMBSTONE_RETENTION_DAYS if retention_days is None else retention_days
+        print(f"✅ Удалено надгробий старше {days} дн.: {deleted}")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    # Необязательный аргумент - срок хранения в днях (по умолчанию SYNC_TOMBSTONE_RETENTION_DAYS)
+    purge_tombstones(int(sys.argv[1]) if len(sys.argv) > 1 else None)
@@ -0,0 +1,37 @@
+import sys
+from pathlib import Path
+
+# Добавляем корневую директорию проекта в sys.path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from app.core.database import SessionLocal
+from app.crud.city_crud import rebuild_city_stats
+from app.crud.review_crud import recompute_rating_aggregates
+from app.models.landmark import Landmark
+
+
+def repair_rating_aggregates(landmark_ids=None):
+    """
+    Пересчитывает агрегаты отзывов достопримечательностей по таблице reviews
+    и статистику их городов, которая строится из этих агрегатов
+    """
+    db = SessionLocal()
+    try:
+        updated = recompute_rating_aggregates(db, landmark_ids)
+        print(f"✅ Агрегаты отзывов пересчитаны, достопримечательностей с отзывами: {updated}")
+
+        cities = None
+        if landmark_ids is not None:
+            cities = [city for city, in db.query(Landmark.city).filter(Landmark.id.in_(landmark_ids)).distinct()]
+        total = rebuild_city_stats(db, cities)
+        db.commit()
+        print(f"✅ Статистика городов пересчитана: {total}")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    # Необязательные аргументы - id достопримечательностей для точечного пересчета
+    ids = [int(arg) for arg in sys.argv[1:]] or None
+    repair_rating_aggregates(ids)
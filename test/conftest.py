@@ -0,0 +1,50 @@
+import os
+from contextlib import contextmanager
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+# Без явной базы движок приложения создается на SQLite в памяти (драйвер PostgreSQL не нужен)
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+
+from app.core.query_inspector import QueryCounter
+
+
+@pytest.fixture
+def max_queries():
+    """
+    Проверка, что блок выполняет не больше limit SQL-запросов:
+
+        def test_discussions(client, max_queries):
+            with max_queries(3):
+                client.get("/api/discussions")
+
+    По умолчанию считаются запросы движка приложения (app.core.database.engine).
+    """
+    @contextmanager
+    def check(limit: int, engine=None):
+        if engine is None:
+            from app.core.database import engine
+        with QueryCounter(engine) as counter:
+            yield counter
+        assert counter.count <= limit, f"Ожидалось не больше {limit} SQL-запросов, выполнено {counter.report()}"
+
+    return check
+
+
+@pytest.fixture
+def app_db():
+    """
+    Сессия отдельной базы SQLite в памяти со схемой всех моделей приложения
+    """
+    import app.models  # noqa: F401 - регистрация всех моделей в metadata
+    from app.core.database import Base
+
+    engine = create_engine("sqlite://", poolclass=StaticPool, connect_args={"check_same_thread": False})
+    Base.metadata.create_all(engine)
+    db = sessionmaker(bind=engine)()
+    yield db
+    db.close()
+    engine.dispose()
@@ -0,0 +1,15 @@
+def test_app_mounts_routers_under_api():
+    from app.main import app
+
+    paths = {route.path for route in app.routes}
+    assert {
+        "/api/auth/login",
+        "/api/landmarks",
+        "/api/landmarks/nearby",
+        "/api/reviews/landmark/{landmark_id}/summary",
+        "/api/cities/profile/{city_name}",
+        "/api/discussions",
+        "/api/notifications",
+        "/api/sync/changes",
+        "/api/profile",
+    } <= paths
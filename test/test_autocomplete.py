@@ -0,0 +1,73 @@
+from app.core.autocomplete import AutocompleteIndex, normalize_key
+
+
+def _build():
+    index = AutocompleteIndex()
+    index.build([
+        (1, "Государственный Эрмитаж", "Санкт-Петербург", "museum", 120, 30),
+        (2, "Эрмитажный театр", "Санкт-Петербург", "theatre", 5, 0),
+        (3, "Колизей", "Рим", "monument", 300, 10),
+        (4, "Русский музей", "Санкт-Петербург", "museum", 80, 0),
+    ])
+    return index
+
+
+def _texts(suggestions):
+    return [(s.kind, s.text) for s in suggestions]
+
+
+def test_normalize_key():
+    assert normalize_key("  Ёлки-Палки! ") == "елки палки"
+
+
+def test_prefix_of_any_word_ranked_by_popularity():
+    index = _build()
+    assert _texts(index.suggest("эрм")) == [
+        ("landmark", "Государственный Эрмитаж"), ("landmark", "Эрмитажный театр")
+    ]
+    # Многословный префикс - с последовательных слов
+    assert _texts(index.suggest("государственный эр")) == [("landmark", "Государственный Эрмитаж")]
+    assert index.suggest("   ") == []
+    assert index.suggest("xyz") == []
+
+
+def test_cities_and_categories_weighted_by_landmark_count():
+    index = _build()
+    suggestions = index.suggest("му")
+    assert _texts(suggestions)[0] == ("landmark", "Русский музей")
+    assert ("category", "museum") not in _texts(suggestions)
+    assert index.suggest("mus")[0].weight == 2
+    city = index.suggest("петер")[0]
+    assert (city.kind, city.text, city.weight) == ("city", "Санкт-Петербург", 3)
+    assert index.suggest("эрм", limit=1)[0].landmark_id == 1
+
+
+def test_incremental_updates():
+    index = _build()
+    assert index.suggest("эрм")[0].landmark_id == 1
+    index.adjust_popularity(2, reviews=200)
+    assert index.suggest("эрм")[0].landmark_id == 2
+
+    # Переименование и переезд: старые ключи удаляются, счетчики городов меняются
+    index.upsert_landmark(2, "Новая сцена", "Рим", "theatre", 205)
+    assert _texts(index.suggest("эрм")) == [("landmark", "Государственный Эрмитаж")]
+    assert index.suggest("нова")[0].weight == 205
+    assert index.suggest("рим")[0].weight == 2
+    assert index.suggest("санкт")[0].weight == 2
+
+    index.remove_landmark(3)
+    index.remove_landmark(2)
+    assert index.suggest("рим") == []
+    assert index.suggest("колиз") == []
+    # Обновление без числа избранного сохраняет прежнее
+    index.upsert_landmark(1, "Государственный Эрмитаж", "Санкт-Петербург", "museum", 121)
+    assert index.suggest("эрм")[0].weight == 151
+
+
+def test_invalidate_marks_index_for_rebuild():
+    index = _build()
+    assert index.suggest("эрм")
+    index.invalidate()
+    assert not index.is_built
+    index.build([(5, "Эрмитаж-2", "Москва", "museum", 0, 0)])
+    assert _texts(index.suggest("эрм")) == [("landmark", "Эрмитаж-2")]
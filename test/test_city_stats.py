@@ -0,0 +1,63 @@
+from sqlalchemy import event, insert
+
+from app.crud import city_crud
+from app.crud.city_crud import rebuild_city_stats
+from app.crud.landmark_crud import create_landmark
+from app.models.city import CityCategoryStats, CityProfile
+from app.schemas.landmark import LandmarkCreate
+
+
+def _landmark(name, city="Казань", category="Музей"):
+    return LandmarkCreate(
+        name=name, description="Описание", city=city, country="Россия",
+        category=category, latitude=55.79, longitude=49.1
+    )
+
+
+def _profile(db, city="Казань"):
+    return db.query(
+        CityProfile.total_landmarks, CityProfile.total_reviews, CityProfile.rating_sum
+    ).filter(CityProfile.city_name == city).one()
+
+
+def test_first_landmark_creates_profile_then_increments(app_db):
+    create_landmark(app_db, _landmark("Кремль"))
+    assert _profile(app_db) == (1, 0, 0.0)
+    create_landmark(app_db, _landmark("Мечеть", category="Храм"))
+    assert _profile(app_db) == (2, 0, 0.0)
+    assert dict(app_db.query(CityCategoryStats.category, CityCategoryStats.count).all()) == {"Музей": 1, "Храм": 1}
+
+
+def test_profile_created_concurrently_gets_delta(app_db, monkeypatch):
+    # Параллельный запрос фиксирует профиль после нашего UPDATE (0 строк),
+    # а пересчет работает по снимку без этого профиля и вставляет дубликат
+    def concurrent_insert(update_context):
+        if update_context.mapper.class_ is CityProfile and update_context.result.rowcount == 0:
+            update_context.session.execute(insert(CityProfile).values(
+                city_name="Казань", country="Россия", total_landmarks=4, total_reviews=10,
+                total_discussions=0, average_rating=4.5, rating_sum=45.0
+            ))
+
+    def stale_rebuild(db, cities, categories=True):
+        db.add(CityProfile(city_name=cities[0], country="Россия", total_landmarks=1))
+        db.flush()
+
+    monkeypatch.setattr(city_crud, "rebuild_city_stats", stale_rebuild)
+    event.listen(app_db, "after_bulk_update", concurrent_insert)
+    try:
+        create_landmark(app_db, _landmark("Кремль"))
+    finally:
+        event.remove(app_db, "after_bulk_update", concurrent_insert)
+
+    # Запись достопримечательности не потеряна, приращение легло на чужой профиль
+    assert _profile(app_db) == (5, 10, 45.0)
+    assert app_db.query(CityCategoryStats.count).filter(CityCategoryStats.category == "Музей").scalar() == 1
+
+
+def test_rebuild_without_categories_keeps_category_stats(app_db):
+    create_landmark(app_db, _landmark("Кремль"))
+    app_db.query(CityCategoryStats).update({CityCategoryStats.count: 7})
+    rebuild_city_stats(app_db, ["Казань"], categories=False)
+    assert app_db.query(CityCategoryStats.count).scalar() == 7
+    rebuild_city_stats(app_db, ["Казань"])
+    assert app_db.query(CityCategoryStats.count).scalar() == 1
@@ -0,0 +1,52 @@
+from app.crud.discussion_crud import get_discussions, search_discussions
+from app.models.discussion import Discussion, DiscussionAnswer
+from app.models.user import User
+
+
+def _seed(db):
+    user = User(email="forum@example.com", hashed_password="x", full_name="Forum")
+    db.add(user)
+    db.flush()
+    first = Discussion(
+        title="Как попасть в Эрмитаж без очереди",
+        content="<script>alert(1)</script> Когда лучше приходить в Эрмитаж?",
+        user_id=user.id, city="Санкт-Петербург"
+    )
+    second = Discussion(title="Где поесть", content="Ищу недорогое кафе рядом с центром", user_id=user.id, city="Санкт-Петербург")
+    closed = Discussion(title="Эрмитаж закрыт?", content="Вопрос решен, спасибо", user_id=user.id, city="Санкт-Петербург", is_closed=True)
+    other_city = Discussion(title="Эрмитаж в Амстердаме", content="Стоит ли идти в филиал?", user_id=user.id, city="Амстердам")
+    db.add_all([first, second, closed, other_city])
+    db.flush()
+    db.add_all([
+        DiscussionAnswer(content="Рядом с Эрмитажем <img src=x onerror=alert(1)> есть кафе", discussion_id=second.id, user_id=user.id),
+        DiscussionAnswer(content="В Эрмитаж лучше утром", discussion_id=first.id, user_id=user.id, helpful_votes=3),
+        DiscussionAnswer(content="Эрмитаж по средам до девяти", discussion_id=first.id, user_id=user.id),
+    ])
+    db.commit()
+    return first, second, closed, other_city
+
+
+def test_search_finds_threads_by_answers_and_aggregates_hits(app_db):
+    first, second, _, _ = _seed(app_db)
+    result = search_discussions(app_db, "Эрмитаж", city="Санкт-Петербург", only_open=True)
+    hits = {item["discussion"].id: item for item in result["items"]}
+    assert set(hits) == {first.id, second.id} and result["total"] == 2
+    assert hits[first.id]["answer_hits"] == 2
+    # Тред найден только по ответу
+    assert hits[second.id]["answer_hits"] == 1
+    assert hits[second.id]["answer_snippet"].startswith("Рядом с <b>Эрмитажем</b>")
+    # Лучший ответ - самый полезный
+    assert hits[first.id]["answer_snippet"] == "В <b>Эрмитаж</b> лучше утром"
+
+    assert [d.id for d in get_discussions(app_db, search="кафе")["items"]] == [second.id]
+
+
+def test_search_snippets_escape_user_html(app_db):
+    first, second, _, _ = _seed(app_db)
+    hits = {item["discussion"].id: item for item in search_discussions(app_db, "Эрмитаж")["items"]}
+    snippet = hits[first.id]["snippet"]
+    assert "<script>" not in snippet
+    assert snippet.startswith("&lt;script&gt;alert(1)&lt;/script&gt;")
+    assert "<b>Эрмитаж?</b>" in snippet
+    assert "<img" not in hits[second.id]["answer_snippet"]
+    assert "&lt;img src=x onerror=alert(1)&gt;" in hits[second.id]["answer_snippet"]
@@ -0,0 +1,34 @@
+from app.core.filter_keys import filter_key
+from app.crud.landmark_crud import get_landmarks
+from app.models.landmark import Landmark
+
+
+def test_filter_key_folds_case_accents_and_spaces():
+    assert filter_key("  São   Paulo ") == "sao paulo"
+    assert filter_key("CAFÉ") == filter_key("cafe") == "cafe"
+    assert filter_key("Straße") == "strasse"
+    assert filter_key("Ёлки") == "елки"
+
+
+def test_filter_key_keeps_short_i():
+    assert filter_key("Мурманский край") == "мурманский край"
+    assert filter_key("Мурманский") != filter_key("Мурманскии")
+
+
+def test_get_landmarks_filters_and_searches(app_db):
+    app_db.add_all([
+        Landmark(name="Эрмитаж", description="Музей", city="Санкт-Петербург", country="Россия",
+                 category="Музей", latitude=59.94, longitude=30.31),
+        Landmark(name="Русский музей", description="Музей", city="Санкт-Петербург", country="Россия",
+                 category="Музей", latitude=59.94, longitude=30.33),
+        Landmark(name="Пушкинский музей", description="Музей", city="Москва", country="Россия",
+                 category="Музей", latitude=55.75, longitude=37.6),
+    ])
+    app_db.commit()
+
+    # На SQLite поиск - LIKE по подстроке без релевантности (регистр кириллицы учитывается)
+    landmarks, total = get_landmarks(app_db, city="санкт-петербург", search="Музей")
+    assert sorted(landmark.name for landmark in landmarks) == ["Русский музей", "Эрмитаж"] and total == 2
+
+    landmarks, total = get_landmarks(app_db, city="санкт-петербург", search="Русский")
+    assert [landmark.name for landmark in landmarks] == ["Русский музей"] and total == 1
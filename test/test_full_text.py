@@ -0,0 +1,78 @@
+from sqlalchemy import Column, Integer, MetaData, Table, Text
+from sqlalchemy.dialects import postgresql
+
+from app.core.full_text import (
+    _HEADLINE_START_MARK,
+    _HEADLINE_STOP_MARK,
+    full_text_match,
+    headline,
+    headline_html,
+    plain_headline,
+    prefix_tsquery,
+    search_vector,
+    search_vector_ddl,
+    search_vector_sql,
+)
+
+
+def test_prefix_tsquery_words_as_prefixes():
+    assert prefix_tsquery("Эрмитаж зимний") == "эрмитаж:* & зимний:*"
+
+
+def test_prefix_tsquery_strips_tsquery_syntax():
+    assert prefix_tsquery("музей & | ! :* ' (Рим)") == "музей:* & рим:*"
+    assert prefix_tsquery("snake_case") == "snake:* & case:*"
+
+
+def test_prefix_tsquery_without_words():
+    assert prefix_tsquery("  !!! ") is None
+
+
+def test_search_vector_sql_weights_every_config():
+    sql = search_vector_sql([("name", "A"), ("description", "C")])
+    assert sql.count("to_tsvector") == 4
+    assert "setweight(to_tsvector('russian'::regconfig, coalesce(name, '')), 'A')" in sql
+    assert "setweight(to_tsvector('english'::regconfig, coalesce(description, '')), 'C')" in sql
+
+
+def test_search_vector_ddl_generated_column_and_gin_index():
+    alter, index = search_vector_ddl("landmarks", [("name", "A")], "idx_landmark_search_vector")
+    assert "GENERATED ALWAYS AS" in alter and alter.endswith("STORED")
+    assert index == "CREATE INDEX IF NOT EXISTS idx_landmark_search_vector ON landmarks USING GIN (search_vector)"
+
+
+def test_full_text_match_compiles_for_postgresql():
+    table = Table("landmarks", MetaData(), Column("id", Integer, primary_key=True))
+    condition, rank = full_text_match(search_vector("landmarks"), "рим:*")
+    sql = str(
+        table.select().where(condition).order_by(rank.desc()).compile(dialect=postgresql.dialect())
+    )
+    assert "landmarks.search_vector @@ (to_tsquery('russian'::regconfig" in sql
+    assert "ORDER BY ts_rank(landmarks.search_vector" in sql
+
+
+def test_headline_compiles_for_postgresql():
+    table = Table("discussions", MetaData(), Column("id", Integer, primary_key=True), Column("content", Text))
+    sql = str(table.select().with_only_columns(headline(table.c.content, "рим:*")).compile(dialect=postgresql.dialect()))
+    assert "ts_headline('russian'::regconfig, discussions.content, to_tsquery('russian'::regconfig" in sql
+
+
+def test_plain_headline_marks_matches_in_window():
+    text = " ".join(f"w{i}" for i in range(100)) + " Эрмитаже " + " ".join(f"v{i}" for i in range(100))
+    snippet = plain_headline(text, "эрмитаж", max_words=9)
+    assert snippet == "w97 w98 w99 <b>Эрмитаже</b> v0 v1 v2 v3 v4"
+    # Без совпадений - начало текста
+    assert plain_headline("один два три", "рим", max_words=2) == "один два"
+
+
+def test_plain_headline_escapes_user_text():
+    snippet = plain_headline('<script>alert("Рим")</script> Рим & <i>море</i>', "рим")
+    assert "<script>" not in snippet and "<i>" not in snippet
+    assert snippet.startswith("<b>&lt;script&gt;alert(&quot;Рим&quot;)&lt;/script&gt;</b> <b>Рим</b> &amp;")
+
+
+def test_headline_html_escapes_ts_headline_output():
+    # Так выглядит результат ts_headline с отметками из HEADLINE_OPTIONS
+    fragment = f"<script>x()</script> {_HEADLINE_START_MARK}Рим{_HEADLINE_STOP_MARK} <img src=x onerror=y>"
+    assert headline_html(fragment) == "&lt;script&gt;x()&lt;/script&gt; <b>Рим</b> &lt;img src=x onerror=y&gt;"
+    assert headline_html(None) is None
@@ -0,0 +1,75 @@
+import random
+import time
+
+from app.core.geo_engine import CoordinateStore
+from app.core.spatial_index import SpatialIndex, haversine_km
+from app.crud.landmark_crud import get_landmarks_near_location
+from app.models.landmark import Landmark
+
+
+def test_geo_engine():
+    print("🧪 Тестирование векторизованного расчета расстояний...")
+    rnd = random.Random(7)
+
+    # Плотный кластер вокруг Москвы
+    points = [
+        (point_id, 55.7539 + rnd.uniform(-0.5, 0.5), 37.6208 + rnd.uniform(-0.8, 0.8))
+        for point_id in range(50000)
+    ]
+    store = CoordinateStore()
+    store.build(points)
+    index = SpatialIndex()
+    index.build(points)
+    assert len(store) == len(points)
+
+    for radius in (2, 30, 100):
+        expected = index.query_radius(55.75, 37.62, radius, limit=50)
+        found = store.query_radius(55.75, 37.62, radius, limit=50)
+        assert [p for p, _ in found] == [p for p, _ in expected]
+        assert all(abs(a[1] - b[1]) < 1e-6 for a, b in zip(found, expected))
+    assert [p for p, _ in store.query_nearest(55.75, 37.62, 10)] == \
+        [p for p, _ in index.query_nearest(55.75, 37.62, 10)]
+    print("✅ Результаты совпадают с сеточным индексом")
+
+    origins = [(55.75 + rnd.uniform(-0.3, 0.3), 37.62 + rnd.uniform(-0.3, 0.3)) for _ in range(200)]
+    batch = store.query_radius_batch(origins, 5, limit=20)
+    assert len(batch) == len(origins)
+    for (latitude, longitude), hits in zip(origins, batch):
+        assert [p for p, _ in hits] == [p for p, _ in store.query_radius(latitude, longitude, 5, limit=20)]
+    print("✅ Пакетный поиск совпадает с одиночными запросами")
+
+    # Синхронизация: вставка, перемещение, удаление с перестановкой последнего элемента
+    store.upsert(10**6, 0.0, 0.0)
+    assert store.query_nearest(0.0, 0.0, 1)[0][0] == 10**6
+    store.upsert(10**6, 10.0, 10.0)
+    assert store.query_radius(0.0, 0.0, 1) == []
+    assert store.remove(0) and store.remove(10**6)
+    assert not store.remove(10**6)
+    assert len(store) == len(points) - 1
+    assert 0 not in [p for p, _ in store.query_radius(points[0][1], points[0][2], 0.001)]
+    print("✅ Хранилище синхронизируется при изменениях")
+
+    started = time.perf_counter()
+    store.query_radius(55.75, 37.62, 100, limit=20)
+    print(f"⏱️ Радиус 100 км по {len(store)} точкам: {(time.perf_counter() - started) * 1000:.2f} мс")
+
+
+def test_sql_nearby_mode_on_sqlite(app_db):
+    # Точка-антипод дает значение под корнем около 1 - проверяется ограничение сверху
+    coords = [(59.9398, 30.3146), (59.95, 30.33), (55.7539, 37.6208), (-59.9398, -149.6854)]
+    app_db.add_all([
+        Landmark(name=f"Место {i}", city="Город", country="Страна", category="Музей", latitude=lat, longitude=lon)
+        for i, (lat, lon) in enumerate(coords)
+    ])
+    app_db.commit()
+
+    nearby = get_landmarks_near_location(app_db, 59.9398, 30.3146, radius_km=5, mode="sql")
+    assert [landmark.name for landmark in nearby] == ["Место 0", "Место 1"]
+    assert nearby[1].distance == round(haversine_km(59.9398, 30.3146, 59.95, 30.33), 3)
+
+    everything = get_landmarks_near_location(app_db, 59.9398, 30.3146, radius_km=20100, mode="sql")
+    assert [landmark.name for landmark in everything] == ["Место 0", "Место 1", "Место 2", "Место 3"]
+
+
+if __name__ == "__main__":
+    test_geo_engine()
@@ -0,0 +1,54 @@
+import io
+
+from app.core.filter_keys import filter_key
+from app.crud.city_crud import rebuild_city_stats
+from app.models.city import CityCategoryStats, CityProfile
+from app.models.landmark import FILTER_KEY_COLUMNS, Landmark
+from app.services.landmark_import import import_landmarks
+
+CSV = """name,description,city,country,category,latitude,longitude,external_id
+Эрмитаж,Музей,Санкт-Петербург,Россия,Музей,59.94,30.31,spb-1
+Кремль,Крепость,Москва,Россия,Крепость,55.75,37.62,msk-1
+Нигде,Неверная широта,Москва,Россия,Парк,200,37.6,bad-1
+Парк Горького,Без внешнего id,Москва,Россия,Парк,55.73,37.6,
+Эрмитаж,Повтор ключа,Санкт-Петербург,Россия,Галерея,59.94,30.31,spb-1
+"""
+
+
+def _stats(db):
+    db.expire_all()
+    profiles = {
+        row.city_name: (row.total_landmarks, row.total_reviews, row.total_discussions, row.rating_sum)
+        for row in db.query(CityProfile)
+    }
+    categories = {
+        (row.city_name, row.category): row.count
+        for row in db.query(CityCategoryStats).filter(CityCategoryStats.count > 0)
+    }
+    return profiles, categories
+
+
+def test_import_twice_counts_keys_and_city_stats(app_db):
+    first = import_landmarks(app_db, io.StringIO(CSV), "csv")
+    assert (first["total"], first["inserted"], first["updated"], first["failed"]) == (5, 3, 0, 1)
+    assert first["errors"][0]["line"] == 4 and first["errors"][0]["external_id"] == "bad-1"
+
+    # Повтор малыми пачками: ключи обновляются, в том числе повтор ключа в другой пачке,
+    # строка без external_id вставляется заново
+    second = import_landmarks(app_db, io.StringIO(CSV), "csv", batch_size=2)
+    assert (second["total"], second["inserted"], second["updated"], second["failed"]) == (5, 1, 3, 1)
+
+    landmarks = app_db.query(Landmark).all()
+    assert len(landmarks) == 4
+    hermitage = next(landmark for landmark in landmarks if landmark.external_id == "spb-1")
+    assert (hermitage.category, hermitage.description) == ("Галерея", "Повтор ключа")
+    for landmark in landmarks:
+        for column, key_column in FILTER_KEY_COLUMNS.items():
+            assert getattr(landmark, key_column) == filter_key(getattr(landmark, column))
+
+    incremental = _stats(app_db)
+    assert incremental[0]["Москва"][0] == 3
+    assert incremental[1][("Санкт-Петербург", "Галерея")] == 1
+    rebuild_city_stats(app_db)
+    app_db.commit()
+    assert _stats(app_db) == incremental
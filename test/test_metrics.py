@@ -0,0 +1,58 @@
+from app.core.metrics import Histogram
+
+
+def test_histogram_cumulative_buckets():
+    histogram = Histogram(buckets=(0.1, 1.0))
+    for value in (0.05, 0.1, 0.5, 2.0):
+        histogram.observe(value)
+
+    snapshot = histogram.snapshot()
+    assert snapshot["buckets"] == {"0.1": 2, "1.0": 3, "+Inf": 4}
+    assert snapshot["count"] == 4
+    assert abs(snapshot["sum"] - 2.65) < 1e-9
+
+    histogram.reset()
+    assert histogram.snapshot()["count"] == 0
+    print("✅ Гистограмма считает накопительные корзины")
+
+
+def test_metrics_middleware_records_routes():
+    from fastapi import FastAPI
+    from fastapi.testclient import TestClient
+    from app.core.metrics import MetricsMiddleware, MetricsRegistry, record_query
+
+    registry = MetricsRegistry()
+    app = FastAPI()
+    app.add_middleware(MetricsMiddleware, registry=registry)
+
+    @app.get("/items/{item_id}")
+    def read_item(item_id: int):
+        # Синхронный обработчик выполняется в threadpool - статистика должна дойти до middleware
+        record_query(0.002)
+        record_query(0.003)
+        return {"id": item_id}
+
+    client = TestClient(app)
+    for item_id in (1, 2):
+        assert client.get(f"/items/{item_id}").status_code == 200
+    assert client.get("/missing").status_code == 404
+
+    assert registry.responses[("GET", "/items/{item_id}", "200")] == 2
+    assert registry.responses[("GET", "unmatched", "404")] == 1
+    assert registry.in_flight == 0
+
+    text = registry.render()
+    assert 'http_request_db_queries_bucket{method="GET",route="/items/{item_id}",le="2"} 2' in text
+    assert 'http_request_duration_seconds_count{method="GET",route="/items/{item_id}"} 2' in text
+    print("✅ Middleware собирает метрики по шаблонам маршрутов")
+
+
+def test_cache_collector_ratio():
+    from app.core.metrics import cache_collector, render_prometheus
+
+    class Cache:
+        hits, misses = 3, 1
+
+    text = render_prometheus(cache_collector("user", Cache())())
+    assert 'cache_hit_ratio{cache="user"} 0.75' in text
+    print("✅ Доля попаданий в кэш экспортируется")
@@ -0,0 +1,46 @@
+from app.core.ngram_index import TrigramIndex, similarity, trigrams, word_similarity
+
+
+def test_trigrams_match_pg_trgm():
+    # SELECT show_trgm('word') -> {"  w"," wo","ord","rd ",wor}
+    assert trigrams("word") == {"  w", " wo", "wor", "ord", "rd "}
+    assert trigrams("Two, words!") == trigrams("two") | trigrams("words")
+
+
+def test_similarity_examples_from_pg_trgm_docs():
+    # similarity('word', 'two words') = 0.36363637, word_similarity = 0.8
+    assert abs(similarity("word", "two words") - 0.363636) < 1e-4
+    assert abs(word_similarity("word", "two words") - 0.8) < 1e-9
+
+
+def test_typos_are_similar():
+    assert word_similarity("Ермитаж", "Государственный Эрмитаж") > 0.6
+    assert word_similarity("Colloseum", "Colosseum") >= 0.7
+    assert word_similarity("Colloseum", "Louvre") == 0.0
+
+
+def test_index_search_ranks_and_filters_by_threshold():
+    index = TrigramIndex()
+    index.build([
+        (1, ("Государственный Эрмитаж", "Санкт-Петербург")),
+        (2, ("Colosseum", "Rome")),
+        (3, ("Эрмитажный театр", "Санкт-Петербург")),
+        (4, ("Louvre", "Paris")),
+    ])
+    hits = index.search("Ермитаж", limit=10, threshold=0.4)
+    assert [key for key, _ in hits] == [1, 3]
+    assert hits[0][1] > hits[1][1]
+    assert index.search("Ермитаж", limit=1, threshold=0.4) == hits[:1]
+    # Совпадение по второму тексту записи (городу)
+    assert [key for key, _ in index.search("Pariss", limit=10, threshold=0.4)] == [4]
+    assert index.search("!!!", limit=10, threshold=0.4) == []
+
+
+def test_index_upsert_and_remove():
+    index = TrigramIndex()
+    index.build([(1, ("Colosseum",))])
+    index.upsert(1, ("Pantheon",))
+    assert index.search("Colloseum", limit=5, threshold=0.4) == []
+    assert [key for key, _ in index.search("Panteon", limit=5, threshold=0.4)] == [1]
+    assert index.remove(1) and not index.remove(1)
+    assert len(index) == 0 and index._postings == {}
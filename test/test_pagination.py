@@ -0,0 +1,97 @@
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import Column, DateTime, Integer, String, create_engine
+from sqlalchemy.orm import declarative_base, sessionmaker
+
+from app.core.pagination import (
+    InvalidCursorError,
+    count_pages,
+    decode_cursor,
+    encode_cursor,
+    fetch_page,
+    paginate_keyset,
+)
+
+Base = declarative_base()
+
+
+class Item(Base):
+    __tablename__ = "items"
+
+    id = Column(Integer, primary_key=True)
+    name = Column(String(50), nullable=False)
+    created_at = Column(DateTime, nullable=False)
+
+
+def _session():
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    db = sessionmaker(bind=engine)()
+    start = datetime(2026, 1, 1)
+    # Повторяющиеся имена и даты, чтобы проверить стабильность по id
+    for i in range(1, 101):
+        db.add(Item(id=i, name=f"name-{i % 7}", created_at=start + timedelta(minutes=i // 3)))
+    db.commit()
+    return db
+
+
+def _walk(db, sort_keys, limit):
+    seen, cursor = [], ""
+    while cursor is not None:
+        items, cursor = paginate_keyset(db.query(Item), sort_keys, cursor, limit)
+        seen.extend(item.id for item in items)
+    return seen
+
+
+def test_keyset_pagination():
+    print("🧪 Тестирование keyset-пагинации...")
+    db = _session()
+
+    by_name = _walk(db, [(Item.name, False), (Item.id, False)], 9)
+    expected = [item.id for item in db.query(Item).order_by(Item.name, Item.id)]
+    assert by_name == expected
+
+    newest_first = _walk(db, [(Item.created_at, True), (Item.id, True)], 10)
+    expected = [item.id for item in db.query(Item).order_by(Item.created_at.desc(), Item.id.desc())]
+    assert newest_first == expected
+    print("✅ Все записи пройдены без пропусков и повторов")
+
+
+def test_cursor_roundtrip():
+    values = ["Эрмитаж", 42, datetime(2026, 1, 20, 10, 0)]
+    assert decode_cursor(encode_cursor(values), 3) == values
+
+    with pytest.raises(InvalidCursorError):
+        decode_cursor("не-курсор", 2)
+    with pytest.raises(InvalidCursorError):
+        decode_cursor(encode_cursor([1]), 2)
+
+
+def test_fetch_page_window_total():
+    print("🧪 Тестирование подсчета total оконной функцией...")
+    db = _session()
+    query = db.query(Item).filter(Item.id > 10).order_by(Item.id)
+
+    items, total = fetch_page(query, 20, 25, "exact")
+    assert [item.id for item in items] == list(range(31, 56))
+    assert total == 90
+    assert count_pages(total, 25) == 4
+
+    # Пустая страница за пределами выборки - total все равно известен
+    items, total = fetch_page(query, 500, 25, "exact")
+    assert items == [] and total == 90
+
+    items, total = fetch_page(query, 0, 5, "none")
+    assert len(items) == 5 and total is None and count_pages(total, 5) is None
+
+    # На SQLite оценка сводится к точному COUNT
+    _, total = fetch_page(query, 0, 5, "estimate")
+    assert total == 90
+    print("✅ total совпадает с COUNT во всех режимах")
+
+
+if __name__ == "__main__":
+    test_keyset_pagination()
+    test_cursor_roundtrip()
+    test_fetch_page_window_total()
@@ -0,0 +1,54 @@
+import threading
+import time
+
+import pytest
+
+from app.core.password_hasher import HashingOverloadedError, PasswordHashingService
+
+
+def test_backpressure():
+    print("🧪 Тестирование ограничения очереди хэширования...")
+    service = PasswordHashingService(workers=1, queue_limit=1, timeout_seconds=5)
+    release = threading.Event()
+    started = threading.Event()
+
+    def slow():
+        started.set()
+        release.wait(5)
+        return "готово"
+
+    results = []
+    first = threading.Thread(target=lambda: results.append(service._run(slow)))
+    first.start()
+    started.wait(5)
+    second = threading.Thread(target=lambda: results.append(service._run(lambda: "из очереди")))
+    second.start()
+
+    # Один поток занят, одно место в очереди занято - третья задача отклоняется сразу
+    for _ in range(500):
+        if service.pending >= 2:
+            break
+        time.sleep(0.01)
+    with pytest.raises(HashingOverloadedError):
+        service._run(lambda: "лишняя")
+    assert service.rejected == 1
+
+    release.set()
+    first.join(5)
+    second.join(5)
+    assert sorted(results) == ["готово", "из очереди"]
+    assert service.pending == 0
+    service.shutdown()
+    print("✅ Лишние задачи отклоняются, слоты освобождаются")
+
+
+def test_hash_and_verify():
+    print("🧪 Тестирование хэширования пароля в пуле...")
+    service = PasswordHashingService(workers=2, queue_limit=2)
+    hashed = service.hash("секретный пароль")
+    assert service.verify("секретный пароль", hashed)
+    assert service.verify_and_update("неверный", hashed) == (False, None)
+    valid, new_hash = service.verify_and_update("секретный пароль", hashed)
+    assert valid and new_hash is None
+    service.shutdown()
+    print("✅ Хэш проверяется, пересчет с текущими параметрами не нужен")
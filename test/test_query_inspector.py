@@ -0,0 +1,84 @@
+import logging
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, text
+from sqlalchemy.pool import StaticPool
+
+from app.core.query_inspector import (
+    QueryInspectorMiddleware,
+    install_query_listeners,
+    statement_shape,
+)
+
+
+def _engine():
+    engine = create_engine(
+        "sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool
+    )
+    install_query_listeners(engine)
+    with engine.begin() as conn:
+        conn.execute(text("CREATE TABLE users (id INTEGER PRIMARY KEY, name TEXT)"))
+        conn.execute(text("INSERT INTO users (id, name) VALUES (1, 'a'), (2, 'b'), (3, 'c')"))
+    return engine
+
+
+def _app(engine):
+    app = FastAPI()
+    app.add_middleware(QueryInspectorMiddleware, budget=2, repeat_threshold=3, debug_headers=True)
+
+    @app.get("/users/n-plus-one")
+    def n_plus_one():
+        with engine.connect() as conn:
+            ids = [row.id for row in conn.execute(text("SELECT id FROM users"))]
+            # Загрузка по одному - типичный N+1
+            return [
+                conn.execute(text("SELECT name FROM users WHERE id = :id"), {"id": user_id}).scalar()
+                for user_id in ids
+            ]
+
+    @app.get("/users/batch")
+    def batch():
+        with engine.connect() as conn:
+            return [row.name for row in conn.execute(text("SELECT name FROM users ORDER BY id"))]
+
+    return app
+
+
+def test_statement_shape_collapses_literals_and_in_lists():
+    assert statement_shape("SELECT * FROM t WHERE id IN (?, ?, ?) AND name = 'x'") == \
+        statement_shape("SELECT *\n FROM t WHERE id IN (?) AND name = 'y'")
+    assert statement_shape("SELECT * FROM t WHERE id = %(id_1)s LIMIT 10") == \
+        "SELECT * FROM t WHERE id = ? LIMIT ?"
+    print("✅ Формы запросов нормализуются")
+
+
+def test_inspector_headers_and_n_plus_one_log(caplog):
+    client = TestClient(_app(_engine()))
+
+    with caplog.at_level(logging.WARNING, logger="app.core.query_inspector"):
+        response = client.get("/users/n-plus-one")
+    assert response.json() == ["a", "b", "c"]
+    assert response.headers["x-db-queries"] == "4"
+    assert response.headers["x-db-repeated"] == "1"
+    assert "бюджет 2" in caplog.text
+    assert "возможный N+1" in caplog.text
+
+    response = client.get("/users/batch")
+    assert response.headers["x-db-queries"] == "1"
+    assert response.headers["x-db-repeated"] == "0"
+    print("✅ Инспектор находит повторяющиеся запросы")
+
+
+def test_max_queries_fixture(max_queries):
+    engine = _engine()
+    client = TestClient(_app(engine))
+
+    with max_queries(1, engine=engine) as counter:
+        client.get("/users/batch")
+    assert counter.count == 1
+
+    with max_queries(10, engine=engine) as counter:
+        client.get("/users/n-plus-one")
+    assert counter.repeated() == [("SELECT name FROM users WHERE id = ?", 3)]
+    print("✅ Фикстура max_queries считает запросы эндпоинта")
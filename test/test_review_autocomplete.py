@@ -0,0 +1,59 @@
+import pytest
+
+from app.core.autocomplete import autocomplete_index
+from app.crud.landmark_crud import build_autocomplete_index, create_landmark
+from app.crud.review_crud import create_review, delete_review, recompute_rating_aggregates, update_review
+from app.crud.user_crud import delete_user
+from app.models.user import User
+from app.schemas.landmark import LandmarkCreate
+from app.schemas.review import ReviewCreate, ReviewUpdate
+
+
+def _setup(db):
+    users = [User(email=f"user{i}@example.com", hashed_password="x", full_name=f"User {i}") for i in range(2)]
+    db.add_all(users)
+    db.commit()
+    landmark = create_landmark(db, LandmarkCreate(
+        name="Эрмитаж", description="Музей", city="Санкт-Петербург", country="Россия",
+        category="Музей", latitude=59.94, longitude=30.31
+    ))
+    build_autocomplete_index(db)
+    return [user.id for user in users], landmark.id
+
+
+def _weight():
+    return autocomplete_index.suggest("эрм")[0].weight
+
+
+def test_review_changes_update_popularity_after_commit(app_db):
+    (first, second), landmark_id = _setup(app_db)
+    create_review(app_db, ReviewCreate(landmark_id=landmark_id, rating=5, comment="Отлично"), first)
+    create_review(app_db, ReviewCreate(landmark_id=landmark_id, rating=3, comment="Неплохо"), second)
+    assert _weight() == 2
+    update_review(app_db, first, landmark_id, ReviewUpdate(rating=4))
+    assert _weight() == 2
+    delete_review(app_db, second, landmark_id)
+    assert _weight() == 1
+    delete_user(app_db, first)
+    assert _weight() == 0
+
+
+def test_failed_commit_keeps_popularity(app_db, monkeypatch):
+    (first, _), landmark_id = _setup(app_db)
+
+    def failing_commit():
+        raise RuntimeError("commit failed")
+
+    monkeypatch.setattr(app_db, "commit", failing_commit)
+    with pytest.raises(RuntimeError):
+        create_review(app_db, ReviewCreate(landmark_id=landmark_id, rating=5, comment="Отлично"), first)
+    assert _weight() == 0
+
+
+def test_recompute_invalidates_index(app_db):
+    (first, _), landmark_id = _setup(app_db)
+    create_review(app_db, ReviewCreate(landmark_id=landmark_id, rating=5, comment="Отлично"), first)
+    recompute_rating_aggregates(app_db)
+    assert not autocomplete_index.is_built
+    build_autocomplete_index(app_db)
+    assert _weight() == 1
@@ -0,0 +1,82 @@
+import random
+import time
+
+from app.core.spatial_index import SpatialIndex, haversine_km
+
+
+def _brute_force(points, latitude, longitude, radius_km):
+    result = []
+    for point_id, lat, lon in points:
+        distance = haversine_km(latitude, longitude, lat, lon)
+        if distance <= radius_km:
+            result.append((point_id, distance))
+    result.sort(key=lambda item: item[1])
+    return result
+
+
+def test_spatial_index():
+    print("🧪 Тестирование пространственного индекса...")
+    rnd = random.Random(42)
+
+    # Точки вокруг Санкт-Петербурга, Москвы и у линии смены дат
+    centers = [(59.9398, 30.3146), (55.7539, 37.6208), (65.0, 179.99)]
+    points = []
+    for point_id in range(20000):
+        lat, lon = centers[point_id % len(centers)]
+        lon = lon + rnd.uniform(-0.5, 0.5)
+        if lon > 180:
+            lon -= 360
+        points.append((point_id, lat + rnd.uniform(-0.3, 0.3), lon))
+
+    index = SpatialIndex(cell_size_deg=0.05)
+    index.build(points)
+    assert len(index) == len(points)
+
+    for latitude, longitude, radius in [(59.94, 30.31, 5), (55.75, 37.62, 25), (65.0, -179.99, 10)]:
+        expected = _brute_force(points, latitude, longitude, radius)
+        found = index.query_radius(latitude, longitude, radius)
+        assert [p for p, _ in found] == [p for p, _ in expected]
+        nearest = index.query_nearest(latitude, longitude, 15)
+        assert [p for p, _ in nearest] == [p for p, _ in _brute_force(points, latitude, longitude, 20000)[:15]]
+    print("✅ Результаты совпадают с полным перебором")
+
+    # Синхронизация при изменениях
+    index.insert(10**6, 59.9398, 30.3146)
+    assert index.query_nearest(59.9398, 30.3146, 1)[0][0] == 10**6
+    index.insert(10**6, 0.0, 0.0)
+    assert index.query_radius(0.0, 0.0, 1)[0][0] == 10**6
+    assert index.remove(10**6)
+    assert index.query_radius(0.0, 0.0, 1) == []
+    print("✅ Вставка, перемещение и удаление работают")
+
+    started = time.perf_counter()
+    for _ in range(100):
+        index.query_radius(59.94, 30.31, 1, limit=20)
+    elapsed_ms = (time.perf_counter() - started) * 1000 / 100
+    print(f"⏱️ Средний поиск в радиусе 1 км: {elapsed_ms:.3f} мс")
+
+
+def test_polar_and_wide_queries():
+    print("🧪 Тестирование поиска у полюса и в большом радиусе...")
+    rnd = random.Random(7)
+    points = [(point_id, rnd.uniform(-89.9, 89.9), rnd.uniform(-180, 180)) for point_id in range(500)]
+    index = SpatialIndex(cell_size_deg=0.05)
+    index.build(points)
+
+    # Круг накрывает полюс - без полного просмотра пришлось бы перебирать все 7200 столбцов
+    started = time.perf_counter()
+    found = index.query_radius(89.99, 0.0, 3000)
+    nearest = index.query_nearest(89.99, 0.0, 5)
+    wide = index.query_nearest(0.0, 0.0, 300)
+    elapsed_ms = (time.perf_counter() - started) * 1000
+
+    assert [p for p, _ in found] == [p for p, _ in _brute_force(points, 89.99, 0.0, 3000)]
+    assert [p for p, _ in nearest] == [p for p, _ in _brute_force(points, 89.99, 0.0, 20040)[:5]]
+    assert [p for p, _ in wide] == [p for p, _ in _brute_force(points, 0.0, 0.0, 20040)[:300]]
+    assert elapsed_ms < 1000
+    print(f"✅ Результаты совпадают с полным перебором за {elapsed_ms:.1f} мс")
+
+
+if __name__ == "__main__":
+    test_spatial_index()
+    test_polar_and_wide_queries()
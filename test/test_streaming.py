@@ -0,0 +1,95 @@
+import csv
+import gzip
+import io
+import json
+from datetime import datetime
+
+import pytest
+from sqlalchemy import Column, DateTime, Float, Integer, String, create_engine
+from sqlalchemy.orm import declarative_base, sessionmaker
+
+from app.core.streaming import (
+    encode_csv,
+    encode_ndjson,
+    encode_rows,
+    gzip_chunks,
+    iter_query_rows,
+)
+
+Base = declarative_base()
+
+
+class Item(Base):
+    __tablename__ = "items"
+
+    id = Column(Integer, primary_key=True)
+    name = Column(String(50), nullable=False)
+    score = Column(Float)
+    created_at = Column(DateTime, nullable=False)
+
+
+FIELDS = ("id", "name", "score", "created_at")
+
+
+@pytest.fixture
+def db():
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    session = sessionmaker(bind=engine)()
+    session.add_all([
+        Item(id=i, name=f"Объект, \"{i}\"", score=None if i % 5 == 0 else i / 2, created_at=datetime(2026, 1, 1, 12, i % 60))
+        for i in range(1, 201)
+    ])
+    session.commit()
+    yield session
+    session.close()
+    engine.dispose()
+
+
+def _rows(db, limit=25):
+    query = db.query(Item.id, Item.name, Item.score, Item.created_at).filter(Item.id <= limit).order_by(Item.id)
+    return iter_query_rows(query, FIELDS, yield_per=7)
+
+
+def test_iter_query_rows_serializes_all_rows(db):
+    rows = list(_rows(db))
+    assert [row["id"] for row in rows] == list(range(1, 26))
+    assert rows[0] == {"id": 1, "name": "Объект, \"1\"", "score": 0.5, "created_at": "2026-01-01T12:01:00"}
+    assert rows[4]["score"] is None
+
+
+def test_ndjson_roundtrip(db):
+    data = b"".join(encode_ndjson(_rows(db)))
+    lines = data.decode("utf-8").splitlines()
+    assert len(lines) == 25
+    assert json.loads(lines[1])["name"] == "Объект, \"2\""
+
+
+def test_csv_roundtrip_with_header_and_quoting(db):
+    data = b"".join(encode_csv(_rows(db), FIELDS))
+    rows = list(csv.DictReader(io.StringIO(data.decode("utf-8"))))
+    assert len(rows) == 25
+    assert rows[2]["name"] == "Объект, \"3\""
+    assert rows[4]["score"] == ""
+
+
+def test_csv_empty_result_has_header_only():
+    assert b"".join(encode_csv(iter([]), FIELDS)) == b"id,name,score,created_at\n"
+
+
+def test_small_rows_are_grouped_into_chunks(db):
+    chunks = list(encode_ndjson(_rows(db, limit=200), chunk_size=1024))
+    assert 1 < len(chunks) < 200
+    assert all(chunk.endswith(b"\n") for chunk in chunks)
+
+
+def test_gzip_chunks_decompress_to_original(db):
+    plain = b"".join(encode_rows(_rows(db), FIELDS, "ndjson"))
+    compressed = b"".join(gzip_chunks(encode_rows(_rows(db), FIELDS, "ndjson")))
+    assert gzip.decompress(compressed) == plain
+    assert len(compressed) < len(plain)
+
+
+def test_unknown_format_rejected():
+    with pytest.raises(ValueError):
+        encode_rows(iter([]), FIELDS, "xml")
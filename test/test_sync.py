@@ -0,0 +1,91 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from app.core.config import settings
+from app.crud.landmark_crud import delete_landmark, update_landmark
+from app.crud.review_crud import delete_review
+from app.crud.sync_crud import SyncTokenExpiredError, encode_sync_token, get_changes
+from app.crud.user_crud import delete_user
+from app.models.landmark import Landmark
+from app.models.review import Review
+from app.models.user import User
+from app.schemas.landmark import LandmarkUpdate
+
+
+def _seed(db):
+    users = [User(email=f"user{i}@example.com", hashed_password="x", full_name=f"User {i}") for i in range(3)]
+    db.add_all(users)
+    db.flush()
+    # Повторяющиеся моменты изменения, чтобы проверить стабильность по id
+    start = datetime.now(timezone.utc).replace(microsecond=0) - timedelta(hours=1)
+    for i in range(1, 24):
+        db.add(Landmark(
+            id=i, name=f"Место {i}", description="Описание", city="Казань", country="Россия",
+            category="Музей", latitude=55.79, longitude=49.1, created_at=start + timedelta(minutes=i // 4)
+        ))
+    db.flush()
+    for i in range(1, 31):
+        db.add(Review(
+            id=i, user_id=users[i % 3].id, landmark_id=i % 23 + 1, rating=i % 5 + 1,
+            comment="Отзыв", created_at=start + timedelta(minutes=i // 5)
+        ))
+    db.commit()
+    return [user.id for user in users]
+
+
+def _walk(db, token=None, limit=4):
+    landmarks, reviews, deleted = [], [], []
+    while True:
+        page = get_changes(db, token, limit)
+        landmarks += [landmark.id for landmark in page["landmarks"]]
+        reviews += [review.id for review in page["reviews"]]
+        deleted += [(record.entity_type, record.entity_id) for record in page["deleted"]]
+        token = page["next_token"]
+        if not page["has_more"]:
+            return landmarks, reviews, deleted, token
+
+
+def test_snapshot_pages_without_gaps_or_duplicates(app_db, monkeypatch):
+    monkeypatch.setattr(settings, "SYNC_SAFETY_LAG_SECONDS", 0)
+    _seed(app_db)
+    landmarks, reviews, deleted, _ = _walk(app_db)
+    assert landmarks == list(range(1, 24))
+    assert sorted(reviews) == list(range(1, 31))
+    assert len(reviews) == len(set(reviews))
+    assert deleted == []
+
+
+def test_changes_after_token(app_db, monkeypatch):
+    users = _seed(app_db)
+    # SQLite пишет метки времени с точностью до секунды: снимок берем с отставанием,
+    # а изменения после токена читаем с запасом вперед
+    monkeypatch.setattr(settings, "SYNC_SAFETY_LAG_SECONDS", 60)
+    *_, token = _walk(app_db)
+
+    update_landmark(app_db, 5, LandmarkUpdate(name="Новое название"))
+    review_id, review_user = app_db.query(Review.id, Review.user_id).filter(Review.landmark_id == 7).first()
+    delete_review(app_db, review_user, 7)
+    delete_landmark(app_db, 3)
+    cascaded = {
+        cascaded_id for (cascaded_id,) in
+        app_db.query(Review.id).filter(Review.user_id == users[1], Review.landmark_id != 3)
+    }
+    delete_user(app_db, users[1])
+
+    monkeypatch.setattr(settings, "SYNC_SAFETY_LAG_SECONDS", -60)
+    landmarks, reviews, deleted, _ = _walk(app_db, token, limit=2)
+    assert 5 in landmarks and 3 not in landmarks
+    assert ("landmark", 3) in deleted
+    assert ("review", review_id) in deleted
+    # Надгробия отзывов, удаленных каскадно вместе с достопримечательностью и пользователем
+    assert {("review", 2), ("review", 25)} <= set(deleted)
+    assert {("review", cascaded_id) for cascaded_id in cascaded} <= set(deleted)
+    assert len(deleted) == len(set(deleted))
+
+
+def test_expired_token(app_db):
+    expired = datetime.now(timezone.utc) - timedelta(days=settings.SYNC_TOMBSTONE_RETENTION_DAYS + 1)
+    token = encode_sync_token((expired, 0), (expired, 0), (expired, 0))
+    with pytest.raises(SyncTokenExpiredError):
+        get_changes(app_db, token)
@@ -0,0 +1,33 @@
+from sqlalchemy import func
+
+from app.core.filter_keys import filter_key
+from app.crud.landmark_crud import get_landmarks
+from app.models.landmark import FILTER_KEY_COLUMNS, Landmark
+from scripts.generate_synthetic_data import CITIES, CATEGORIES, generate_dataset
+
+SCALE = dict(users=20, landmarks=300, reviews=400, favorites=100, discussions=20, notifications=50)
+
+
+def test_generated_landmarks_have_filter_keys(app_db):
+    generate_dataset(app_db, SCALE, log=lambda message: None)
+
+    # Любая массовая загрузка мимо ORM должна заполнять ключи так же, как валидаторы модели
+    for column, key_column in FILTER_KEY_COLUMNS.items():
+        pairs = app_db.query(getattr(Landmark, column), getattr(Landmark, key_column)).distinct().all()
+        assert pairs and all(key == filter_key(value) for value, key in pairs)
+
+
+def test_exact_filters_match_generated_data(app_db):
+    generate_dataset(app_db, SCALE, log=lambda message: None)
+
+    by_city = dict(app_db.query(Landmark.city, func.count(Landmark.id)).group_by(Landmark.city).all())
+    assert set(by_city) <= {city[0] for city in CITIES}
+    for city, count in by_city.items():
+        _, total = get_landmarks(app_db, city=city.upper(), limit=1)
+        _, contains_total = get_landmarks(app_db, city=city, limit=1, match="contains")
+        assert total == contains_total == count
+
+    category = CATEGORIES[0][0]
+    expected = app_db.query(Landmark).filter(Landmark.category == category).count()
+    assert expected > 0
+    assert get_landmarks(app_db, category=category, limit=1)[1] == expected
@@ -0,0 +1,44 @@
+import pytest
+from fastapi import HTTPException
+from fastapi.security import HTTPAuthorizationCredentials
+
+from app.api.dependencies import get_current_user
+from app.core.config import settings
+from app.core.security import create_access_token, user_token_claims
+from app.core.user_cache import UserSnapshot, user_cache
+from app.models.user import User
+
+
+@pytest.fixture
+def claims_enabled(monkeypatch):
+    monkeypatch.setattr(settings, "SECRET_KEY", "test-secret")
+    monkeypatch.setattr(settings, "TOKEN_USER_CLAIMS", True)
+    user_cache.clear()
+    yield
+    user_cache.clear()
+
+
+def _credentials(user):
+    token = create_access_token(subject=user.email, claims=user_token_claims(user))
+    return HTTPAuthorizationCredentials(scheme="Bearer", credentials=token)
+
+
+def test_claims_trusted_only_until_claims_expire(app_db, claims_enabled, monkeypatch):
+    # Пользователь удален на другом воркере: в этом процессе отметки об изменении нет
+    deleted = User(id=42, email="gone@example.com", hashed_password="x", full_name="Удаленный")
+    fresh = _credentials(deleted)
+    assert get_current_user(fresh, app_db) == UserSnapshot(42, "gone@example.com", "Удаленный")
+
+    monkeypatch.setattr(settings, "TOKEN_USER_CLAIMS_TTL_MINUTES", -1)
+    with pytest.raises(HTTPException) as error:
+        get_current_user(_credentials(deleted), app_db)
+    assert error.value.status_code == 401
+
+
+def test_expired_claims_fall_back_to_database(app_db, claims_enabled, monkeypatch):
+    user = User(email="user@example.com", hashed_password="x", full_name="Новое имя")
+    app_db.add(user)
+    app_db.commit()
+    monkeypatch.setattr(settings, "TOKEN_USER_CLAIMS_TTL_MINUTES", -1)
+    stale = User(id=user.id, email=user.email, hashed_password="x", full_name="Старое имя")
+    assert get_current_user(_credentials(stale), app_db).full_name == "Новое имя"
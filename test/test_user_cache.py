@@ -0,0 +1,54 @@
+from app.core.user_cache import UserSnapshot, UserSnapshotCache
+
+
+class FakeClock:
+    def __init__(self, now=1000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+def _snapshot(user_id, email=None):
+    return UserSnapshot(id=user_id, email=email or f"user{user_id}@example.com", full_name=f"Пользователь {user_id}")
+
+
+def test_ttl_and_lru():
+    print("🧪 Тестирование TTL и вытеснения в кэше пользователей...")
+    clock = FakeClock()
+    cache = UserSnapshotCache(maxsize=2, ttl_seconds=30, clock=clock, wall_clock=clock)
+
+    cache.put("a", _snapshot(1))
+    cache.put("b", _snapshot(2))
+    assert cache.get("a").id == 1
+    # "b" использовался раньше всех и вытесняется
+    cache.put("c", _snapshot(3))
+    assert cache.get("b") is None
+    assert cache.get("a") is not None and cache.get("c") is not None
+
+    clock.now += 31
+    assert cache.get("a") is None
+    assert len(cache) == 1
+    assert cache.hits == 3 and cache.misses == 2
+    print("✅ Записи истекают и вытесняются корректно")
+
+
+def test_invalidate_user():
+    print("🧪 Тестирование инвалидации кэша пользователей...")
+    clock = FakeClock()
+    cache = UserSnapshotCache(maxsize=10, ttl_seconds=30, clock=clock, wall_clock=clock)
+    cache.put("old@example.com", _snapshot(1, "old@example.com"))
+    cache.put("other@example.com", _snapshot(2, "other@example.com"))
+
+    issued_before = clock.now - 5
+    assert not cache.changed_since(1, issued_before)
+
+    cache.invalidate_user(1)
+    assert cache.get("old@example.com") is None
+    assert cache.get("other@example.com") is not None
+
+    # Токены, выданные до изменения, считаются устаревшими, выданные после - нет
+    assert cache.changed_since(1, issued_before)
+    assert not cache.changed_since(1, clock.now + 1)
+    assert not cache.changed_since(2, issued_before)
+    print("✅ Снимки пользователя удаляются при изменении")